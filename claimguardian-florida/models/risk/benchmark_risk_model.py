@@ -0,0 +1,405 @@
+"""
+Benchmark and regression suite for the hurricane risk model.
+
+Generates synthetic Florida parcel tables (1k/100k/1M rows by default) and,
+for rule-based scoring and a trained model, measures:
+
+    single-call latency   predict_risk p50/p99 per parcel
+    batch throughput      predict_batch parcels/s and peak allocation
+    load time             module import and cold/warm artifact load
+    agreement             predict_batch vs predict_risk scores and categories
+
+Results are written as JSON. Passing the JSON of an earlier commit as
+--baseline reports regressions beyond --tolerance.
+
+    python benchmark_risk_model.py --output bench.json
+    python benchmark_risk_model.py --sizes 1000,100000 --baseline bench.json
+
+Exits 1 if batch and single-call scores disagree or a regression is found.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from risk_model import (
+    FloridaHurricaneRiskModel,
+    _peak_rss_mb,
+    clear_model_cache,
+    load_artifact,
+)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+MODES = ["rules", "model"]
+
+# Metrics compared against a baseline: (section, metric, True if higher is better)
+REGRESSION_METRICS = [
+    ("batch", "parcels_per_s", True),
+    ("single", "p50_us", False),
+    ("single", "p99_us", False),
+]
+
+# (county FIPS, latitude, longitude, share of parcels, coastal)
+COUNTIES = [
+    ("12086", 25.65, -80.45, 0.17, True),  # Miami-Dade
+    ("12011", 26.15, -80.30, 0.13, True),  # Broward
+    ("12099", 26.65, -80.25, 0.12, True),  # Palm Beach
+    ("12057", 27.95, -82.35, 0.10, True),  # Hillsborough
+    ("12095", 28.50, -81.30, 0.10, False),  # Orange
+    ("12031", 30.33, -81.65, 0.08, True),  # Duval
+    ("12103", 27.90, -82.72, 0.08, True),  # Pinellas
+    ("12071", 26.58, -81.85, 0.07, True),  # Lee
+    ("12015", 26.95, -82.05, 0.04, True),  # Charlotte
+    ("12105", 27.95, -81.70, 0.05, False),  # Polk
+    ("12087", 24.70, -81.30, 0.02, True),  # Monroe
+    ("12073", 30.45, -84.28, 0.04, False),  # Leon
+]
+
+# Share of cells left empty so predict_risk/predict_batch defaults are exercised
+NULL_FRACTION = 0.02
+
+
+def generate_parcels(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic parcels with every field the risk model reads.
+
+    Parcels are clustered around county centres in proportion to parcel
+    counts, coastal counties sit closer to the coast, and hurricane
+    exposure rises towards South Florida, so feature distributions and
+    correlations resemble real data. A small share of cells is null.
+    """
+    rng = np.random.default_rng(seed)
+    fips, lat0, lon0, share, coastal = (np.array(values) for values in zip(*COUNTIES))
+    county = rng.choice(len(fips), rows, p=share / share.sum())
+
+    lat = lat0[county] + rng.normal(0, 0.15, rows)
+    lon = lon0[county] + rng.normal(0, 0.15, rows)
+    distance_to_coast = np.where(
+        coastal[county], rng.exponential(6.0, rows), 40 + rng.exponential(25.0, rows)
+    )
+    south = np.clip((29.0 - lat) / 4.5, 0, 1)
+    hurricanes_20yr = rng.poisson(1.0 + 5.0 * south)
+    building_sqft = rng.lognormal(7.4, 0.4, rows)
+
+    parcels = pd.DataFrame(
+        {
+            "parcel_id": [f"{fips[c]}-{i:09d}" for i, c in enumerate(county)],
+            "centroid_lat": lat,
+            "centroid_lon": lon,
+            "distance_to_coast_km": distance_to_coast,
+            "elevation_ft": np.clip(
+                rng.gamma(2.0, 3.0, rows) + distance_to_coast * 0.8, 0, 340
+            ),
+            "just_value": building_sqft * rng.lognormal(5.3, 0.5, rows),
+            "building_age_years": rng.integers(0, 100, rows),
+            "lot_size_sqft": rng.lognormal(9.0, 0.6, rows),
+            "building_sqft": building_sqft,
+            "hurricane_count_10yr": rng.binomial(hurricanes_20yr, 0.5),
+            "hurricane_count_20yr": hurricanes_20yr,
+            "max_wind_kts": np.where(
+                hurricanes_20yr > 0, rng.uniform(64, 100, rows) + 60 * south, 0
+            ),
+            "avg_wind_kts": np.where(hurricanes_20yr > 0, rng.uniform(40, 80, rows), 0),
+            "max_surge_ft": rng.exponential(3.0, rows)
+            * np.exp(-distance_to_coast / 10),
+            "county_fips": fips[county],
+        }
+    )
+    for column in parcels.columns.drop("parcel_id"):
+        parcels.loc[rng.random(rows) < NULL_FRACTION, column] = None
+    return parcels
+
+
+def train_demo_model(model: FloridaHurricaneRiskModel, parcels: pd.DataFrame):
+    """Fit the model on rule-based scores so the ML path can be timed"""
+    training = parcels.head(2000).copy()
+    fallback = FloridaHurricaneRiskModel().predict_batch(training)
+    training["risk_score"] = fallback["overall_score"].to_numpy()
+    model.train_model(training)
+
+
+def _records(parcels: pd.DataFrame) -> List[Dict]:
+    """Parcel dicts as predict_risk callers pass them: nulls left out"""
+    return [
+        {key: value for key, value in record.items() if not pd.isna(value)}
+        for record in parcels.to_dict("records")
+    ]
+
+
+def time_single_calls(model: FloridaHurricaneRiskModel, records: List[Dict]):
+    """predict_risk latency per call, and the scores for the agreement check"""
+    latencies = np.empty(len(records))
+    scores = []
+    for i, record in enumerate(records):
+        start = time.perf_counter_ns()
+        scores.append(model.predict_risk(record))
+        latencies[i] = (time.perf_counter_ns() - start) / 1000
+
+    return scores, {
+        "calls": len(records),
+        "p50_us": float(np.percentile(latencies, 50)),
+        "p99_us": float(np.percentile(latencies, 99)),
+        "mean_us": float(latencies.mean()),
+    }
+
+
+def time_batch(model: FloridaHurricaneRiskModel, parcels: pd.DataFrame, repeat: int):
+    """Best-of-repeat predict_batch throughput and its peak Python allocation"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scores = model.predict_batch(parcels)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    model.predict_batch(parcels)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return scores, {
+        "rows": len(parcels),
+        "seconds": best,
+        "parcels_per_s": len(parcels) / best,
+        "peak_alloc_mb": peak / 2**20,
+    }
+
+
+def check_agreement(batch: pd.DataFrame, single) -> Dict:
+    """Compare predict_batch rows with the predict_risk results for them"""
+    head = batch.head(len(single))
+    max_diff = np.max(
+        np.abs(head["overall_score"].to_numpy() - [s.overall_score for s in single]),
+        initial=0.0,
+    )
+    mismatches = sum(
+        a != s.risk_category for a, s in zip(head["risk_category"], single)
+    )
+    return {
+        "compared": len(single),
+        "max_score_diff": float(max_diff),
+        "category_mismatches": int(mismatches),
+        "agree": bool(max_diff < 1e-9 and mismatches == 0),
+    }
+
+
+def time_loading(model: FloridaHurricaneRiskModel) -> Dict:
+    """Module import time and cold/warm load time of a saved artifact"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    probe = (
+        "import time; t = time.perf_counter(); import risk_model; "
+        "print(time.perf_counter() - t)"
+    )
+    imported = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=here,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.joblib")
+        model.save_model(path)
+        artifact_mb = os.path.getsize(path) / 2**20
+
+        clear_model_cache()
+        start = time.perf_counter()
+        load_artifact(path)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_artifact(path)
+        warm = time.perf_counter() - start
+        clear_model_cache()
+
+    return {
+        "import_ms": float(imported.stdout.strip()) * 1000,
+        "artifact_mb": artifact_mb,
+        "cold_load_ms": cold * 1000,
+        "warm_load_ms": warm * 1000,
+    }
+
+
+def run_suite(sizes: List[int], modes: List[str], loop_rows: int, repeat: int) -> Dict:
+    """Run every mode at every size and collect the results"""
+    print(f"🏗️  Generating {max(sizes):,} parcels...")
+    parcels = generate_parcels(max(sizes))
+
+    trained = FloridaHurricaneRiskModel()
+    if "model" in modes:
+        train_demo_model(trained, parcels)
+    models = {"rules": FloridaHurricaneRiskModel(), "model": trained}
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "loop_rows": loop_rows,
+            "repeat": repeat,
+        },
+        "loading": time_loading(trained) if "model" in modes else None,
+        "runs": [],
+    }
+
+    for mode in modes:
+        model = models[mode]
+        for size in sizes:
+            subset = parcels.head(size)
+            batch, batch_metrics = time_batch(model, subset, repeat)
+            single, single_metrics = time_single_calls(
+                model, _records(subset.head(loop_rows))
+            )
+            agreement = check_agreement(batch, single)
+            results["runs"].append(
+                {
+                    "mode": mode,
+                    "rows": size,
+                    "batch": batch_metrics,
+                    "single": single_metrics,
+                    "agreement": agreement,
+                }
+            )
+            print(
+                f"⏱️  {mode:5} {size:>9,} rows: "
+                f"batch {batch_metrics['parcels_per_s']:>12,.0f} parcels/s, "
+                f"single p50 {single_metrics['p50_us']:7.1f} µs "
+                f"/ p99 {single_metrics['p99_us']:7.1f} µs "
+                f"{'✅' if agreement['agree'] else '❌'}"
+            )
+
+    results["meta"]["peak_rss_mb"] = _peak_rss_mb()
+    return results
+
+
+def find_regressions(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that are worse than the baseline run by more than tolerance"""
+    previous = {(run["mode"], run["rows"]): run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        before = previous.get((run["mode"], run["rows"]))
+        if before is None:
+            continue
+        for section, metric, higher_is_better in REGRESSION_METRICS:
+            old, new = before[section][metric], run[section][metric]
+            change = (new - old) / old if old else 0.0
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{run['mode']} {run['rows']:,} rows {section}.{metric}: "
+                    f"{old:,.1f} -> {new:,.1f} ({change:+.0%})"
+                )
+
+    if results.get("loading") and baseline.get("loading"):
+        old, new = (
+            baseline["loading"]["cold_load_ms"],
+            results["loading"]["cold_load_ms"],
+        )
+        if old and (new - old) / old > tolerance:
+            regressions.append(
+                f"loading.cold_load_ms: {old:,.1f} -> {new:,.1f} "
+                f"({(new - old) / old:+.0%})"
+            )
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark hurricane risk scoring")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated table sizes (default: 1000,100000,1000000)",
+    )
+    parser.add_argument(
+        "--modes",
+        default=",".join(MODES),
+        help="Comma-separated scoring modes: rules, model (default: both)",
+    )
+    parser.add_argument(
+        "--loop-rows",
+        type=int,
+        default=5_000,
+        help="Parcels scored one at a time per size (default: 5,000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="predict_batch runs per size, best is kept (default: 3)",
+    )
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument(
+        "--baseline", help="Results JSON of an earlier run to compare against"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown reported as a regression (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modes = [mode.strip() for mode in args.modes.split(",")]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    results = run_suite(sizes, modes, args.loop_rows, args.repeat)
+
+    failed = False
+    if not all(run["agreement"]["agree"] for run in results["runs"]):
+        print("❌ Batch and single-call scores disagree")
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        results["regressions"] = regressions
+        for regression in regressions:
+            print(f"📉 {regression}")
+        if regressions:
+            failed = True
+        else:
+            print(f"✅ No regressions against {args.baseline}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
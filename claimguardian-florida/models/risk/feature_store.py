@@ -0,0 +1,423 @@
+"""
+Parcel feature store for the hurricane risk model.
+
+The build stage computes per-parcel model inputs in bulk and writes them,
+with every other model field carried over from the parcel input, as a
+versioned Parquet table:
+
+    distance_to_coast_km   distance to the nearest coastline point (KD-tree)
+    hurricane_count_10yr   hurricane exposure from storm tracks and wind radii
+    hurricane_count_20yr   (hurricane_exposure.py)
+    max_wind_kts
+    avg_wind_kts
+
+Rows are read back by parcel ID through a hash index, so the model and the
+scoring service can score a parcel from its ID alone.
+
+    python feature_store.py build --parcels parcels.parquet --coastline coast.geojson \\
+        --tracks tracks.csv --store feature_store/
+    python feature_store.py get --store feature_store/ 12087-001234
+
+Store layout:
+
+    feature_store/
+        CURRENT                   name of the version readers open by default
+        v0001/features.parquet
+        v0001/manifest.json       sources, parameters and row count of the build
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy.spatial import cKDTree
+
+from hurricane_exposure import (
+    DEFAULT_BUFFER_KM,
+    HURRICANE_WIND_KTS,
+    compute_exposure,
+    read_tracks,
+)
+from risk_model import FeaturePipeline
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Spacing coastline polylines are densified to before indexing
+COAST_SPACING_KM = 0.5
+
+FEATURES_FILE = "features.parquet"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+# Every parcel field the model reads, numeric first
+MODEL_FIELDS = [field for _, field, _ in FeaturePipeline.RAW_FEATURES] + [
+    "hurricane_count_20yr"
+]
+TEXT_FIELDS = ["parcel_id", "county_fips"]
+REQUIRED_PARCEL_COLUMNS = ["parcel_id", "centroid_lat", "centroid_lon"]
+
+
+def to_xyz(lat, lon) -> np.ndarray:
+    """Points on the Earth's surface as (n, 3) Cartesian km"""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS_KM * np.column_stack(
+        [cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)]
+    )
+
+
+def arc_km(chord):
+    """Great-circle distance for a straight-line (KD-tree) distance"""
+    return (
+        2
+        * EARTH_RADIUS_KM
+        * np.arcsin(np.minimum(np.asarray(chord) / (2 * EARTH_RADIUS_KM), 1.0))
+    )
+
+
+def densify(lat, lon, spacing_km: float, *values) -> Tuple[np.ndarray, ...]:
+    """Insert points along a polyline so no gap exceeds spacing_km.
+
+    values are per-vertex arrays (e.g. wind) interpolated along with the
+    coordinates. Returns (lat, lon, *values).
+    """
+    arrays = [np.asarray(a, dtype=float) for a in (lat, lon, *values)]
+    if len(arrays[0]) < 2:
+        return tuple(arrays)
+
+    gaps = arc_km(np.linalg.norm(np.diff(to_xyz(arrays[0], arrays[1]), axis=0), axis=1))
+    steps = np.maximum(np.ceil(gaps / spacing_km).astype(int), 1)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    fraction = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    fraction = fraction / np.repeat(steps, steps)
+    return tuple(
+        np.append(a[segment] + (a[segment + 1] - a[segment]) * fraction, a[-1])
+        for a in arrays
+    )
+
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a Parquet or CSV file"""
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns).to_pandas()
+    return pd.read_csv(
+        path, usecols=columns, dtype={"parcel_id": str, "county_fips": str}
+    )
+
+
+def read_coastline(path: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """(lat, lon) vertex arrays of every line or ring in a GeoJSON file"""
+    with open(path) as f:
+        data = json.load(f)
+
+    features = data.get("features", [data])
+    geometries = [feature.get("geometry", feature) for feature in features]
+    lines = []
+    while geometries:
+        geometry = geometries.pop()
+        kind, coordinates = geometry["type"], geometry.get("coordinates")
+        if kind == "GeometryCollection":
+            geometries.extend(geometry["geometries"])
+            continue
+        parts = {
+            "LineString": [coordinates],
+            "MultiLineString": coordinates,
+            "Polygon": coordinates,
+            "MultiPolygon": [ring for polygon in coordinates for ring in polygon],
+        }.get(kind, [])
+        for part in parts:
+            vertices = np.asarray(part, dtype=float)
+            lines.append((vertices[:, 1], vertices[:, 0]))
+    return lines
+
+
+def coastline_distance_km(
+    lat, lon, lines, spacing_km: float = COAST_SPACING_KM
+) -> np.ndarray:
+    """Distance from each point to the nearest densified coastline point"""
+    coast = [densify(line_lat, line_lon, spacing_km) for line_lat, line_lon in lines]
+    tree = cKDTree(
+        to_xyz(
+            np.concatenate([c[0] for c in coast]), np.concatenate([c[1] for c in coast])
+        )
+    )
+    chord, _ = tree.query(to_xyz(lat, lon), workers=-1)
+    return arc_km(chord)
+
+
+def _versions(store_dir: str) -> List[str]:
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(
+        name
+        for name in os.listdir(store_dir)
+        if name.startswith("v")
+        and name[1:].isdigit()
+        and os.path.exists(os.path.join(store_dir, name, MANIFEST_FILE))
+    )
+
+
+def current_version(store_dir: str) -> str:
+    """Version named by the store's CURRENT file"""
+    path = os.path.join(store_dir, CURRENT_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"No feature store at {store_dir} (missing {CURRENT_FILE})"
+        )
+    with open(path) as f:
+        return f.read().strip()
+
+
+def build_feature_store(
+    parcels_path: str,
+    store_dir: str,
+    coastline_path: Optional[str] = None,
+    tracks_path: Optional[str] = None,
+    as_of_year: Optional[int] = None,
+    buffer_km: float = DEFAULT_BUFFER_KM,
+    min_wind_kts: float = HURRICANE_WIND_KTS,
+    jobs: Optional[int] = None,
+) -> str:
+    """Compute parcel features and publish them as a new store version.
+
+    Args:
+        parcels_path: Parquet or CSV with parcel_id, centroid_lat,
+            centroid_lon and optionally any other model field.
+        store_dir: Feature store directory, created if needed.
+        coastline_path: GeoJSON coastline; without it distance_to_coast_km
+            is taken from the parcel input.
+        tracks_path: Storm track points; without them the exposure
+            features are taken from the parcel input.
+        as_of_year: Last hurricane season counted (default: this year).
+        buffer_km: Wind field radius for track points without one.
+        min_wind_kts: Weakest covering wind that counts as a hurricane.
+        jobs: Processes for the exposure computation (default: all cores).
+
+    Returns:
+        Name of the published version, e.g. "v0003".
+    """
+    start = time.perf_counter()
+    as_of_year = as_of_year or datetime.now(timezone.utc).year
+
+    available = (
+        pq.read_schema(parcels_path).names
+        if parcels_path.endswith(".parquet")
+        else (pd.read_csv(parcels_path, nrows=0).columns.tolist())
+    )
+    missing = [column for column in REQUIRED_PARCEL_COLUMNS if column not in available]
+    if missing:
+        raise ValueError(
+            f"{parcels_path} is missing parcel columns: {', '.join(missing)}"
+        )
+
+    columns = [c for c in TEXT_FIELDS + MODEL_FIELDS if c in available]
+    parcels = (
+        read_table(parcels_path, columns)
+        .drop_duplicates("parcel_id")
+        .reset_index(drop=True)
+    )
+    parcels = parcels.dropna(subset=["centroid_lat", "centroid_lon"])
+    print(f"📦 Loaded {len(parcels):,} parcels from {parcels_path}")
+
+    lat = parcels["centroid_lat"].to_numpy(dtype=float)
+    lon = parcels["centroid_lon"].to_numpy(dtype=float)
+
+    if coastline_path:
+        step = time.perf_counter()
+        parcels["distance_to_coast_km"] = coastline_distance_km(
+            lat, lon, read_coastline(coastline_path)
+        )
+        print(f"🌊 Coastline distance computed in {time.perf_counter() - step:.1f}s")
+
+    if tracks_path:
+        step = time.perf_counter()
+        for name, values in compute_exposure(
+            lat,
+            lon,
+            read_tracks(tracks_path),
+            as_of_year,
+            buffer_km,
+            min_wind_kts,
+            jobs,
+        ).items():
+            parcels[name] = values
+        print(f"🌀 Hurricane exposure computed in {time.perf_counter() - step:.1f}s")
+
+    versions = _versions(store_dir)
+    version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+    manifest = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "rows": len(parcels),
+        "columns": parcels.columns.tolist(),
+        "feature_pipeline_version": FeaturePipeline.VERSION,
+        "sources": {
+            "parcels": parcels_path,
+            "coastline": coastline_path,
+            "tracks": tracks_path,
+        },
+        "parameters": {
+            "as_of_year": as_of_year,
+            "track_buffer_km": buffer_km,
+            "min_wind_kts": min_wind_kts,
+            "coast_spacing_km": COAST_SPACING_KM,
+        },
+    }
+
+    # Write into a scratch directory and rename it into place, so readers
+    # never see a partial version
+    os.makedirs(store_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=".build-", dir=store_dir)
+    try:
+        pq.write_table(
+            pa.Table.from_pandas(parcels, preserve_index=False),
+            os.path.join(scratch, FEATURES_FILE),
+        )
+        with open(os.path.join(scratch, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.chmod(scratch, 0o755)
+        os.rename(scratch, os.path.join(store_dir, version))
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+
+    pointer = os.path.join(store_dir, f".{CURRENT_FILE}.tmp")
+    with open(pointer, "w") as f:
+        f.write(version + "\n")
+    os.replace(pointer, os.path.join(store_dir, CURRENT_FILE))
+
+    print(
+        f"✅ Published {version} ({len(parcels):,} parcels) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return version
+
+
+class ParcelFeatureStore:
+    """Read-only view of one feature store version, indexed by parcel ID.
+
+    The Parquet file is memory-mapped and parcel IDs are held in a hash
+    index, so lookups cost O(1) per ID regardless of the store size.
+    """
+
+    def __init__(self, store_dir: str, version: Optional[str] = None):
+        self.store_dir = store_dir
+        self.version = version or current_version(store_dir)
+        path = os.path.join(store_dir, self.version)
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        self.table = pq.read_table(os.path.join(path, FEATURES_FILE), memory_map=True)
+        self._index = pd.Index(self.table.column("parcel_id").to_pandas())
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __contains__(self, parcel_id: str):
+        return parcel_id in self._index
+
+    def lookup(self, parcel_ids: Iterable[str]) -> Tuple[pa.Table, List[str]]:
+        """Feature rows for parcel_ids in request order, and the IDs not found"""
+        parcel_ids = list(parcel_ids)
+        positions = self._index.get_indexer(parcel_ids)
+        found = positions >= 0
+        missing = [parcel_id for parcel_id, ok in zip(parcel_ids, found) if not ok]
+        return self.table.take(positions[found]), missing
+
+    def get(self, parcel_id: str) -> Optional[Dict]:
+        """One parcel's features as a predict_risk dict, or None if unknown.
+
+        Null cells are left out so the model applies its defaults.
+        """
+        rows, _ = self.lookup([parcel_id])
+        if not rows.num_rows:
+            return None
+        return {
+            name: value
+            for name, value in rows.to_pylist()[0].items()
+            if value is not None
+        }
+
+
+def main():
+    """Build or query the parcel feature store"""
+    parser = argparse.ArgumentParser(
+        description="Parcel feature store for hurricane risk scoring"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser(
+        "build", help="Compute features and publish a new version"
+    )
+    build.add_argument(
+        "--parcels",
+        required=True,
+        help="Parcel Parquet or CSV with parcel_id, centroid_lat, centroid_lon",
+    )
+    build.add_argument("--store", required=True, help="Feature store directory")
+    build.add_argument("--coastline", help="Coastline GeoJSON")
+    build.add_argument(
+        "--tracks",
+        help="Storm track points (storm_id, year, lat, lon, wind_kts[, radius_km])",
+    )
+    build.add_argument(
+        "--as-of-year",
+        type=int,
+        help="Last hurricane season counted (default: this year)",
+    )
+    build.add_argument(
+        "--buffer-km",
+        type=float,
+        default=DEFAULT_BUFFER_KM,
+        help=f"Radius for track points without one (default: {DEFAULT_BUFFER_KM:g})",
+    )
+    build.add_argument(
+        "--min-wind-kts",
+        type=float,
+        default=HURRICANE_WIND_KTS,
+        help=f"Weakest wind counted as a hurricane (default: {HURRICANE_WIND_KTS:g})",
+    )
+    build.add_argument(
+        "-j", "--jobs", type=int, help="Exposure worker processes (default: all cores)"
+    )
+
+    get = commands.add_parser("get", help="Print the features of parcels")
+    get.add_argument("--store", required=True, help="Feature store directory")
+    get.add_argument("--version", help="Store version (default: CURRENT)")
+    get.add_argument("parcel_ids", nargs="+")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build_feature_store(
+            args.parcels,
+            args.store,
+            args.coastline,
+            args.tracks,
+            args.as_of_year,
+            args.buffer_km,
+            args.min_wind_kts,
+            args.jobs,
+        )
+        return
+
+    store = ParcelFeatureStore(args.store, args.version)
+    for parcel_id in args.parcel_ids:
+        features = store.get(parcel_id)
+        if features is None:
+            print(f"❌ {parcel_id}: not in {store.version}", file=sys.stderr)
+        else:
+            print(json.dumps(features))
+
+
+if __name__ == "__main__":
+    main()
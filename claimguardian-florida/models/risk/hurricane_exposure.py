@@ -0,0 +1,435 @@
+"""
+Bulk historical hurricane exposure for Florida parcels.
+
+Computes the exposure features FloridaHurricaneRiskModel reads from storm
+track points and their wind radii:
+
+    hurricane_count_10yr   hurricanes whose wind field covered the parcel
+    hurricane_count_20yr
+    max_wind_kts           strongest track wind while covering the parcel
+    avg_wind_kts           mean of each counted storm's strongest covering wind
+
+Consecutive track points form segments whose radius and wind are
+interpolated along the segment. Parcels are bucketed into a lat/lon grid,
+so each segment is only tested against parcels in the cells its radius
+reaches, and spatially contiguous parcel chunks are processed on all cores.
+
+    python hurricane_exposure.py --parcels parcels.parquet --tracks tracks.csv \\
+        --output exposure.parquet --as-of-year 2024
+
+Track input has one row per track point, in track order within each storm:
+storm_id, year, lat, lon, wind_kts and optionally radius_km or radius_nm
+(e.g. the HURDAT2 34-kt wind radius). Points without a radius use the
+buffer.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+KM_PER_DEG_LAT = 111.195
+KM_PER_NM = 1.852
+
+# Sustained wind at which a storm counts as a hurricane
+HURRICANE_WIND_KTS = 64.0
+
+# Wind field radius used for track points without one
+DEFAULT_BUFFER_KM = 100.0
+
+# Grid cell size parcels are bucketed into
+CELL_DEG = 0.25
+
+# Segment/parcel candidate pairs tested per vector operation
+MAX_PAIRS = 4_000_000
+
+# Parcel chunks per worker process, so uneven chunks still balance
+CHUNKS_PER_JOB = 4
+
+TRACK_COLUMNS = ["storm_id", "year", "lat", "lon", "wind_kts"]
+EXPOSURE_COLUMNS = [
+    "hurricane_count_10yr",
+    "hurricane_count_20yr",
+    "max_wind_kts",
+    "avg_wind_kts",
+]
+
+
+def read_tracks(path: str) -> pd.DataFrame:
+    """Storm track points from Parquet or CSV, with a radius_km column"""
+    if path.endswith(".parquet"):
+        tracks = pq.read_table(path).to_pandas()
+    else:
+        tracks = pd.read_csv(path, dtype={"storm_id": str})
+
+    missing = [column for column in TRACK_COLUMNS if column not in tracks.columns]
+    if missing:
+        raise ValueError(f"{path} is missing track columns: {', '.join(missing)}")
+    if "radius_km" not in tracks.columns:
+        tracks["radius_km"] = (
+            tracks["radius_nm"] * KM_PER_NM if "radius_nm" in tracks.columns else np.nan
+        )
+    return tracks[TRACK_COLUMNS + ["radius_km"]].dropna(subset=TRACK_COLUMNS)
+
+
+def build_segments(
+    tracks: pd.DataFrame, as_of_year: int, buffer_km: float = DEFAULT_BUFFER_KM
+) -> Dict[str, np.ndarray]:
+    """Track segments of the storms in the 20 seasons up to as_of_year.
+
+    Returns arrays with one entry per segment: endpoints (lat0, lon0, lat1,
+    lon1), radius (r0, r1) and wind (w0, w1) at each end, the storm index
+    and the storm's season. Segments are grouped by storm; a storm with a
+    single track point becomes one zero-length segment.
+    """
+    storm_year = tracks.groupby("storm_id", sort=False)["year"].transform("max")
+    recent = (storm_year > as_of_year - 20) & (storm_year <= as_of_year)
+    tracks, storm_year = tracks[recent], storm_year[recent]
+    storm = tracks.groupby("storm_id", sort=False).ngroup().to_numpy()
+    order = np.argsort(storm, kind="stable")
+    storm = storm[order]
+
+    lat = tracks["lat"].to_numpy(dtype=float)[order]
+    lon = tracks["lon"].to_numpy(dtype=float)[order]
+    wind = tracks["wind_kts"].to_numpy(dtype=float)[order]
+    radius = tracks["radius_km"].to_numpy(dtype=float)[order]
+    radius = np.where(np.isnan(radius) | (radius <= 0), buffer_km, radius)
+    year = storm_year.to_numpy()[order]
+
+    start = np.arange(len(storm))
+    end = start + 1
+    if len(storm):
+        end[-1] = start[-1]
+    continues = np.zeros(len(storm), dtype=bool)
+    continues[:-1] = storm[1:] == storm[:-1]
+    first = np.ones(len(storm), dtype=bool)
+    first[1:] = ~continues[:-1]
+    # Every point that starts a segment, plus single-point storms
+    keep = continues | first & ~continues
+    start, end = start[keep], np.where(continues[keep], end[keep], start[keep])
+
+    return {
+        "lat0": lat[start],
+        "lon0": lon[start],
+        "lat1": lat[end],
+        "lon1": lon[end],
+        "r0": radius[start],
+        "r1": radius[end],
+        "w0": wind[start],
+        "w1": wind[end],
+        "storm": storm[start],
+        "year": year[start],
+    }
+
+
+class _ParcelGrid:
+    """Parcels bucketed into CELL_DEG cells: parcel indices sorted by cell"""
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_deg: float):
+        self.cell_deg = cell_deg
+        self.lat0 = lat.min() if len(lat) else 0.0
+        self.lon0 = lon.min() if len(lon) else 0.0
+        rows = np.floor((lat - self.lat0) / cell_deg).astype(np.int64)
+        cols = np.floor((lon - self.lon0) / cell_deg).astype(np.int64)
+        self.nrows = int(rows.max()) + 1 if len(lat) else 0
+        self.ncols = int(cols.max()) + 1 if len(lon) else 0
+
+        keys = rows * self.ncols + cols
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        self.ends = self.starts + counts
+
+    def cell_range(self, low, high, origin, limit):
+        """First and last cell index covering [low, high], clipped to the grid"""
+        first = np.floor((low - origin) / self.cell_deg).astype(np.int64)
+        last = np.floor((high - origin) / self.cell_deg).astype(np.int64)
+        valid = (last >= 0) & (first < limit)
+        return np.clip(first, 0, limit - 1), np.clip(last, 0, limit - 1), valid
+
+    def candidates(self, segments: Dict[str, np.ndarray]):
+        """(segment, first parcel position, parcel count) for each covered cell"""
+        reach = np.maximum(segments["r0"], segments["r1"])
+        reach_lat = reach / KM_PER_DEG_LAT
+        lat_low = np.minimum(segments["lat0"], segments["lat1"]) - reach_lat
+        lat_high = np.maximum(segments["lat0"], segments["lat1"]) + reach_lat
+        widest = np.cos(
+            np.radians(np.minimum(np.maximum(np.abs(lat_low), np.abs(lat_high)), 89.0))
+        )
+        reach_lon = reach / (KM_PER_DEG_LAT * widest)
+        lon_low = np.minimum(segments["lon0"], segments["lon1"]) - reach_lon
+        lon_high = np.maximum(segments["lon0"], segments["lon1"]) + reach_lon
+
+        row0, row1, row_ok = self.cell_range(lat_low, lat_high, self.lat0, self.nrows)
+        col0, col1, col_ok = self.cell_range(lon_low, lon_high, self.lon0, self.ncols)
+        width = col1 - col0 + 1
+        cells = np.where(row_ok & col_ok, (row1 - row0 + 1) * width, 0)
+
+        segment = np.repeat(np.arange(len(cells)), cells)
+        offset = np.arange(cells.sum()) - np.repeat(np.cumsum(cells) - cells, cells)
+        keys = (
+            (row0[segment] + offset // width[segment]) * self.ncols
+            + col0[segment]
+            + offset % width[segment]
+        )
+
+        position = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = self.keys[position] == keys
+        position = position[found]
+        return (
+            segment[found],
+            self.starts[position],
+            self.ends[position] - self.starts[position],
+        )
+
+
+def _storm_peaks(lat, lon, grid: _ParcelGrid, segments: Dict[str, np.ndarray]):
+    """Parcels covered by one storm and the strongest wind that covered each"""
+    segment, first, counts = grid.candidates(segments)
+    hit_parcels, hit_winds = [], []
+
+    # Split the candidate cells into batches of at most MAX_PAIRS pairs
+    total = np.cumsum(counts)
+    bounds = np.searchsorted(
+        total,
+        np.arange(MAX_PAIRS, total[-1] if len(total) else 0, MAX_PAIRS),
+        side="right",
+    )
+    for cells in np.split(np.arange(len(counts)), bounds):
+        n = counts[cells]
+        pair_segment = np.repeat(segment[cells], n)
+        parcel = grid.order[
+            np.repeat(first[cells], n)
+            + np.arange(n.sum())
+            - np.repeat(np.cumsum(n) - n, n)
+        ]
+
+        # Distance to the segment in a local equirectangular projection
+        plat, plon = lat[parcel], lon[parcel]
+        kx = KM_PER_DEG_LAT * np.cos(np.radians(plat))
+        lat0, lon0 = segments["lat0"][pair_segment], segments["lon0"][pair_segment]
+        ax = (segments["lon1"][pair_segment] - lon0) * kx
+        ay = (segments["lat1"][pair_segment] - lat0) * KM_PER_DEG_LAT
+        px = (plon - lon0) * kx
+        py = (plat - lat0) * KM_PER_DEG_LAT
+        length2 = ax * ax + ay * ay
+        t = np.clip(
+            np.divide(
+                px * ax + py * ay, length2, out=np.zeros_like(px), where=length2 > 0
+            ),
+            0.0,
+            1.0,
+        )
+        dx, dy = px - t * ax, py - t * ay
+
+        r0, w0 = segments["r0"][pair_segment], segments["w0"][pair_segment]
+        radius = r0 + t * (segments["r1"][pair_segment] - r0)
+        hit = dx * dx + dy * dy <= radius * radius
+        hit_parcels.append(parcel[hit])
+        hit_winds.append((w0 + t * (segments["w1"][pair_segment] - w0))[hit])
+
+    parcels = (
+        np.concatenate(hit_parcels) if hit_parcels else np.zeros(0, dtype=np.int64)
+    )
+    if not len(parcels):
+        return parcels, np.zeros(0)
+    parcels, inverse = np.unique(parcels, return_inverse=True)
+    peak = np.zeros(len(parcels))
+    np.maximum.at(peak, inverse, np.concatenate(hit_winds))
+    return parcels, peak
+
+
+def _exposure_chunk(
+    lat,
+    lon,
+    segments: Dict[str, np.ndarray],
+    as_of_year: int,
+    min_wind_kts: float,
+    cell_deg: float,
+) -> Dict[str, np.ndarray]:
+    """Exposure features for one chunk of parcels (runs in a worker process)"""
+    n = len(lat)
+    count_10yr = np.zeros(n, dtype=np.int32)
+    count_20yr = np.zeros(n, dtype=np.int32)
+    max_wind = np.zeros(n)
+    wind_sum = np.zeros(n)
+    if not n or not len(segments["storm"]):
+        return _exposure_columns(count_10yr, count_20yr, max_wind, wind_sum)
+
+    grid = _ParcelGrid(lat, lon, cell_deg)
+    storms, starts = np.unique(segments["storm"], return_index=True)
+    for start, end in zip(starts, np.append(starts[1:], len(segments["storm"]))):
+        storm = {name: values[start:end] for name, values in segments.items()}
+        parcels, peak = _storm_peaks(lat, lon, grid, storm)
+        hurricane = peak >= min_wind_kts
+        parcels, peak = parcels[hurricane], peak[hurricane]
+        if not len(parcels):
+            continue
+
+        count_20yr[parcels] += 1
+        if storm["year"][0] > as_of_year - 10:
+            count_10yr[parcels] += 1
+        max_wind[parcels] = np.maximum(max_wind[parcels], peak)
+        wind_sum[parcels] += peak
+
+    return _exposure_columns(count_10yr, count_20yr, max_wind, wind_sum)
+
+
+def _exposure_columns(
+    count_10yr, count_20yr, max_wind, wind_sum
+) -> Dict[str, np.ndarray]:
+    return {
+        "hurricane_count_10yr": count_10yr,
+        "hurricane_count_20yr": count_20yr,
+        "max_wind_kts": max_wind,
+        "avg_wind_kts": np.divide(
+            wind_sum, count_20yr, out=np.zeros(len(wind_sum)), where=count_20yr > 0
+        ),
+    }
+
+
+def compute_exposure(
+    lat,
+    lon,
+    tracks: pd.DataFrame,
+    as_of_year: Optional[int] = None,
+    buffer_km: float = DEFAULT_BUFFER_KM,
+    min_wind_kts: float = HURRICANE_WIND_KTS,
+    jobs: Optional[int] = None,
+    cell_deg: float = CELL_DEG,
+) -> Dict[str, np.ndarray]:
+    """Historical hurricane exposure of each parcel centroid.
+
+    Args:
+        lat: Parcel latitudes.
+        lon: Parcel longitudes.
+        tracks: Track points as returned by read_tracks.
+        as_of_year: Last hurricane season counted (default: this year).
+        buffer_km: Wind field radius for track points without one.
+        min_wind_kts: Weakest covering wind that counts as a hurricane.
+        jobs: Worker processes (default: all cores, 1 runs inline).
+        cell_deg: Grid cell size parcels are bucketed into.
+
+    Returns:
+        Dict of EXPOSURE_COLUMNS arrays aligned with lat/lon.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    as_of_year = as_of_year or datetime.now(timezone.utc).year
+    segments = build_segments(tracks, as_of_year, buffer_km)
+    jobs = jobs or os.cpu_count() or 1
+
+    # Chunks of consecutive grid cells keep each worker's parcels close
+    # together, so most segments miss most chunks outright
+    order = np.lexsort((np.floor(lon / cell_deg), np.floor(lat / cell_deg)))
+    chunks = (
+        [chunk for chunk in np.array_split(order, jobs * CHUNKS_PER_JOB) if len(chunk)]
+        if jobs > 1
+        else [order]
+    )
+    args = [
+        (lat[chunk], lon[chunk], segments, as_of_year, min_wind_kts, cell_deg)
+        for chunk in chunks
+    ]
+
+    if jobs == 1:
+        results = [_exposure_chunk(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_exposure_chunk, *zip(*args)))
+
+    columns = {
+        name: np.zeros(
+            len(lat), dtype=np.int32 if name.startswith("hurricane_count") else float
+        )
+        for name in EXPOSURE_COLUMNS
+    }
+    for chunk, result in zip(chunks, results):
+        for name in EXPOSURE_COLUMNS:
+            columns[name][chunk] = result[name]
+    return columns
+
+
+def main():
+    """Compute exposure features for a parcel file"""
+    parser = argparse.ArgumentParser(
+        description="Compute historical hurricane exposure per parcel"
+    )
+    parser.add_argument(
+        "--parcels",
+        required=True,
+        help="Parcel Parquet or CSV with parcel_id, centroid_lat, centroid_lon",
+    )
+    parser.add_argument(
+        "--tracks",
+        required=True,
+        help="Storm track points (storm_id, year, lat, lon, wind_kts[, radius_km])",
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Parquet file for parcel_id and the exposure columns",
+    )
+    parser.add_argument(
+        "--as-of-year",
+        type=int,
+        help="Last hurricane season counted (default: this year)",
+    )
+    parser.add_argument(
+        "--buffer-km",
+        type=float,
+        default=DEFAULT_BUFFER_KM,
+        help=f"Radius for track points without one (default: {DEFAULT_BUFFER_KM:g})",
+    )
+    parser.add_argument(
+        "--min-wind-kts",
+        type=float,
+        default=HURRICANE_WIND_KTS,
+        help=f"Weakest wind counted as a hurricane (default: {HURRICANE_WIND_KTS:g})",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="Worker processes (default: all cores)"
+    )
+    args = parser.parse_args()
+
+    columns = ["parcel_id", "centroid_lat", "centroid_lon"]
+    if args.parcels.endswith(".parquet"):
+        parcels = pq.read_table(args.parcels, columns=columns).to_pandas()
+    else:
+        parcels = pd.read_csv(args.parcels, usecols=columns, dtype={"parcel_id": str})
+    tracks = read_tracks(args.tracks)
+    print(
+        f"📦 {len(parcels):,} parcels, {tracks['storm_id'].nunique():,} storms "
+        f"({len(tracks):,} track points)"
+    )
+
+    start = time.perf_counter()
+    exposure = compute_exposure(
+        parcels["centroid_lat"],
+        parcels["centroid_lon"],
+        tracks,
+        args.as_of_year,
+        args.buffer_km,
+        args.min_wind_kts,
+        args.jobs,
+    )
+    elapsed = time.perf_counter() - start
+
+    output = pd.DataFrame({"parcel_id": parcels["parcel_id"], **exposure})
+    output.to_parquet(args.output, index=False)
+    print(
+        f"🌀 Exposure computed in {elapsed:.1f}s "
+        f"({len(parcels) / max(elapsed, 1e-9):,.0f} parcels/s)"
+    )
+    print(f"✅ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
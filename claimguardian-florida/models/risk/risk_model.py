@@ -1,18 +1,57 @@
 """
 Hurricane risk scoring model for Florida parcels
 Combines historical hurricane data, property characteristics, and geographic factors
+
+NumPy, pandas, scikit-learn and joblib are imported where they are first
+needed, so importing this module and rule-based scoring stay cheap for
+edge/API workers that never load a trained model.
 """
 
-import pandas as pd
-import numpy as np
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
+from __future__ import annotations
+
+import bisect
 import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from sklearn.preprocessing import StandardScaler
+
+# Counties with elevated base risk: Miami-Dade, Monroe, Palm Beach, Martin
+HIGH_RISK_COUNTIES = ['12086', '12087', '12099', '12111']
+KEYS_COUNTY = '12087'
+
+# Weights of the rule-based fallback score
+COMPONENT_WEIGHTS = {
+    'hurricane_historical': 0.25,
+    'wind_vulnerability': 0.25,
+    'surge_exposure': 0.20,
+    'economic_factor': 0.15,
+    'geographic_factor': 0.15,
+}
+
+# Lower score bound of each risk category above MINIMAL
+RISK_THRESHOLDS = [0.2, 0.4, 0.6, 0.8]
+RISK_CATEGORIES = ('MINIMAL', 'LOW', 'MODERATE', 'HIGH', 'EXTREME')
+
+ML_CONFIDENCE = 0.85
+FALLBACK_CONFIDENCE = 0.60
+
+# Rows scored per model call in predict_batch
+BATCH_CHUNK_SIZE = 100_000
+
+# Rows read per chunk by train_model_chunked
+TRAINING_CHUNK_SIZE = 250_000
 
 @dataclass
 class RiskComponents:
@@ -32,51 +71,156 @@ class RiskScore:
     components: RiskComponents
     risk_category: str  # MINIMAL, LOW, MODERATE, HIGH, EXTREME
     
+class FeaturePipeline:
+    """Feature extraction shared by training, predict_risk and predict_batch.
+    
+    Owns the feature order, the parcel fields and defaults they are read
+    from, the derived features and the fitted scaling parameters. It is
+    saved with the model, so inference applies exactly the transformation
+    the model was trained on.
+    """
+    
+    # (feature, parcel field, default) for features read straight from parcels
+    RAW_FEATURES = [
+        # Geographic features
+        ('latitude', 'centroid_lat', 0),
+        ('longitude', 'centroid_lon', 0),
+        ('distance_to_coast', 'distance_to_coast_km', 50),
+        ('elevation_ft', 'elevation_ft', 10),
+        
+        # Property characteristics
+        ('property_value', 'just_value', 100000),
+        ('building_age', 'building_age_years', 30),
+        ('lot_size_sqft', 'lot_size_sqft', 8000),
+        ('building_sqft', 'building_sqft', 1500),
+        
+        # Historical hurricane exposure
+        ('hurricanes_10yr', 'hurricane_count_10yr', 0),
+        ('max_wind_exposure', 'max_wind_kts', 0),
+        ('avg_wind_exposure', 'avg_wind_kts', 0),
+        ('storm_surge_history', 'max_surge_ft', 0),
+    ]
+    DERIVED_FEATURES = ['value_per_sqft', 'coastal_proximity', 'elevation_normalized', 'high_risk_county']
+    VERSION = 1
+    
+    def __init__(self, raw_features: Optional[List[Tuple[str, str, float]]] = None):
+        self.raw_features = [tuple(spec) for spec in (raw_features or self.RAW_FEATURES)]
+        self.feature_names = [name for name, _, _ in self.raw_features] + self.DERIVED_FEATURES
+        self.mean: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self._raw_index = {name: i for i, (name, _, _) in enumerate(self.raw_features)}
+    
+    @property
+    def fitted(self) -> bool:
+        return self.mean is not None
+    
+    def raw_matrix(self, parcels) -> np.ndarray:
+        """Unscaled feature matrix for a DataFrame, Arrow table or parcel dict"""
+        import numpy as np
+        
+        columns = parcels if isinstance(parcels, (_BatchColumns, _RecordColumns)) else (
+            _RecordColumns(parcels) if isinstance(parcels, dict) else _BatchColumns(parcels)
+        )
+        raw = [columns.get(field, default) for _, field, default in self.raw_features]
+        
+        def feature(name):
+            return raw[self._raw_index[name]]
+        
+        derived = [
+            feature('property_value') / np.maximum(feature('building_sqft'), 1),
+            np.minimum(feature('distance_to_coast') / 50.0, 1.0),
+            np.minimum(feature('elevation_ft') / 50.0, 1.0),
+            np.isin(columns.get_text('county_fips', '12000'), HIGH_RISK_COUNTIES).astype(float),
+        ]
+        return np.column_stack(raw + derived)
+    
+    def fit(self, parcels) -> 'FeaturePipeline':
+        """Fit the scaling parameters on training parcels"""
+        return self.fit_matrix(self.raw_matrix(parcels))
+    
+    def fit_matrix(self, raw: np.ndarray) -> 'FeaturePipeline':
+        """Fit the scaling parameters on an already built raw feature matrix"""
+        from sklearn.preprocessing import StandardScaler
+        
+        scaler = StandardScaler().fit(raw)
+        self.mean = scaler.mean_
+        self.scale = scaler.scale_
+        return self
+    
+    def transform(self, parcels) -> np.ndarray:
+        """Model-ready (scaled) feature matrix"""
+        matrix = self.raw_matrix(parcels)
+        if self.fitted:
+            matrix = (matrix - self.mean) / self.scale
+        return matrix
+    
+    def to_dict(self) -> Dict:
+        """Plain-data form stored in the model artifact"""
+        return {
+            'version': self.VERSION,
+            'raw_features': [list(spec) for spec in self.raw_features],
+            'feature_names': self.feature_names,
+            'mean': None if self.mean is None else self.mean.tolist(),
+            'scale': None if self.scale is None else self.scale.tolist(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FeaturePipeline':
+        import numpy as np
+        
+        pipeline = cls(data['raw_features'])
+        if data['feature_names'] != pipeline.feature_names:
+            raise ValueError(f"Model features {data['feature_names']} do not match pipeline {pipeline.feature_names}")
+        if data['mean'] is not None:
+            pipeline.mean = np.asarray(data['mean'], dtype=float)
+            pipeline.scale = np.asarray(data['scale'], dtype=float)
+        return pipeline
+    
+    @classmethod
+    def from_scaler(cls, scaler: StandardScaler) -> 'FeaturePipeline':
+        """Wrap the bare scaler stored by artifacts older than the pipeline
+        
+        Those scalers were fitted on the training DataFrame's columns, which
+        need not be the pipeline's features; only a scaler fitted on exactly
+        the pipeline's features can be reused.
+        """
+        pipeline = cls()
+        if hasattr(scaler, 'mean_'):
+            fitted_names = list(getattr(scaler, 'feature_names_in_', []))
+            if len(scaler.mean_) != len(pipeline.feature_names) or (
+                fitted_names and fitted_names != pipeline.feature_names
+            ):
+                fitted = f"{len(scaler.mean_)} columns" + (f" {fitted_names}" if fitted_names else "")
+                raise ValueError(
+                    f"Legacy model artifact has a scaler fitted on {fitted} but the feature pipeline "
+                    f"produces {len(pipeline.feature_names)} {pipeline.feature_names}; "
+                    f"retrain the model to save a pipeline artifact"
+                )
+            pipeline.mean = scaler.mean_
+            pipeline.scale = scaler.scale_
+        return pipeline
+
 class FloridaHurricaneRiskModel:
     """ML model for predicting hurricane risk scores"""
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, feature_store=None):
         self.model = None
-        self.scaler = StandardScaler()
-        self.feature_columns = []
+        self.pipeline = FeaturePipeline()
+        self.feature_columns = self.pipeline.feature_names
         self.model_path = model_path
+        # Optional feature_store.ParcelFeatureStore used by predict_by_id
+        self.feature_store = feature_store
         
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
     
     def prepare_features(self, parcel_data: Dict) -> np.ndarray:
-        """Extract and engineer features for ML model"""
-        features = {
-            # Geographic features
-            'latitude': parcel_data.get('centroid_lat', 0),
-            'longitude': parcel_data.get('centroid_lon', 0),
-            'distance_to_coast': parcel_data.get('distance_to_coast_km', 50),
-            'elevation_ft': parcel_data.get('elevation_ft', 10),
-            
-            # Property characteristics
-            'property_value': parcel_data.get('just_value', 100000),
-            'building_age': parcel_data.get('building_age_years', 30),
-            'lot_size_sqft': parcel_data.get('lot_size_sqft', 8000),
-            'building_sqft': parcel_data.get('building_sqft', 1500),
-            
-            # Historical hurricane exposure
-            'hurricanes_10yr': parcel_data.get('hurricane_count_10yr', 0),
-            'max_wind_exposure': parcel_data.get('max_wind_kts', 0),
-            'avg_wind_exposure': parcel_data.get('avg_wind_kts', 0),
-            'storm_surge_history': parcel_data.get('max_surge_ft', 0),
-            
-            # Derived features
-            'value_per_sqft': parcel_data.get('just_value', 100000) / max(parcel_data.get('building_sqft', 1500), 1),
-            'coastal_proximity': min(parcel_data.get('distance_to_coast_km', 50) / 50.0, 1.0),
-            'elevation_normalized': min(parcel_data.get('elevation_ft', 10) / 50.0, 1.0),
-        }
-        
-        # Handle county-specific factors
-        county_fips = parcel_data.get('county_fips', '12000')
-        high_risk_counties = ['12086', '12087', '12099', '12111']  # Miami-Dade, Monroe, Palm Beach, Martin
-        features['high_risk_county'] = 1.0 if county_fips in high_risk_counties else 0.0
-        
-        return np.array(list(features.values())).reshape(1, -1)
+        """Extract, engineer and scale features for one parcel (1 x N)"""
+        return self.pipeline.transform(parcel_data)
+    
+    def prepare_feature_matrix(self, parcels) -> np.ndarray:
+        """Model-ready feature matrix for a DataFrame or Arrow table"""
+        return self.pipeline.transform(parcels)
     
     def calculate_risk_components(self, parcel_data: Dict) -> RiskComponents:
         """Calculate individual risk components"""
@@ -106,7 +250,7 @@ class FloridaHurricaneRiskModel:
         # South Florida has higher base risk
         south_florida_factor = 1.0 if lat < 26.5 else 0.7 if lat < 27.5 else 0.5
         # Keys have extreme risk
-        keys_factor = 1.0 if county_fips == '12087' else 0.0
+        keys_factor = 1.0 if county_fips == KEYS_COUNTY else 0.0
         geographic_factor = min(south_florida_factor + keys_factor, 1.0)
         
         return RiskComponents(
@@ -117,6 +261,29 @@ class FloridaHurricaneRiskModel:
             geographic_factor=geographic_factor
         )
     
+    def calculate_risk_component_arrays(self, parcels) -> Dict[str, np.ndarray]:
+        """Column-wise equivalent of calculate_risk_components"""
+        import numpy as np
+        
+        columns = _BatchColumns.wrap(parcels)
+        max_wind = columns.get('max_wind_kts', 0)
+        building_age = columns.get('building_age_years', 30)
+        elevation = columns.get('elevation_ft', 10)
+        distance_coast = columns.get('distance_to_coast_km', 50)
+        lat = columns.get('centroid_lat', 27.0)
+        county_fips = columns.get_text('county_fips', '12000')
+        
+        south_florida_factor = np.where(lat < 26.5, 1.0, np.where(lat < 27.5, 0.7, 0.5))
+        keys_factor = (county_fips == KEYS_COUNTY).astype(float)
+        
+        return {
+            'hurricane_historical': np.minimum(columns.get('hurricane_count_20yr', 0) / 8.0, 1.0),
+            'wind_vulnerability': np.minimum((max_wind / 150.0) * (building_age / 50.0), 1.0),
+            'surge_exposure': np.maximum(0, 1.0 - (elevation / 20.0) - (distance_coast / 10.0)),
+            'economic_factor': np.minimum(columns.get('just_value', 100000) / 2000000.0, 1.0),
+            'geographic_factor': np.minimum(south_florida_factor + keys_factor, 1.0),
+        }
+    
     def predict_risk(self, parcel_data: Dict) -> RiskScore:
         """Generate complete risk assessment for a parcel"""
         
@@ -127,32 +294,20 @@ class FloridaHurricaneRiskModel:
         if self.model is not None:
             features = self.prepare_features(parcel_data)
             ml_score = self.model.predict(features)[0]
-            confidence = 0.85  # High confidence with ML model
+            confidence = ML_CONFIDENCE  # High confidence with ML model
         else:
             # Fallback to weighted component average
-            ml_score = (
-                components.hurricane_historical * 0.25 +
-                components.wind_vulnerability * 0.25 +
-                components.surge_exposure * 0.20 +
-                components.economic_factor * 0.15 +
-                components.geographic_factor * 0.15
+            ml_score = sum(
+                getattr(components, name) * weight
+                for name, weight in COMPONENT_WEIGHTS.items()
             )
-            confidence = 0.60  # Lower confidence without ML
+            confidence = FALLBACK_CONFIDENCE  # Lower confidence without ML
         
         # Ensure score is in valid range
         overall_score = max(0.0, min(1.0, ml_score))
         
         # Determine risk category
-        if overall_score >= 0.8:
-            risk_category = "EXTREME"
-        elif overall_score >= 0.6:
-            risk_category = "HIGH"
-        elif overall_score >= 0.4:
-            risk_category = "MODERATE" 
-        elif overall_score >= 0.2:
-            risk_category = "LOW"
-        else:
-            risk_category = "MINIMAL"
+        risk_category = RISK_CATEGORIES[bisect.bisect_right(RISK_THRESHOLDS, overall_score)]
         
         return RiskScore(
             parcel_id=parcel_data.get('parcel_id', 'unknown'),
@@ -162,66 +317,377 @@ class FloridaHurricaneRiskModel:
             risk_category=risk_category
         )
     
+    def predict_batch(self, parcels, chunk_size: int = BATCH_CHUNK_SIZE) -> pd.DataFrame:
+        """Score many parcels at once.
+        
+        Accepts a pandas DataFrame or pyarrow Table with the same fields
+        predict_risk reads from parcel_data; missing columns and null cells
+        take the same defaults. Features and components are computed
+        column-wise and the model is called once per chunk of chunk_size rows.
+        
+        Returns:
+            DataFrame with parcel_id, overall_score, confidence, risk_category
+            and one column per risk component, in input order.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        categories = np.asarray(RISK_CATEGORIES, dtype=object)
+        results = []
+        for columns in _BatchColumns.iter_chunks(parcels, chunk_size):
+            components = self.calculate_risk_component_arrays(columns)
+            
+            if self.model is not None:
+                ml_score = self.model.predict(self.prepare_feature_matrix(columns))
+                confidence = ML_CONFIDENCE
+            else:
+                ml_score = sum(
+                    components[name] * weight
+                    for name, weight in COMPONENT_WEIGHTS.items()
+                )
+                confidence = FALLBACK_CONFIDENCE
+            
+            overall_score = np.clip(ml_score, 0.0, 1.0)
+            
+            chunk = pd.DataFrame({
+                'parcel_id': columns.get_text('parcel_id', 'unknown'),
+                'overall_score': overall_score,
+                'confidence': np.full(len(columns), confidence),
+                'risk_category': categories[np.searchsorted(RISK_THRESHOLDS, overall_score, side='right')],
+            })
+            for name, values in components.items():
+                chunk[name] = values
+            results.append(chunk)
+        
+        if not results:
+            return pd.DataFrame(columns=['parcel_id', 'overall_score', 'confidence', 'risk_category', *COMPONENT_WEIGHTS])
+        return pd.concat(results, ignore_index=True)
+    
+    def predict_by_id(self, parcel_ids: List[str]) -> pd.DataFrame:
+        """Score parcels by ID using features from the attached feature store
+        
+        Raises:
+            KeyError: If no feature store is attached or an ID is not in it.
+        """
+        if self.feature_store is None:
+            raise KeyError('No feature store attached to the model')
+        
+        features, missing = self.feature_store.lookup(parcel_ids)
+        if missing:
+            raise KeyError(f"{len(missing)} parcel(s) not in feature store {self.feature_store.version}: {', '.join(missing[:5])}")
+        return self.predict_batch(features)
+    
     def train_model(self, training_data: pd.DataFrame, target_column: str = 'risk_score'):
-        """Train the ML model on historical data"""
+        """Train the ML model on historical data
         
-        # Prepare features
-        X = training_data.drop(columns=[target_column])
-        y = training_data[target_column]
+        training_data holds parcel fields (the keys predict_risk reads from
+        parcel_data) plus target_column. Features are built and scaled by
+        the same FeaturePipeline used at prediction time.
+        """
+        from sklearn.ensemble import GradientBoostingRegressor
+        from sklearn.metrics import mean_squared_error, r2_score
+        from sklearn.model_selection import train_test_split
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        # Split parcels before fitting the pipeline so test rows stay unseen
+        y = training_data[target_column]
+        parcels_train, parcels_test, y_train, y_test = train_test_split(
+            training_data.drop(columns=[target_column]), y, test_size=0.2, random_state=42
+        )
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Build and scale features
+        self.pipeline = FeaturePipeline().fit(parcels_train)
+        X_train_scaled = self.pipeline.transform(parcels_train)
+        X_test_scaled = self.pipeline.transform(parcels_test)
         
-        # Train ensemble model
+        # Train gradient boosting model (the model that is kept is the one evaluated)
         gb_model = GradientBoostingRegressor(n_estimators=200, learning_rate=0.1, random_state=42)
-        rf_model = RandomForestRegressor(n_estimators=200, random_state=42)
-        
         gb_model.fit(X_train_scaled, y_train)
-        rf_model.fit(X_train_scaled, y_train)
-        
-        # Ensemble predictions
-        gb_pred = gb_model.predict(X_test_scaled)
-        rf_pred = rf_model.predict(X_test_scaled)
-        ensemble_pred = (gb_pred + rf_pred) / 2
         
         # Evaluate
-        mse = mean_squared_error(y_test, ensemble_pred)
-        r2 = r2_score(y_test, ensemble_pred)
+        predictions = gb_model.predict(X_test_scaled)
+        mse = mean_squared_error(y_test, predictions)
+        r2 = r2_score(y_test, predictions)
         
         print(f"Model performance - MSE: {mse:.4f}, R²: {r2:.4f}")
         
-        # Create simple ensemble model (in production would use more sophisticated stacking)
-        self.model = gb_model  # Use gradient boosting as primary
-        self.feature_columns = X.columns.tolist()
+        self.model = gb_model
+        self.feature_columns = self.pipeline.feature_names
         
         return {'mse': mse, 'r2': r2}
     
+    def train_model_chunked(self, source, target_column: str = 'risk_score',
+                            chunk_size: int = TRAINING_CHUNK_SIZE,
+                            sample_fraction: Optional[float] = None,
+                            n_jobs: Optional[int] = None,
+                            test_fraction: float = 0.2,
+                            random_state: int = 42) -> Dict:
+        """Train on data too large to hold as a DataFrame.
+        
+        Chunks are streamed from source and reduced to a float32 feature
+        matrix as they arrive, so peak memory is set by the number of
+        (sampled) rows times the feature count, not by the raw parcel
+        columns. The model is a histogram-based gradient boosting
+        regressor, which bins features and fits on all cores.
+        
+        Args:
+            source: Parquet file or directory, or an iterable of DataFrame /
+                Arrow chunks (e.g. pd.read_sql(..., chunksize=n)).
+            target_column: Column holding the risk score to learn.
+            chunk_size: Rows per chunk when reading Parquet.
+            sample_fraction: Keep this random fraction of rows (sampling mode).
+            n_jobs: Threads used for fitting; None uses all cores.
+            test_fraction: Fraction of rows held out for evaluation.
+            random_state: Seed for sampling, the holdout split and the model.
+        
+        Returns:
+            Dict with mse, r2, rows_train, rows_test, fit_seconds and
+            peak_rss_mb (None where unavailable).
+        """
+        import numpy as np
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        from sklearn.metrics import mean_squared_error, r2_score
+        
+        start = time.perf_counter()
+        rng = np.random.default_rng(random_state)
+        pipeline = FeaturePipeline()
+        needed = {field for _, field, _ in pipeline.raw_features} | {'county_fips', target_column}
+        
+        features, targets, holdout = [], [], []
+        for chunk in _iter_training_chunks(source, chunk_size, needed):
+            columns = _BatchColumns(chunk)
+            y = columns.get(target_column, np.nan)
+            keep = ~np.isnan(y)
+            if sample_fraction is not None:
+                keep &= rng.random(len(y)) < sample_fraction
+            if not keep.any():
+                continue
+            
+            raw = pipeline.raw_matrix(columns)[keep].astype(np.float32)
+            features.append(raw)
+            targets.append(y[keep])
+            holdout.append(rng.random(len(raw)) < test_fraction)
+        
+        if not features:
+            raise ValueError('No training rows with a target value')
+        
+        X = np.concatenate(features)
+        del features
+        y = np.concatenate(targets)
+        is_test = np.concatenate(holdout)
+        
+        # Scale in place with parameters fitted on the training rows only
+        pipeline.fit_matrix(X[~is_test])
+        X -= pipeline.mean.astype(np.float32)
+        X /= pipeline.scale.astype(np.float32)
+        
+        model = HistGradientBoostingRegressor(max_iter=200, learning_rate=0.1, random_state=random_state)
+        fit_start = time.perf_counter()
+        with _thread_limit(n_jobs):
+            model.fit(X[~is_test], y[~is_test])
+            predictions = model.predict(X[is_test]) if is_test.any() else np.array([])
+        fit_seconds = time.perf_counter() - fit_start
+        
+        mse = mean_squared_error(y[is_test], predictions) if is_test.any() else float('nan')
+        r2 = r2_score(y[is_test], predictions) if is_test.sum() > 1 else float('nan')
+        
+        self.model = model
+        self.pipeline = pipeline
+        self.feature_columns = pipeline.feature_names
+        
+        metrics = {
+            'mse': mse,
+            'r2': r2,
+            'rows_train': int((~is_test).sum()),
+            'rows_test': int(is_test.sum()),
+            'fit_seconds': fit_seconds,
+            'total_seconds': time.perf_counter() - start,
+            'peak_rss_mb': _peak_rss_mb(),
+        }
+        print(f"Model performance - MSE: {mse:.4f}, R²: {r2:.4f} "
+              f"({metrics['rows_train']:,} train / {metrics['rows_test']:,} test rows)")
+        peak = f"{metrics['peak_rss_mb']:,.0f} MB" if metrics['peak_rss_mb'] else 'n/a'
+        print(f"Fit time: {fit_seconds:.1f}s (total {metrics['total_seconds']:.1f}s), peak memory: {peak}")
+        return metrics
+    
     def save_model(self, path: str):
-        """Save trained model and scaler"""
+        """Save trained model and its feature pipeline
+        
+        The artifact is written uncompressed so load_artifact can memory-map
+        its arrays, and atomically so workers reloading on mtime change never
+        read a partial file.
+        """
+        import joblib
+        
         if self.model is not None:
             model_data = {
                 'model': self.model,
-                'scaler': self.scaler,
+                'pipeline': self.pipeline.to_dict(),
                 'features': self.feature_columns
             }
-            joblib.dump(model_data, path)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            joblib.dump(model_data, tmp_path, compress=0)
+            os.replace(tmp_path, path)
             print(f"Model saved to {path}")
     
     def load_model(self, path: str):
-        """Load pre-trained model"""
+        """Load pre-trained model through the process-wide artifact cache"""
         if os.path.exists(path):
-            model_data = joblib.load(path)
-            self.model = model_data['model']
-            self.scaler = model_data['scaler']
-            self.feature_columns = model_data['features']
+            self.model, self.pipeline = load_artifact(path)
+            self.feature_columns = self.pipeline.feature_names
             print(f"Model loaded from {path}")
         else:
             print(f"Model file not found: {path}")
 
+# Loaded artifacts by real path: (mtime_ns, model, pipeline)
+_ARTIFACT_CACHE: Dict[str, Tuple[int, object, FeaturePipeline]] = {}
+_ARTIFACT_LOCK = threading.Lock()
+
+def load_artifact(path: str, mmap_mode: Optional[str] = 'r') -> Tuple[object, FeaturePipeline]:
+    """Load a model artifact once per process.
+    
+    Artifacts are cached by real path and modification time, so every
+    FloridaHurricaneRiskModel in a process shares one model and a replaced
+    file is picked up on the next load. NumPy arrays in the artifact are
+    memory-mapped read-only, so processes forked after loading (and other
+    processes loading the same file) share those pages through the OS page
+    cache instead of each holding a private copy.
+    """
+    key = os.path.realpath(path)
+    mtime = os.stat(key).st_mtime_ns
+    
+    with _ARTIFACT_LOCK:
+        cached = _ARTIFACT_CACHE.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+        
+        import joblib
+        
+        model_data = joblib.load(key, mmap_mode=mmap_mode)
+        if 'pipeline' in model_data:
+            pipeline = FeaturePipeline.from_dict(model_data['pipeline'])
+        else:
+            # Older artifacts stored a bare scaler fitted on the training DataFrame's
+            # columns; from_scaler rejects it unless those match the pipeline
+            pipeline = FeaturePipeline.from_scaler(model_data['scaler'])
+        
+        _ARTIFACT_CACHE[key] = (mtime, model_data['model'], pipeline)
+        return model_data['model'], pipeline
+
+def clear_model_cache():
+    """Drop all cached artifacts (e.g. before reloading in tests)"""
+    with _ARTIFACT_LOCK:
+        _ARTIFACT_CACHE.clear()
+
+def _iter_training_chunks(source, chunk_size: int, columns: set):
+    """Yield DataFrame / Arrow chunks from a Parquet path or an iterable of chunks"""
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+    
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    
+    dataset = ds.dataset(source, format='parquet')
+    present = [name for name in dataset.schema.names if name in columns]
+    for batch in dataset.to_batches(columns=present, batch_size=chunk_size):
+        yield pa.Table.from_batches([batch])
+
+def _thread_limit(n_jobs: Optional[int]):
+    """Context manager limiting native (OpenMP/BLAS) threads to n_jobs"""
+    from contextlib import nullcontext
+    from threadpoolctl import threadpool_limits
+    
+    if n_jobs is None or n_jobs < 1:
+        return nullcontext()
+    return threadpool_limits(limits=n_jobs)
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class _BatchColumns:
+    """Column access over one chunk of a DataFrame or Arrow table.
+    
+    get() and get_text() mirror parcel_data.get(key, default): absent
+    columns and null cells take the default.
+    """
+    
+    def __init__(self, chunk):
+        import pandas as pd
+        
+        self._chunk = chunk
+        self._arrow = not isinstance(chunk, pd.DataFrame)
+        self._names = set(chunk.column_names if self._arrow else chunk.columns)
+    
+    @classmethod
+    def wrap(cls, parcels) -> '_BatchColumns':
+        """Wrap a DataFrame or Arrow table, passing _BatchColumns through"""
+        return parcels if isinstance(parcels, cls) else cls(parcels)
+    
+    @classmethod
+    def iter_chunks(cls, parcels, chunk_size: int):
+        """Yield _BatchColumns over consecutive row slices of parcels"""
+        import pandas as pd
+        
+        for start in range(0, len(parcels), chunk_size):
+            if isinstance(parcels, pd.DataFrame):
+                yield cls(parcels.iloc[start:start + chunk_size])
+            else:
+                yield cls(parcels.slice(start, chunk_size))
+    
+    def __len__(self):
+        return len(self._chunk)
+    
+    def _series(self, name: str) -> pd.Series:
+        if self._arrow:
+            return self._chunk.column(name).to_pandas()
+        return self._chunk[name]
+    
+    def get(self, name: str, default: float) -> np.ndarray:
+        """Numeric column as float64, or the default for every row"""
+        import numpy as np
+        
+        if name not in self._names:
+            return np.full(len(self), default, dtype=float)
+        values = self._series(name).to_numpy(dtype=float, na_value=np.nan)
+        return np.where(np.isnan(values), default, values)
+    
+    def get_text(self, name: str, default: str) -> np.ndarray:
+        """Text column as an object array of str, or the default for every row"""
+        import numpy as np
+        
+        if name not in self._names:
+            return np.full(len(self), default, dtype=object)
+        series = self._series(name)
+        values = series.astype(str).to_numpy(dtype=object)
+        values[series.isna().to_numpy()] = default
+        return values
+
+class _RecordColumns:
+    """_BatchColumns interface over a single parcel_data dict (one row)"""
+    
+    def __init__(self, parcel_data: Dict):
+        self._data = parcel_data
+    
+    def __len__(self):
+        return 1
+    
+    def get(self, name: str, default: float) -> np.ndarray:
+        import numpy as np
+        
+        value = self._data.get(name)
+        return np.array([default if value is None else value], dtype=float)
+    
+    def get_text(self, name: str, default: str) -> np.ndarray:
+        import numpy as np
+        
+        value = self._data.get(name)
+        return np.array([default if value is None else str(value)], dtype=object)
+
 # Example usage and testing
 def demo_risk_scoring():
     """Demonstrate risk scoring with sample data"""
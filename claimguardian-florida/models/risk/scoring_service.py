@@ -0,0 +1,422 @@
+"""
+Async HTTP scoring service for the hurricane risk model.
+
+Concurrent single-parcel requests are coalesced into micro-batches and
+scored with one predict_batch call, so online callers (the parcel-risk
+edge function, CacheWarmer.warm_risk_scores) get column-wise scoring
+throughput without batching themselves. Recent results are cached with a
+TTL and /metrics reports latency percentiles and batch sizes.
+
+    python scoring_service.py --model-path hurricane_risk_model.joblib --port 8090
+
+Endpoints:
+    POST /score     one parcel as a JSON object with the fields predict_risk
+                    reads
+    GET  /score     ?parcel_id=..., features read from the feature store
+                    (--feature-store)
+    GET  /metrics   request counts, cache hit rate, p50/p99 latency,
+                    batch-size histogram
+    GET  /health    liveness and whether a trained model is loaded
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from feature_store import ParcelFeatureStore
+from risk_model import COMPONENT_WEIGHTS, FeaturePipeline, FloridaHurricaneRiskModel
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_SIZE = 100_000
+
+# Latencies kept for the p50/p99 window
+LATENCY_WINDOW = 10_000
+
+# Parcel fields the model reads; anything else in a request is ignored
+NUMERIC_FIELDS = sorted(
+    {field for _, field, _ in FeaturePipeline.RAW_FEATURES} | {"hurricane_count_20yr"}
+)
+TEXT_FIELDS = ["parcel_id", "county_fips"]
+
+
+def parse_parcel(body) -> Dict:
+    """Validate a request body and keep only the fields the model reads.
+
+    Raises:
+        ValueError: If the body is not an object or a numeric field is not a
+            finite number. Absent and null fields take the model defaults.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("request body must be a JSON object")
+
+    parcel = {}
+    for field in NUMERIC_FIELDS:
+        value = body.get(field)
+        if value is None:
+            continue
+        try:
+            number = float(value) if not isinstance(value, bool) else math.nan
+        except (TypeError, ValueError):
+            number = math.nan
+        if not math.isfinite(number):
+            raise ValueError(f"{field} must be a finite number, got {value!r}")
+        parcel[field] = number
+    for field in TEXT_FIELDS:
+        value = body.get(field)
+        if value is not None:
+            parcel[field] = str(value)
+    return parcel
+
+
+def score_records(model: FloridaHurricaneRiskModel, records: List[Dict]) -> List[Dict]:
+    """Score parcel dicts with one predict_batch call, in RiskScore shape"""
+    import pandas as pd
+
+    scores = model.predict_batch(pd.DataFrame.from_records(records))
+    columns = {name: scores[name].tolist() for name in scores.columns}
+    return [
+        {
+            "parcel_id": columns["parcel_id"][i],
+            "overall_score": columns["overall_score"][i],
+            "confidence": columns["confidence"][i],
+            "risk_category": columns["risk_category"][i],
+            "components": {name: columns[name][i] for name in COMPONENT_WEIGHTS},
+        }
+        for i in range(len(records))
+    ]
+
+
+class ResultCache:
+    """LRU cache of scores whose entries expire ttl seconds after insertion"""
+
+    def __init__(
+        self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_SIZE
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(parcel: Dict) -> str:
+        """Cache key covering every field that affects the score"""
+        return json.dumps(parcel, sort_keys=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: Dict):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class ServiceMetrics:
+    """Request counters, a latency window and a batch-size histogram"""
+
+    def __init__(self, latency_window: int = LATENCY_WINDOW):
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_parcels = 0
+        self.latencies_ms = deque(maxlen=latency_window)
+        # Batches by size bucket: the smallest power of two >= the batch size
+        self.batch_sizes = Counter()
+
+    def observe_latency(self, milliseconds: float):
+        self.latencies_ms.append(milliseconds)
+
+    def observe_batch(self, size: int):
+        self.batches += 1
+        self.batched_parcels += size
+        self.batch_sizes[1 << (size - 1).bit_length()] += 1
+
+    @staticmethod
+    def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+        """Nearest-rank percentile of an ascending list"""
+        if not ordered:
+            return None
+        return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+            "errors": self.errors,
+            "latency_ms": {
+                "p50": self._percentile(ordered, 0.50),
+                "p99": self._percentile(ordered, 0.99),
+                "max": ordered[-1] if ordered else None,
+                "samples": len(ordered),
+            },
+            "batch_size": {
+                "batches": self.batches,
+                "mean": self.batched_parcels / self.batches if self.batches else 0.0,
+                "histogram": {
+                    f"<={size}": self.batch_sizes[size]
+                    for size in sorted(self.batch_sizes)
+                },
+            },
+        }
+
+
+class MicroBatcher:
+    """Coalesce concurrent score() calls into predict_batch calls.
+
+    A batch is dispatched when max_batch parcels are waiting or the oldest
+    has waited max_wait_ms. Batches run one at a time on a worker thread so
+    the event loop keeps accepting requests; parcels that arrive while a
+    batch is scoring are dispatched together as soon as it finishes.
+    """
+
+    def __init__(
+        self,
+        model: FloridaHurricaneRiskModel,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        metrics: Optional[ServiceMetrics] = None,
+    ):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = metrics or ServiceMetrics()
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="risk-batch"
+        )
+
+    async def score(self, parcel: Dict) -> Dict:
+        """Score one parcel as part of the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((parcel, future))
+
+        # While a batch is scoring, new parcels wait for it to finish instead
+        if self._running is None:
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_wait, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._running is not None or not self._pending:
+            return
+
+        batch = self._pending[: self.max_batch]
+        del self._pending[: self.max_batch]
+        self.metrics.observe_batch(len(batch))
+        self._running = asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor,
+                score_records,
+                self.model,
+                [parcel for parcel, _ in batch],
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running = None
+            if self._pending:
+                self._dispatch()
+
+    async def close(self):
+        if self._running is not None:
+            await self._running
+        self._executor.shutdown(wait=True)
+
+
+class ScoringService:
+    """HTTP handlers around a MicroBatcher, ResultCache and ServiceMetrics"""
+
+    def __init__(
+        self,
+        model: FloridaHurricaneRiskModel,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.model = model
+        self.metrics = ServiceMetrics()
+        self.cache = ResultCache(cache_ttl, cache_size)
+        self.batcher = MicroBatcher(model, max_batch, max_wait_ms, self.metrics)
+
+    async def score(self, parcel: Dict) -> Dict:
+        """Score a validated parcel, from the cache when possible"""
+        start = time.perf_counter()
+        self.metrics.requests += 1
+        key = ResultCache.key(parcel)
+
+        result = self.cache.get(key)
+        if result is None:
+            result = await self.batcher.score(parcel)
+            self.cache.put(key, result)
+        else:
+            self.metrics.cache_hits += 1
+
+        self.metrics.observe_latency((time.perf_counter() - start) * 1000)
+        return result
+
+    async def handle_score(self, request: web.Request) -> web.Response:
+        try:
+            parcel = parse_parcel(await request.json())
+        except ValueError as e:  # includes malformed JSON
+            return web.json_response({"error": str(e)}, status=400)
+
+        try:
+            return web.json_response(await self.score(parcel))
+        except Exception as e:
+            self.metrics.errors += 1
+            return web.json_response({"error": f"scoring failed: {e}"}, status=500)
+
+    async def handle_score_by_id(self, request: web.Request) -> web.Response:
+        store = self.model.feature_store
+        if store is None:
+            return web.json_response(
+                {"error": "no feature store loaded; POST the parcel fields"}, status=404
+            )
+        parcel_id = request.query.get("parcel_id")
+        if not parcel_id:
+            return web.json_response({"error": "parcel_id is required"}, status=400)
+
+        features = store.get(parcel_id)
+        if features is None:
+            return web.json_response(
+                {"error": f"parcel {parcel_id} not in feature store {store.version}"},
+                status=404,
+            )
+        try:
+            return web.json_response(await self.score(parse_parcel(features)))
+        except Exception as e:
+            self.metrics.errors += 1
+            return web.json_response({"error": f"scoring failed: {e}"}, status=500)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        snapshot = self.metrics.snapshot()
+        snapshot["cache_entries"] = len(self.cache)
+        return web.json_response(snapshot)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        store = self.model.feature_store
+        return web.json_response(
+            {
+                "status": "ok",
+                "model_loaded": self.model.model is not None,
+                "feature_store_version": store.version if store is not None else None,
+            }
+        )
+
+    async def _on_cleanup(self, app: web.Application):
+        await self.batcher.close()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/score", self.handle_score)
+        app.router.add_get("/score", self.handle_score_by_id)
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/health", self.handle_health)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+
+def main():
+    """Run the scoring service"""
+    parser = argparse.ArgumentParser(
+        description="Serve hurricane risk scores over HTTP"
+    )
+    parser.add_argument(
+        "--model-path", help="Trained model artifact (default: rule-based scoring)"
+    )
+    parser.add_argument(
+        "--feature-store", help="Feature store directory for GET /score?parcel_id=..."
+    )
+    parser.add_argument(
+        "--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)"
+    )
+    parser.add_argument("--port", type=int, default=8090, help="Port (default: 8090)")
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=DEFAULT_MAX_BATCH,
+        help=f"Parcels per micro-batch (default: {DEFAULT_MAX_BATCH})",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=DEFAULT_MAX_WAIT_MS,
+        help="Longest a request waits for its batch to fill "
+        f"(default: {DEFAULT_MAX_WAIT_MS})",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="Seconds a score stays cached, 0 to disable "
+        f"(default: {DEFAULT_CACHE_TTL})",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Most cached scores (default: {DEFAULT_CACHE_SIZE:,})",
+    )
+    args = parser.parse_args()
+
+    store = ParcelFeatureStore(args.feature_store) if args.feature_store else None
+    model = FloridaHurricaneRiskModel(args.model_path, feature_store=store)
+    service = ScoringService(
+        model, args.max_batch, args.max_wait_ms, args.cache_ttl, args.cache_size
+    )
+    mode = "trained model" if model.model is not None else "rule-based fallback"
+    print(
+        f"🌀 Scoring with {mode}: batches of up to {args.max_batch} parcels "
+        f"/ {args.max_wait_ms:g} ms"
+    )
+    if store is not None:
+        print(f"📚 Feature store {store.version}: {len(store):,} parcels")
+    web.run_app(service.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+
+"""
+Parcel vector tile builder for ClaimGuardian Florida Data Platform
+Renders parcel MVT tiles from PostGIS (ST_AsMVT) or a local GeoParquet /
+GeoPackage extract, and writes them into the Redis tile cache or an
+MBTiles file so the pyramid can be pre-baked offline
+"""
+
+import os
+import gzip
+import json
+import math
+import sqlite3
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from cache_codec import Compression, ContentType, default_compression, encode_value
+
+# Web Mercator (EPSG:3857) half-width of the world in meters
+MERCATOR_EXTENT = 20037508.342789244
+MAX_MERCATOR_LAT = 85.05112878
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # in tile units, so polygons crossing the edge render cleanly
+LAYER_NAME = "parcels"
+
+# Parcel attributes carried in the tiles
+PROPERTY_COLUMNS = ["parcel_id", "co_no", "jv"]
+
+# Most tiles per worker task; big enough to amortise the round trip to the pool
+TILES_PER_TASK = 64
+
+# Tiles written per pipelined Redis round trip
+REDIS_BATCH_SIZE = 500
+
+DEFAULT_TILE_TTL = 7 * 24 * 3600
+
+POSTGIS_TILE_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom,
+           ST_TileEnvelope(%(z)s, %(x)s, %(y)s, margin => %(margin)s) AS buffered
+),
+mvtgeom AS (
+    SELECT ST_AsMVTGeom(
+               ST_Transform(p.geom, 3857), bounds.geom, %(extent)s, %(buffer)s, true
+           ) AS geom,
+           p.parcel_id, p.co_no, p.jv
+    FROM florida_parcels p, bounds
+    WHERE p.geom && ST_Transform(
+        bounds.buffered, Find_SRID('public', 'florida_parcels', 'geom')
+    )
+)
+SELECT ST_AsMVT(mvtgeom.*, %(layer)s, %(extent)s, 'geom')
+FROM mvtgeom
+WHERE geom IS NOT NULL
+"""
+
+POSTGIS_EXTENT_SQL = """
+SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e)
+FROM (SELECT ST_Transform(
+          ST_SetSRID(ST_Extent(geom), Find_SRID('public', 'florida_parcels', 'geom')),
+          3857
+      ) AS e
+      FROM florida_parcels) extent
+"""
+
+
+def tile_size(zoom: int) -> float:
+    """Width of a tile at this zoom in Web Mercator meters"""
+    return 2 * MERCATOR_EXTENT / (1 << zoom)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(minx, miny, maxx, maxy) of a tile in Web Mercator meters"""
+    size = tile_size(zoom)
+    minx = -MERCATOR_EXTENT + x * size
+    maxy = MERCATOR_EXTENT - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def lonlat_to_mercator(lon: float, lat: float) -> Tuple[float, float]:
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = math.radians(lon) * 6378137.0
+    y = math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) * 6378137.0
+    return x, y
+
+
+def tiles_in_extent(
+    extent: Tuple[float, float, float, float], zoom: int
+) -> Iterator[Tuple[int, int]]:
+    """Tiles at this zoom intersecting a Web Mercator extent"""
+    size = tile_size(zoom)
+    last = (1 << zoom) - 1
+    x0 = min(max(int((extent[0] + MERCATOR_EXTENT) // size), 0), last)
+    x1 = min(max(int((extent[2] + MERCATOR_EXTENT) // size), 0), last)
+    y0 = min(max(int((MERCATOR_EXTENT - extent[3]) // size), 0), last)
+    y1 = min(max(int((MERCATOR_EXTENT - extent[1]) // size), 0), last)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+class ExtractSource:
+    """Parcels from a local GeoParquet or GeoPackage extract
+
+    prepare() reprojects the extract to Web Mercator once into a scratch
+    GeoParquet file; every worker loads that file and builds its own
+    STRtree.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.geoms = None
+        self.properties: List[Dict] = []
+        self.tree = None
+
+    @staticmethod
+    def prepare(
+        path: str,
+        scratch_dir: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+    ) -> Tuple[str, np.ndarray]:
+        """Write a Web Mercator copy of the extract; returns (path, parcel bounds)"""
+        import geopandas as gpd
+        import shapely
+
+        if path.endswith(".parquet"):
+            parcels = gpd.read_parquet(path)
+        else:
+            # A GeoSeries bbox carries its CRS, so it is reprojected to the
+            # extract's own CRS (e.g. EPSG:3086) before filtering the read
+            read_bbox = (
+                gpd.GeoSeries([shapely.box(*bbox)], crs=4326)
+                if bbox is not None
+                else None
+            )
+            parcels = gpd.read_file(path, bbox=read_bbox)
+        if parcels.crs is None:
+            parcels = parcels.set_crs(4326)
+        parcels = parcels[parcels.geometry.notna() & ~parcels.geometry.is_empty]
+        columns = [column for column in PROPERTY_COLUMNS if column in parcels.columns]
+        parcels = parcels[columns + ["geometry"]].to_crs(3857)
+        if bbox is not None:
+            minx, miny = lonlat_to_mercator(bbox[0], bbox[1])
+            maxx, maxy = lonlat_to_mercator(bbox[2], bbox[3])
+            parcels = parcels.cx[minx:maxx, miny:maxy]
+
+        prepared = os.path.join(scratch_dir, "parcels-3857.parquet")
+        parcels.to_parquet(prepared)
+        return prepared, parcels.geometry.bounds.to_numpy()
+
+    def load(self):
+        import geopandas as gpd
+        import shapely
+
+        parcels = gpd.read_parquet(self.path)
+        self.geoms = parcels.geometry.to_numpy()
+        self.properties = parcels.drop(columns="geometry").to_dict("records")
+        self.tree = shapely.STRtree(self.geoms)
+
+    def render(self, zoom: int, x: int, y: int) -> bytes:
+        import shapely
+        import mapbox_vector_tile
+        from mapbox_vector_tile.encoder import on_invalid_geometry_make_valid
+
+        bounds = tile_bounds(zoom, x, y)
+        margin = tile_size(zoom) * TILE_BUFFER / TILE_EXTENT
+        buffered = (
+            bounds[0] - margin,
+            bounds[1] - margin,
+            bounds[2] + margin,
+            bounds[3] + margin,
+        )
+
+        hits = self.tree.query(shapely.box(*buffered))
+        if len(hits) == 0:
+            return b""
+        hits.sort()
+
+        # Clip to the buffered tile, then move to tile units (y down) and
+        # snap to the integer grid, vectorised over the whole tile: parcels
+        # that collapse below one unit drop out, as with ST_AsMVTGeom
+        scale = TILE_EXTENT / tile_size(zoom)
+        geoms = shapely.clip_by_rect(self.geoms[hits], *buffered)
+        geoms = shapely.transform(
+            geoms, lambda xy: (xy - (bounds[0], bounds[3])) * (scale, -scale)
+        )
+        geoms = shapely.set_precision(shapely.simplify(geoms, 0.5), 1.0)
+        # Exterior rings with positive area in tile coordinates, as MVT requires
+        geoms = shapely.orient_polygons(geoms)
+
+        features = [
+            {"geometry": geom, "properties": _tile_properties(self.properties[index])}
+            for index, geom in zip(hits, geoms)
+            if not geom.is_empty
+        ]
+        if not features:
+            return b""
+        return mapbox_vector_tile.encode(
+            [{"name": LAYER_NAME, "features": features}],
+            default_options={
+                "extents": TILE_EXTENT,
+                "y_coord_down": True,
+                "check_winding_order": False,
+                "on_invalid_geometry": on_invalid_geometry_make_valid,
+            },
+        )
+
+
+def _tile_properties(record: Dict) -> Dict:
+    """MVT-safe attributes: no nulls, numpy scalars as Python numbers"""
+    return {
+        key: value.item() if hasattr(value, "item") else value
+        for key, value in record.items()
+        if value is not None and not (isinstance(value, float) and math.isnan(value))
+    }
+
+
+class PostGISSource:
+    """Parcels rendered by PostGIS with ST_AsMVT, one connection per worker"""
+
+    def __init__(self, database_url: str):
+        self.database_url = database_url
+        self.conn = None
+
+    @staticmethod
+    def extent(database_url: str) -> Tuple[float, float, float, float]:
+        """Web Mercator extent of florida_parcels"""
+        import psycopg2
+
+        with psycopg2.connect(database_url) as conn, conn.cursor() as cur:
+            cur.execute(POSTGIS_EXTENT_SQL)
+            return cur.fetchone()
+
+    def load(self):
+        import psycopg2
+
+        self.conn = psycopg2.connect(self.database_url)
+        self.conn.set_session(readonly=True, autocommit=True)
+
+    def render(self, zoom: int, x: int, y: int) -> bytes:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                POSTGIS_TILE_SQL,
+                {
+                    "z": zoom,
+                    "x": x,
+                    "y": y,
+                    "margin": TILE_BUFFER / TILE_EXTENT,
+                    "extent": TILE_EXTENT,
+                    "buffer": TILE_BUFFER,
+                    "layer": LAYER_NAME,
+                },
+            )
+            row = cur.fetchone()
+        return bytes(row[0]) if row and row[0] else b""
+
+
+# Per-process source, set by the pool initializer
+_source = None
+
+
+def _init_worker(kind: str, location: str):
+    global _source
+    _source = ExtractSource(location) if kind == "extract" else PostGISSource(location)
+    _source.load()
+
+
+def _render_tiles(
+    zoom: int, tiles: List[Tuple[int, int]]
+) -> List[Tuple[int, int, bytes]]:
+    """Render a chunk of tiles in a worker, dropping empty ones"""
+    rendered = []
+    for x, y in tiles:
+        data = _source.render(zoom, x, y)
+        if data:
+            rendered.append((x, y, data))
+    return rendered
+
+
+def occupied_tiles(parcel_bounds: np.ndarray, zoom: int) -> List[Tuple[int, int]]:
+    """Tiles at this zoom touched by at least one parcel bounding box"""
+    size = tile_size(zoom)
+    last = (1 << zoom) - 1
+    x0 = np.clip(
+        ((parcel_bounds[:, 0] + MERCATOR_EXTENT) // size).astype(np.int64), 0, last
+    )
+    x1 = np.clip(
+        ((parcel_bounds[:, 2] + MERCATOR_EXTENT) // size).astype(np.int64), 0, last
+    )
+    y0 = np.clip(
+        ((MERCATOR_EXTENT - parcel_bounds[:, 3]) // size).astype(np.int64), 0, last
+    )
+    y1 = np.clip(
+        ((MERCATOR_EXTENT - parcel_bounds[:, 1]) // size).astype(np.int64), 0, last
+    )
+
+    # Nearly every parcel falls in one tile; expand the rest explicitly
+    single = (x0 == x1) & (y0 == y1)
+    tiles = set(zip(x0[single].tolist(), y0[single].tolist()))
+    for i in np.flatnonzero(~single):
+        for x in range(x0[i], x1[i] + 1):
+            for y in range(y0[i], y1[i] + 1):
+                tiles.add((x, y))
+    # Spatially ordered so each worker chunk shares nearby parcels
+    return sorted(tiles)
+
+
+class RedisTileWriter:
+    """Writes tiles into the parcel tile cache the warmer and API read"""
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int = DEFAULT_TILE_TTL,
+        compression: Optional[Compression] = None,
+    ):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url)
+        self.ttl = ttl
+        self.compression = default_compression() if compression is None else compression
+        self.pending: List[Tuple[str, bytes]] = []
+        self.bytes_written = 0
+
+    def write(self, zoom: int, x: int, y: int, data: bytes):
+        value = encode_value(data, ContentType.MVT, self.compression)
+        self.pending.append((f"tile:parcels:{zoom}:{x}:{y}", value))
+        self.bytes_written += len(value)
+        if len(self.pending) >= REDIS_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in self.pending:
+            pipe.setex(key, self.ttl, value)
+        pipe.execute()
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.client.close()
+
+
+class MBTilesWriter:
+    """Writes tiles into an MBTiles 1.3 file (gzipped MVT, TMS rows)"""
+
+    def __init__(
+        self,
+        path: str,
+        zoom_levels: List[int],
+        extent: Optional[Tuple[float, float, float, float]] = None,
+    ):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER,
+                tile_column INTEGER,
+                tile_row INTEGER,
+                tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row)
+            );
+        """)
+        metadata = {
+            "name": "ClaimGuardian Florida parcels",
+            "format": "pbf",
+            "type": "overlay",
+            "version": "1",
+            "minzoom": str(min(zoom_levels)),
+            "maxzoom": str(max(zoom_levels)),
+            "json": json.dumps(
+                {
+                    "vector_layers": [
+                        {
+                            "id": LAYER_NAME,
+                            "fields": {
+                                "parcel_id": "String",
+                                "co_no": "Number",
+                                "jv": "Number",
+                            },
+                            "minzoom": min(zoom_levels),
+                            "maxzoom": max(zoom_levels),
+                        }
+                    ]
+                }
+            ),
+        }
+        if extent is not None:
+            lon_min, lat_min = _mercator_to_lonlat(extent[0], extent[1])
+            lon_max, lat_max = _mercator_to_lonlat(extent[2], extent[3])
+            metadata["bounds"] = (
+                f"{lon_min:.6f},{lat_min:.6f},{lon_max:.6f},{lat_max:.6f}"
+            )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?)", metadata.items()
+        )
+        self.bytes_written = 0
+
+    def write(self, zoom: int, x: int, y: int, data: bytes):
+        if not data.startswith(b"\x1f\x8b"):
+            data = gzip.compress(data, mtime=0)
+        tms_row = (1 << zoom) - 1 - y
+        self.conn.execute(
+            "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (zoom, x, tms_row, data)
+        )
+        self.bytes_written += len(data)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def _mercator_to_lonlat(x: float, y: float) -> Tuple[float, float]:
+    lon = math.degrees(x / 6378137.0)
+    lat = math.degrees(2 * math.atan(math.exp(y / 6378137.0)) - math.pi / 2)
+    return lon, lat
+
+
+def build_tiles(
+    kind: str,
+    location: str,
+    writer,
+    zoom_levels: List[int],
+    tile_lists: Dict[int, List[Tuple[int, int]]],
+    jobs: int,
+) -> int:
+    """Render every zoom's tiles across a process pool and write them
+
+    Zooms are rendered one after another; each zoom's tiles are split
+    into spatially contiguous chunks across the pool.
+    """
+    written = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(kind, location)
+    ) as pool:
+        for zoom in zoom_levels:
+            tiles = tile_lists[zoom]
+            start_time = time.time()
+            # Spread small zooms over every worker too
+            size = max(1, min(TILES_PER_TASK, math.ceil(len(tiles) / (4 * jobs))))
+            chunks = [tiles[i : i + size] for i in range(0, len(tiles), size)]
+            zoom_written = 0
+            for rendered in pool.map(_render_tiles, [zoom] * len(chunks), chunks):
+                for x, y, data in rendered:
+                    writer.write(zoom, x, y, data)
+                zoom_written += len(rendered)
+            elapsed = time.time() - start_time
+            print(
+                f"🧱 Zoom {zoom}: {zoom_written:,} tiles from "
+                f"{len(tiles):,} candidates in {elapsed:.1f}s "
+                f"({len(tiles) / max(elapsed, 1e-9):.0f} tiles/s)"
+            )
+            written += zoom_written
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build parcel vector tiles into Redis or MBTiles"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--extract", help="GeoParquet (.parquet) or GeoPackage/other OGR parcel extract"
+    )
+    source.add_argument(
+        "--database-url",
+        nargs="?",
+        const=os.getenv("DATABASE_URL"),
+        help="Render with PostGIS ST_AsMVT (default URL: $DATABASE_URL)",
+    )
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--mbtiles", help="Write tiles into this MBTiles file")
+    output.add_argument(
+        "--redis",
+        nargs="?",
+        const=os.getenv("REDIS_URL", "redis://localhost:6379"),
+        help="Write tiles into the Redis tile cache (default URL: $REDIS_URL)",
+    )
+    parser.add_argument(
+        "--zooms",
+        default="10,11,12,13",
+        help="Comma-separated zoom levels (default: 10-13)",
+    )
+    parser.add_argument(
+        "--bbox", help="Only build tiles inside lon_min,lat_min,lon_max,lat_max"
+    )
+    parser.add_argument(
+        "--ttl",
+        type=int,
+        default=DEFAULT_TILE_TTL,
+        help="Redis tile TTL in seconds (default: 7 days)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Worker processes (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    zoom_levels = sorted({int(zoom) for zoom in args.zooms.split(",")})
+    bbox = tuple(float(value) for value in args.bbox.split(",")) if args.bbox else None
+    start_time = time.time()
+
+    with tempfile.TemporaryDirectory(prefix="build-tiles-") as scratch:
+        if args.extract:
+            print(f"📦 Preparing {args.extract}...")
+            kind = "extract"
+            location, parcel_bounds = ExtractSource.prepare(args.extract, scratch, bbox)
+            print(f"✅ {len(parcel_bounds):,} parcels")
+            if len(parcel_bounds) == 0:
+                return 1
+            extent = (
+                *parcel_bounds[:, :2].min(axis=0),
+                *parcel_bounds[:, 2:].max(axis=0),
+            )
+            tile_lists = {
+                zoom: occupied_tiles(parcel_bounds, zoom) for zoom in zoom_levels
+            }
+        else:
+            if not args.database_url:
+                print("❌ No database URL; pass one or set DATABASE_URL")
+                return 1
+            kind, location = "postgis", args.database_url
+            if bbox:
+                extent = (
+                    *lonlat_to_mercator(bbox[0], bbox[1]),
+                    *lonlat_to_mercator(bbox[2], bbox[3]),
+                )
+            else:
+                extent = PostGISSource.extent(args.database_url)
+            tile_lists = {
+                zoom: list(tiles_in_extent(extent, zoom)) for zoom in zoom_levels
+            }
+
+        if args.mbtiles:
+            writer = MBTilesWriter(args.mbtiles, zoom_levels, extent)
+        else:
+            writer = RedisTileWriter(args.redis, args.ttl)
+
+        try:
+            written = build_tiles(
+                kind, location, writer, zoom_levels, tile_lists, args.jobs
+            )
+        finally:
+            writer.close()
+
+    elapsed = time.time() - start_time
+    print(
+        f"\n🎉 Built {written:,} tiles ({writer.bytes_written / 1e6:.1f} MB) "
+        f"in {elapsed:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
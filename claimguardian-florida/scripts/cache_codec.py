@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+"""
+Binary cache value codec for the ClaimGuardian Redis cache
+Frames every cached value with a short header (type, version, compression)
+and compresses values above a size threshold
+"""
+
+import gzip
+import struct
+from collections import defaultdict
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+MAGIC = 0xC6
+CODEC_VERSION = 1
+HEADER = struct.Struct(">BBBB")  # magic, version, content type, compression
+
+# Values smaller than this are stored uncompressed; the frame overhead
+# would eat most of the saving
+DEFAULT_COMPRESS_MIN_BYTES = 512
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 6
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class ContentType(IntEnum):
+    BYTES = 0
+    JSON = 1
+    MVT = 2
+
+
+class Compression(IntEnum):
+    NONE = 0
+    GZIP = 1
+    ZSTD = 2
+
+
+class CacheCodecError(ValueError):
+    """Raised for cache values this codec cannot decode"""
+
+
+def default_compression() -> Compression:
+    """zstd when the zstandard package is installed, gzip otherwise"""
+    return Compression.ZSTD if zstandard is not None else Compression.GZIP
+
+
+def _compress(payload: bytes, compression: Compression) -> bytes:
+    if compression == Compression.GZIP:
+        return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == Compression.ZSTD:
+        if zstandard is None:
+            raise CacheCodecError("zstd compression needs the zstandard package")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return payload
+
+
+def _decompress(payload: bytes, compression: int) -> bytes:
+    if compression == Compression.NONE:
+        return payload
+    if compression == Compression.GZIP:
+        return gzip.decompress(payload)
+    if compression == Compression.ZSTD:
+        if zstandard is None:
+            raise CacheCodecError("zstd-compressed value needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise CacheCodecError(f"Unknown compression {compression}")
+
+
+def encode_value(
+    payload: bytes,
+    content_type: ContentType = ContentType.BYTES,
+    compression: Optional[Compression] = None,
+    min_size: int = DEFAULT_COMPRESS_MIN_BYTES,
+) -> bytes:
+    """Frame a payload for storage, compressing it if that makes it smaller
+
+    Payloads under min_size, and payloads that are already gzip-compressed
+    (as some tile servers send MVT), are stored as-is.
+    """
+    if compression is None:
+        compression = default_compression()
+
+    stored, used = payload, Compression.NONE
+    if (
+        compression != Compression.NONE
+        and len(payload) >= min_size
+        and not payload.startswith(GZIP_MAGIC)
+    ):
+        compressed = _compress(payload, compression)
+        if len(compressed) < len(payload):
+            stored, used = compressed, compression
+
+    return HEADER.pack(MAGIC, CODEC_VERSION, content_type, used) + stored
+
+
+def decode_value(data: bytes) -> Tuple[ContentType, bytes]:
+    """Content type and original payload of a cached value
+
+    Values written before the codec existed (no header) come back as
+    ContentType.BYTES, unchanged.
+    """
+    if len(data) < HEADER.size or data[0] != MAGIC:
+        return ContentType.BYTES, data
+
+    _, version, content_type, compression = HEADER.unpack_from(data)
+    if version != CODEC_VERSION:
+        raise CacheCodecError(f"Unsupported cache codec version {version}")
+    try:
+        content_type = ContentType(content_type)
+    except ValueError:
+        raise CacheCodecError(f"Unknown content type {content_type}")
+    return content_type, _decompress(data[HEADER.size :], compression)
+
+
+def key_class(cache_key: str) -> str:
+    """Key prefix without the identifying parts, e.g. tile:parcels or risk"""
+    parts = cache_key.split(":")[:-1]
+    return ":".join(part for part in parts if not part.isdigit()) or cache_key
+
+
+class CacheByteStats:
+    """Raw vs stored bytes per key class"""
+
+    def __init__(self):
+        self.classes: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"keys": 0, "raw_bytes": 0, "stored_bytes": 0}
+        )
+
+    def record(self, cache_key: str, raw_bytes: int, stored_bytes: int):
+        entry = self.classes[key_class(cache_key)]
+        entry["keys"] += 1
+        entry["raw_bytes"] += raw_bytes
+        entry["stored_bytes"] += stored_bytes
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per key class: keys, raw and stored bytes, ratio and mean stored size"""
+        return {
+            name: {
+                **entry,
+                "ratio": (
+                    entry["raw_bytes"] / entry["stored_bytes"]
+                    if entry["stored_bytes"]
+                    else 0.0
+                ),
+                "mean_stored_bytes": (
+                    entry["stored_bytes"] / entry["keys"] if entry["keys"] else 0.0
+                ),
+            }
+            for name, entry in sorted(self.classes.items())
+        }
+
+    def report(self):
+        """Print the per key class byte accounting"""
+        for name, entry in self.summary().items():
+            print(
+                f"💾 {name}: {entry['keys']:,} keys, {entry['raw_bytes']:,} B raw -> "
+                f"{entry['stored_bytes']:,} B stored ({entry['ratio']:.2f}x, "
+                f"{entry['mean_stored_bytes']:.0f} B/key)"
+            )
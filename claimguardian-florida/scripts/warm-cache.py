@@ -6,14 +6,170 @@ Preloads critical data and tiles into Redis cache
 """
 
 import os
+import re
 import asyncio
+import argparse
 import aiohttp
 import redis.asyncio as redis
+from redis.exceptions import ResponseError
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Tuple
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
 import json
+import math
+import socket
 import time
 
+from cache_codec import (
+    DEFAULT_COMPRESS_MIN_BYTES, CacheByteStats, Compression, ContentType,
+    default_compression, encode_value,
+)
+
+# Concurrent API requests (and pooled connections) per warmer
+DEFAULT_CONCURRENCY = 32
+
+# Keys checked with one pipelined EXISTS round trip and written with one
+# pipelined SETEX round trip
+DEFAULT_BATCH_SIZE = 500
+
+# Most tiles warmed per zoom level across all requested counties
+MAX_TILES_PER_ZOOM = 5000
+
+# Redis key prefix for resumable tile pyramid cursors
+TILE_CURSOR_PREFIX = "warm:cursor:tiles"
+TILE_CURSOR_TTL = 7 * 24 * 3600
+
+# Redis stream of changed parcels, written by the ETL loaders after commit.
+# Each entry has a `changes` field: a JSON list of
+# {"parcel_id", "scope": "parcel"|"risk", and optionally "lon"/"lat",
+# "bbox": [lon_min, lat_min, lon_max, lat_max] or a GeoJSON "geometry"}
+CHANGE_STREAM = "cache:parcel-changes"
+CHANGE_GROUP = "cache-warmer"
+
+# Entries pending this long (ms) on another consumer are taken to belong to
+# a dead warmer and are claimed by a live one
+CLAIM_IDLE_MS = 60000
+
+# Warming bands, warmed in this order by warm_prioritized
+PRIORITY_EVENT = 0   # inside active event polygons
+PRIORITY_HOT = 1     # most requested keys
+PRIORITY_VALUE = 2   # highest just value (JV)
+
+# Request paths in access logs and the cache keys they read
+ACCESS_LOG_PATTERNS = [
+    (re.compile(r'/api/tiles/parcels/(\d+)/(\d+)/(\d+)\.mvt'), 'tile:parcels:{0}:{1}:{2}'),
+    (re.compile(r'/api/parcels/([\w.-]+)'), 'parcel:{0}'),
+    (re.compile(r'parcel-risk\?parcel_id=([\w.-]+)'), 'risk:{0}'),
+]
+
+# Cache key patterns sampled for access frequency in Redis
+HOT_KEY_PATTERNS = ['tile:parcels:*', 'parcel:*', 'risk:*']
+
+TOP_VALUE_PARCELS_SQL = """
+SELECT parcel_id FROM florida_parcels
+WHERE jv IS NOT NULL AND parcel_id IS NOT NULL
+ORDER BY jv DESC
+LIMIT %s
+"""
+
+EVENT_PARCELS_SQL = """
+SELECT parcel_id FROM florida_parcels
+WHERE parcel_id IS NOT NULL AND ST_Intersects(
+    geom,
+    ST_Transform(ST_SetSRID(ST_GeomFromGeoJSON(%s), 4326), Find_SRID('public', 'florida_parcels', 'geom'))
+)
+ORDER BY jv DESC NULLS LAST
+LIMIT %s
+"""
+
+# Web Mercator is undefined beyond this latitude
+MAX_MERCATOR_LAT = 85.05112878
+
+# Approximate county extents: [(lat_min, lon_min), (lat_max, lon_max)]
+COUNTY_BOUNDS = {
+    '12011': [(25.96, -80.88), (26.33, -80.03)],  # Broward
+    '12015': [(26.68, -82.40), (27.04, -81.56)],  # Charlotte
+    '12021': [(25.80, -81.85), (26.52, -80.87)],  # Collier
+    '12071': [(26.32, -82.28), (26.79, -81.56)],  # Lee
+    '12086': [(25.13, -80.88), (25.98, -80.12)],  # Miami-Dade
+    '12087': [(24.39, -81.82), (25.98, -80.25)],  # Monroe
+    '12099': [(26.32, -80.89), (26.97, -80.03)],  # Palm Beach
+    '12115': [(26.94, -82.65), (27.39, -82.06)],  # Sarasota
+}
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """Web Mercator (slippy map) tile containing a point"""
+    lat = max(min(lat, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def tile_range(bounds: List[Tuple[float, float]], zoom: int) -> Tuple[int, int, int, int]:
+    """(x_min, y_min, x_max, y_max) of the tiles covering bounds at zoom"""
+    (lat_min, lon_min), (lat_max, lon_max) = bounds
+    # Tile y grows southwards, so the north-west corner has the smallest x and y
+    x_min, y_min = lonlat_to_tile(lon_min, lat_max, zoom)
+    x_max, y_max = lonlat_to_tile(lon_max, lat_min, zoom)
+    return x_min, y_min, x_max, y_max
+
+def iter_tiles(bounds_list: List[List[Tuple[float, float]]], zoom: int) -> Iterator[Tuple[int, int]]:
+    """Tiles covering any of bounds_list at zoom, each once, row by row"""
+    seen = set()
+    for bounds in bounds_list:
+        x_min, y_min, x_max, y_max = tile_range(bounds, zoom)
+        for y in range(y_min, y_max + 1):
+            for x in range(x_min, x_max + 1):
+                if (x, y) not in seen:
+                    seen.add((x, y))
+                    yield x, y
+
+def access_log_keys(path: str) -> Counter:
+    """Requests per cache key in an access log (any format with request paths)"""
+    counts = Counter()
+    with open(path, errors='replace') as f:
+        for line in f:
+            for pattern, key in ACCESS_LOG_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    counts[key.format(*match.groups())] += 1
+                    break
+    return counts
+
+def load_event_geometries(path: str) -> List[Dict]:
+    """Geometries of every feature in a GeoJSON file of active event areas"""
+    with open(path) as f:
+        data = json.load(f)
+    features = data.get('features', [data])
+    return [feature.get('geometry', feature) for feature in features if feature.get('geometry', feature)]
+
+def geometry_bounds(geometry: Dict) -> List[Tuple[float, float]]:
+    """[(lat_min, lon_min), (lat_max, lon_max)] of a GeoJSON geometry"""
+    points = []
+    stack = [geometry.get('coordinates', [])] + [g.get('coordinates', []) for g in geometry.get('geometries', [])]
+    while stack:
+        item = stack.pop()
+        if item and isinstance(item[0], (int, float)):
+            points.append(item)
+        else:
+            stack.extend(item)
+    lons = [point[0] for point in points]
+    lats = [point[1] for point in points]
+    return [(min(lats), min(lons)), (max(lats), max(lons))]
+
+def change_bounds(change: Dict) -> Optional[List[Tuple[float, float]]]:
+    """[(lat_min, lon_min), (lat_max, lon_max)] of a change entry's location, if any"""
+    if change.get('bbox'):
+        lon_min, lat_min, lon_max, lat_max = change['bbox']
+        return [(lat_min, lon_min), (lat_max, lon_max)]
+    if change.get('geometry'):
+        return geometry_bounds(change['geometry'])
+    if change.get('lon') is not None and change.get('lat') is not None:
+        return [(change['lat'], change['lon']), (change['lat'], change['lon'])]
+    return None
+
 @dataclass
 class WarmingTarget:
     name: str
@@ -23,191 +179,591 @@ class WarmingTarget:
     priority: int = 1
 
 class CacheWarmer:
-    def __init__(self, redis_url: str, api_base_url: str):
+    def __init__(self, redis_url: str, api_base_url: str,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 database_url: Optional[str] = None,
+                 compression: Optional[Compression] = None,
+                 compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES):
         self.redis_url = redis_url
         self.api_base_url = api_base_url
+        self.database_url = database_url
+        self.edge_function_url = os.getenv('SUPABASE_URL', '').replace('/rest/v1', '/functions/v1')
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.compression = default_compression() if compression is None else compression
+        self.compress_min_bytes = compress_min_bytes
+        self.byte_stats = CacheByteStats()
         self.redis_client = None
+        self.session: Optional[aiohttp.ClientSession] = None
         
     async def connect(self):
-        """Initialize Redis connection"""
-        self.redis_client = redis.from_url(
-            self.redis_url,
-            encoding="utf-8",
-            decode_responses=True
+        """Initialize Redis connection and the shared HTTP session"""
+        # Values are codec-framed bytes (see cache_codec), so responses
+        # must not be decoded as text
+        self.redis_client = redis.from_url(self.redis_url)
+        # One pooled session for every request; the connector caps open
+        # sockets at the concurrency limit
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30)
         )
         
     async def disconnect(self):
-        """Close Redis connection"""
+        """Close the HTTP session and Redis connection"""
+        if self.session:
+            await self.session.close()
         if self.redis_client:
             await self.redis_client.close()
     
-    async def warm_tiles(self, counties: List[str], zoom_levels: List[int]) -> int:
-        """Warm parcel tiles for specified counties"""
-        warmed_count = 0
+    async def warm_tiles(self, counties: List[str], zoom_levels: List[int],
+                         max_tiles_per_zoom: int = MAX_TILES_PER_ZOOM,
+                         max_tiles: Optional[int] = None,
+                         deadline: Optional[float] = None) -> int:
+        """Warm the parcel tile pyramid over the counties' bounds
         
-        # Get county bounding boxes (simplified for demo)
-        county_bounds = {
-            '12015': [(26.8, -82.5), (27.2, -81.8)],  # Charlotte
-            '12115': [(27.0, -82.8), (27.4, -82.3)],  # Sarasota  
-            '12086': [(25.1, -80.9), (25.9, -80.1)]   # Miami-Dade
-        }
+        Zooms are walked low to high so the tiles every map load needs are
+        cached first. Each zoom warms at most max_tiles_per_zoom tiles
+        across all counties. Progress is saved in a Redis cursor after every
+        batch: a run stopped by max_tiles, the deadline (time.monotonic())
+        or a kill resumes where it left off on the next call with the same
+        counties, zooms and cap.
+        """
+        bounds_list = [COUNTY_BOUNDS[fips] for fips in counties if fips in COUNTY_BOUNDS]
+        unknown = [fips for fips in counties if fips not in COUNTY_BOUNDS]
+        if unknown:
+            print(f"⚠️  No bounds for counties {', '.join(unknown)}, skipping")
         
-        tasks = []
-        for county_fips in counties:
-            if county_fips not in county_bounds:
+        signature = json.dumps([sorted(counties), sorted(set(zoom_levels)), max_tiles_per_zoom])
+        cursor_key = f"{TILE_CURSOR_PREFIX}:{hashlib.sha1(signature.encode()).hexdigest()[:12]}"
+        cursor = await self._load_cursor(cursor_key)
+        if cursor:
+            print(f"↩️  Resuming tile warming at zoom {cursor['zoom']}, tile {cursor['index']:,}")
+        
+        warmed_count = 0
+        budget = max_tiles
+        for zoom in sorted(set(zoom_levels)):
+            if cursor and zoom < cursor['zoom']:
                 continue
+            index = cursor['index'] if cursor and zoom == cursor['zoom'] else 0
+            
+            tiles = list(islice(iter_tiles(bounds_list, zoom), max_tiles_per_zoom))
+            if len(tiles) == max_tiles_per_zoom:
+                print(f"⚠️  Zoom {zoom} capped at {max_tiles_per_zoom:,} tiles")
+            
+            while index < len(tiles):
+                if (budget is not None and budget <= 0) or (deadline is not None and time.monotonic() >= deadline):
+                    await self._save_cursor(cursor_key, zoom, index)
+                    print(f"⏸️  Tile budget reached at zoom {zoom}, tile {index:,}; rerun to resume")
+                    return warmed_count
                 
-            bounds = county_bounds[county_fips]
-            for zoom in zoom_levels:
-                # Calculate tile ranges for county bounds
-                tile_coords = self._get_tile_coords(bounds, zoom)
-                
-                for x, y in tile_coords:
-                    target = WarmingTarget(
-                        name=f"tile_{county_fips}_{zoom}_{x}_{y}",
-                        url=f"{self.api_base_url}/api/tiles/parcels/{zoom}/{x}/{y}.mvt",
-                        cache_key=f"tile:parcels:{zoom}:{x}:{y}",
-                        ttl=3600,
-                        priority=1
-                    )
-                    tasks.append(self._warm_single_target(target))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        warmed_count = sum(1 for r in results if r is True)
+                size = self.batch_size if budget is None else min(self.batch_size, budget)
+                chunk = tiles[index:index + size]
+                warmed_count += await self.warm_targets([self._tile_target(zoom, x, y) for x, y in chunk])
+                index += len(chunk)
+                if budget is not None:
+                    budget -= len(chunk)
+                await self._save_cursor(cursor_key, zoom, index)
         
+        await self.redis_client.delete(cursor_key)
         print(f"✅ Warmed {warmed_count} parcel tiles")
         return warmed_count
     
+    def _tile_target(self, zoom: int, x: int, y: int) -> WarmingTarget:
+        return WarmingTarget(
+            name=f"tile_{zoom}_{x}_{y}",
+            url=f"{self.api_base_url}/api/tiles/parcels/{zoom}/{x}/{y}.mvt",
+            cache_key=f"tile:parcels:{zoom}:{x}:{y}",
+            ttl=3600,
+            priority=zoom
+        )
+    
+    async def _load_cursor(self, key: str) -> Optional[Dict[str, int]]:
+        value = await self.redis_client.get(key)
+        return json.loads(value) if value else None
+    
+    async def _save_cursor(self, key: str, zoom: int, index: int):
+        await self.redis_client.setex(key, TILE_CURSOR_TTL, json.dumps({'zoom': zoom, 'index': index}))
+    
     async def warm_high_value_parcels(self, limit: int = 1000) -> int:
-        """Warm cache for highest value parcels"""
-        # This would query the database for high-value parcels
-        # For demo, using placeholder parcel IDs
-        high_value_parcels = [
-            f"12015-{i:06d}" for i in range(1, limit + 1)
-        ]
-        
-        tasks = []
-        for parcel_id in high_value_parcels:
-            target = WarmingTarget(
-                name=f"parcel_{parcel_id}",
-                url=f"{self.api_base_url}/api/parcels/{parcel_id}",
-                cache_key=f"parcel:{parcel_id}",
-                ttl=900,  # 15 minutes
-                priority=2
-            )
-            tasks.append(self._warm_single_target(target))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        warmed_count = sum(1 for r in results if r is True)
+        """Warm cache for the parcels with the highest just value"""
+        parcel_ids = await self.top_value_parcel_ids(limit)
+        warmed_count = await self.warm_targets([self._parcel_target(parcel_id) for parcel_id in parcel_ids])
         
         print(f"✅ Warmed {warmed_count} high-value parcels")
         return warmed_count
     
     async def warm_risk_scores(self, parcel_ids: List[str]) -> int:
         """Warm risk score cache via Edge Function"""
-        tasks = []
-        edge_function_url = os.getenv('SUPABASE_URL', '').replace('/rest/v1', '/functions/v1')
-        
-        for parcel_id in parcel_ids:
-            target = WarmingTarget(
-                name=f"risk_{parcel_id}",
-                url=f"{edge_function_url}/parcel-risk?parcel_id={parcel_id}",
-                cache_key=f"risk:{parcel_id}",
-                ttl=300,  # 5 minutes
-                priority=3
-            )
-            tasks.append(self._warm_single_target(target))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        warmed_count = sum(1 for r in results if r is True)
+        warmed_count = await self.warm_targets([self._risk_target(parcel_id) for parcel_id in parcel_ids])
         
         print(f"✅ Warmed {warmed_count} risk scores")
         return warmed_count
     
-    async def _warm_single_target(self, target: WarmingTarget) -> bool:
-        """Warm a single cache target"""
+    async def warm_prioritized(self, zoom_levels: List[int], access_log: Optional[str] = None,
+                               hot_limit: int = 2000, sample_redis: bool = False,
+                               top_parcels: int = 500, event_geojson: Optional[str] = None,
+                               max_tiles_per_zoom: int = MAX_TILES_PER_ZOOM,
+                               deadline: Optional[float] = None) -> int:
+        """Warm targets chosen from real traffic and parcel value
+        
+        Targets are warmed in bands: tiles and parcels inside active event
+        polygons, then the most requested keys (access log, then Redis LFU
+        sampling), then the top parcels by JV. Each key is planned once, in
+        its highest band. No new batch starts after the deadline
+        (time.monotonic()).
+        """
+        planned: Dict[str, WarmingTarget] = {}
+        bands = Counter()
+        
+        def plan(targets, priority):
+            for target in targets:
+                if target is not None and target.cache_key not in planned:
+                    target.priority = priority
+                    planned[target.cache_key] = target
+                    bands[priority] += 1
+        
+        if event_geojson:
+            geometries = load_event_geometries(event_geojson)
+            bounds_list = [geometry_bounds(geometry) for geometry in geometries]
+            plan([
+                self._tile_target(zoom, x, y)
+                for zoom in sorted(set(zoom_levels))
+                for x, y in islice(iter_tiles(bounds_list, zoom), max_tiles_per_zoom)
+            ], PRIORITY_EVENT)
+            plan(self._parcel_targets(await self.event_parcel_ids(geometries, top_parcels)), PRIORITY_EVENT)
+        
+        if access_log:
+            plan([self.target_for_key(key) for key, _ in access_log_keys(access_log).most_common(hot_limit)], PRIORITY_HOT)
+        if sample_redis:
+            plan([self.target_for_key(key) for key, _ in (await self.hot_keys_from_redis())[:hot_limit]], PRIORITY_HOT)
+        
+        if top_parcels:
+            plan(self._parcel_targets(await self.top_value_parcel_ids(top_parcels)), PRIORITY_VALUE)
+        
+        print(f"🎯 Planned {len(planned):,} keys: {bands[PRIORITY_EVENT]:,} event, "
+              f"{bands[PRIORITY_HOT]:,} hot, {bands[PRIORITY_VALUE]:,} high-value")
+        warmed_count = await self.warm_targets(list(planned.values()), deadline)
+        
+        print(f"✅ Warmed {warmed_count} prioritized keys")
+        return warmed_count
+    
+    async def top_value_parcel_ids(self, limit: int) -> List[str]:
+        """Parcel IDs with the highest just value (JV) in florida_parcels"""
+        return await self._query_parcel_ids(TOP_VALUE_PARCELS_SQL, [(limit,)])
+    
+    async def event_parcel_ids(self, geometries: List[Dict], limit: int) -> List[str]:
+        """Highest-value parcels intersecting each event geometry"""
+        return await self._query_parcel_ids(
+            EVENT_PARCELS_SQL, [(json.dumps(geometry), limit) for geometry in geometries]
+        )
+    
+    async def _query_parcel_ids(self, sql: str, params_list: List[Tuple]) -> List[str]:
+        if not self.database_url:
+            print("⚠️  No database URL, skipping parcel selection")
+            return []
+        
+        def query():
+            import psycopg2
+            
+            with psycopg2.connect(self.database_url) as conn, conn.cursor() as cur:
+                parcel_ids = []
+                for params in params_list:
+                    cur.execute(sql, params)
+                    parcel_ids.extend(row[0] for row in cur.fetchall())
+                return list(dict.fromkeys(parcel_ids))
+        
+        return await asyncio.to_thread(query)
+    
+    async def hot_keys_from_redis(self, patterns: List[str] = HOT_KEY_PATTERNS,
+                                  sample: int = 10000) -> List[Tuple[str, int]]:
+        """Sampled cache keys with their LFU access frequency, most used first
+        
+        Requires an LFU maxmemory-policy; returns [] otherwise.
+        """
+        keys = []
+        for pattern in patterns:
+            found = 0
+            async for key in self.redis_client.scan_iter(match=pattern, count=1000):
+                keys.append(key.decode())
+                found += 1
+                if found >= sample // len(patterns):
+                    break
+        if not keys:
+            return []
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.object('freq', key)
+        try:
+            frequencies = await pipe.execute()
+        except ResponseError as e:
+            print(f"⚠️  Redis key sampling needs an LFU maxmemory-policy: {e}")
+            return []
+        return sorted(zip(keys, frequencies), key=lambda item: -item[1])
+    
+    async def log_coverage(self, access_log: str) -> float:
+        """Share of the access log's requests whose cache key is cached now"""
+        counts = access_log_keys(access_log)
+        keys = list(counts)
+        hits = 0
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in batch:
+                pipe.exists(key)
+            hits += sum(counts[key] for key, cached in zip(batch, await pipe.execute()) if cached)
+        total = sum(counts.values())
+        return hits / total if total else 0.0
+    
+    def target_for_key(self, cache_key: str) -> Optional[WarmingTarget]:
+        """Warming target that fills cache_key, or None for unknown keys"""
+        parts = cache_key.split(':')
+        if len(parts) == 5 and parts[:2] == ['tile', 'parcels'] and all(p.isdigit() for p in parts[2:]):
+            return self._tile_target(*(int(p) for p in parts[2:]))
+        if len(parts) == 2 and parts[0] == 'parcel':
+            return self._parcel_target(parts[1])
+        if len(parts) == 2 and parts[0] == 'risk' and self.edge_function_url:
+            return self._risk_target(parts[1])
+        return None
+    
+    def _parcel_targets(self, parcel_ids: List[str]) -> List[WarmingTarget]:
+        """Parcel detail targets, plus risk score targets when the edge URL is set"""
+        targets = [self._parcel_target(parcel_id) for parcel_id in parcel_ids]
+        if self.edge_function_url:
+            targets += [self._risk_target(parcel_id) for parcel_id in parcel_ids]
+        return targets
+    
+    def _parcel_target(self, parcel_id: str) -> WarmingTarget:
+        return WarmingTarget(
+            name=f"parcel_{parcel_id}",
+            url=f"{self.api_base_url}/api/parcels/{parcel_id}",
+            cache_key=f"parcel:{parcel_id}",
+            ttl=900,  # 15 minutes
+            priority=2
+        )
+    
+    def _risk_target(self, parcel_id: str) -> WarmingTarget:
+        return WarmingTarget(
+            name=f"risk_{parcel_id}",
+            url=f"{self.edge_function_url}/parcel-risk?parcel_id={parcel_id}",
+            cache_key=f"risk:{parcel_id}",
+            ttl=300,  # 5 minutes
+            priority=3
+        )
+    
+    async def warm_targets(self, targets: List[WarmingTarget], deadline: Optional[float] = None) -> int:
+        """Warm targets in priority order, batch_size keys at a time
+        
+        Each batch costs one pipelined EXISTS round trip, at most
+        `concurrency` API requests in flight over the shared session, and
+        one pipelined SETEX round trip for everything fetched. Values are
+        stored through the cache codec and counted in byte_stats. No batch is
+        started after the deadline (time.monotonic()). Returns the number
+        of targets that are cached afterwards.
+        """
+        if self.session is None:
+            raise RuntimeError("CacheWarmer.connect() must be called before warming")
+        
+        ordered = sorted(targets, key=lambda target: target.priority)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        warmed_count = 0
+        
+        for start in range(0, len(ordered), self.batch_size):
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"⏱️  Time budget reached, {len(ordered) - start:,} keys left unwarmed")
+                break
+            batch = ordered[start:start + self.batch_size]
+            
+            # Skip keys that are already cached
+            pipe = self.redis_client.pipeline(transaction=False)
+            for target in batch:
+                pipe.exists(target.cache_key)
+            cached = await pipe.execute()
+            missing = [target for target, hit in zip(batch, cached) if not hit]
+            warmed_count += len(batch) - len(missing)
+            
+            results = await asyncio.gather(
+                *(self._fetch_target(target, semaphore) for target in missing)
+            )
+            fetched = [(target, value) for target, value in zip(missing, results) if value is not None]
+            
+            if fetched:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for target, result in fetched:
+                    self._queue_store(pipe, target, result)
+                await pipe.execute()
+                warmed_count += len(fetched)
+        
+        return warmed_count
+    
+    async def refresh_targets(self, targets: List[WarmingTarget]) -> Tuple[int, int]:
+        """Re-fetch the targets that are cached now; returns (refreshed, deleted)
+        
+        Fresh values overwrite stale ones in place, so readers never see a
+        miss; keys whose refetch fails are deleted rather than left stale.
+        Uncached targets are skipped so a bulk reload does not fill the
+        cache with cold keys.
+        """
+        if self.session is None:
+            raise RuntimeError("CacheWarmer.connect() must be called before warming")
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        refreshed = deleted = 0
+        
+        for start in range(0, len(targets), self.batch_size):
+            batch = targets[start:start + self.batch_size]
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            for target in batch:
+                pipe.exists(target.cache_key)
+            cached = [target for target, hit in zip(batch, await pipe.execute()) if hit]
+            if not cached:
+                continue
+            
+            results = await asyncio.gather(
+                *(self._fetch_target(target, semaphore) for target in cached)
+            )
+            pipe = self.redis_client.pipeline(transaction=False)
+            for target, result in zip(cached, results):
+                if result is None:
+                    pipe.delete(target.cache_key)
+                    deleted += 1
+                else:
+                    self._queue_store(pipe, target, result)
+                    refreshed += 1
+            await pipe.execute()
+        
+        return refreshed, deleted
+    
+    def targets_for_changes(self, changes: List[Dict], zoom_levels: List[int],
+                            max_tiles_per_zoom: int = MAX_TILES_PER_ZOOM) -> Tuple[List[WarmingTarget], List[str]]:
+        """Targets to refresh and keys to delete for a list of change entries
+        
+        A parcel change affects parcel:{id}, risk:{id} and the parcel tiles
+        covering its location at every zoom level; a risk change only
+        risk:{id}. Risk keys are deleted instead of refreshed when no edge
+        function URL is configured.
+        """
+        targets: Dict[str, WarmingTarget] = {}
+        delete_keys = set()
+        
+        for change in changes:
+            parcel_id = change.get('parcel_id')
+            scope = change.get('scope', 'parcel')
+            if parcel_id:
+                if self.edge_function_url:
+                    targets.setdefault(f"risk:{parcel_id}", self._risk_target(parcel_id))
+                else:
+                    delete_keys.add(f"risk:{parcel_id}")
+                if scope == 'parcel':
+                    targets.setdefault(f"parcel:{parcel_id}", self._parcel_target(parcel_id))
+            
+            bounds = change_bounds(change) if scope == 'parcel' else None
+            if bounds:
+                for zoom in sorted(set(zoom_levels)):
+                    for x, y in islice(iter_tiles([bounds], zoom), max_tiles_per_zoom):
+                        targets.setdefault(f"tile:parcels:{zoom}:{x}:{y}", self._tile_target(zoom, x, y))
+        
+        return list(targets.values()), sorted(delete_keys)
+    
+    async def apply_changes(self, changes: List[Dict], zoom_levels: List[int]) -> Dict[str, int]:
+        """Invalidate and re-warm every cache key affected by the changes"""
+        targets, delete_keys = self.targets_for_changes(changes, zoom_levels)
+        
+        deleted = 0
+        for start in range(0, len(delete_keys), self.batch_size):
+            deleted += await self.redis_client.delete(*delete_keys[start:start + self.batch_size])
+        refreshed, failed = await self.refresh_targets(targets)
+        
+        print(f"♻️  {len(changes):,} changes -> {len(targets) + len(delete_keys):,} keys: "
+              f"{refreshed:,} refreshed, {deleted + failed:,} deleted")
+        return {'changes': len(changes), 'refreshed': refreshed, 'deleted': deleted + failed}
+    
+    async def follow_changes(self, zoom_levels: List[int], stream: str = CHANGE_STREAM,
+                             group: str = CHANGE_GROUP, consumer: Optional[str] = None,
+                             count: int = 100, block_ms: int = 5000,
+                             claim_idle_ms: int = CLAIM_IDLE_MS,
+                             stop_when_idle: bool = False) -> int:
+        """Consume the parcel change stream, invalidating affected keys
+        
+        Entries are read through a consumer group and acknowledged only
+        after their keys are refreshed. The consumer name defaults to the
+        hostname, so a restarted warmer replays its own pending entries
+        first; entries left pending longer than `claim_idle_ms` by any
+        other consumer (e.g. one on a host that is gone) are claimed on
+        start and whenever the stream is idle. Each read of up to `count`
+        entries is coalesced into one apply_changes pass. Runs until
+        cancelled, or until the stream is idle with stop_when_idle.
+        Returns the number of entries processed.
+        """
+        consumer = consumer or socket.gethostname()
         try:
-            async with aiohttp.ClientSession() as session:
-                # Check if already cached
-                if await self.redis_client.exists(target.cache_key):
-                    return True
-                    
-                # Fetch from API
-                async with session.get(target.url, timeout=30) as response:
-                    if response.status == 200:
-                        if 'application/json' in response.headers.get('content-type', ''):
-                            data = await response.json()
-                            await self.redis_client.setex(
-                                target.cache_key,
-                                target.ttl,
-                                json.dumps(data)
-                            )
-                        else:
-                            # Binary data (like MVT tiles)
-                            data = await response.read()
-                            await self.redis_client.setex(
-                                target.cache_key,
-                                target.ttl,
-                                data
-                            )
-                        return True
-                    else:
+            await self.redis_client.xgroup_create(stream, group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        
+        await self._claim_stale(stream, group, consumer, claim_idle_ms)
+        processed = 0
+        read_id = '0'  # our pending entries first, then new ones
+        while True:
+            response = await self.redis_client.xreadgroup(
+                group, consumer, {stream: read_id}, count=count,
+                block=None if read_id == '0' else block_ms
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                if read_id == '0':
+                    read_id = '>'
+                    continue
+                if await self._claim_stale(stream, group, consumer, claim_idle_ms):
+                    read_id = '0'
+                    continue
+                if stop_when_idle:
+                    return processed
+                continue
+            
+            changes = []
+            for entry_id, fields in entries:
+                if not fields:
+                    # Pending entry trimmed from the stream (MAXLEN) before it was
+                    # acked: Redis returns no fields (None or {} depending on redis-py)
+                    print(f"⚠️  Skipping trimmed change entry {entry_id.decode()}")
+                    continue
+                try:
+                    changes.extend(json.loads(fields[b'changes']))
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"⚠️  Skipping malformed change entry {entry_id.decode()}: {e}")
+            await self.apply_changes(changes, zoom_levels)
+            await self.redis_client.xack(stream, group, *(entry_id for entry_id, _ in entries))
+            processed += len(entries)
+    
+    async def _claim_stale(self, stream: str, group: str, consumer: str, min_idle_ms: int) -> int:
+        """XAUTOCLAIM entries idle on other consumers into our pending list"""
+        claimed = 0
+        start_id = '0-0'
+        while True:
+            # Not justid: redis-py then drops the cursor from the reply
+            response = await self.redis_client.xautoclaim(
+                stream, group, consumer, min_idle_ms, start_id=start_id
+            )
+            start_id = response[0]
+            claimed += len(response[1])
+            if start_id in (b'0-0', '0-0'):
+                break
+        if claimed:
+            print(f"♻️  Claimed {claimed:,} change entries left pending by other consumers")
+        return claimed
+    
+    def _queue_store(self, pipe, target: WarmingTarget, result: Tuple[ContentType, bytes]):
+        """Add a codec-framed SETEX for a fetched target to a pipeline"""
+        content_type, payload = result
+        value = encode_value(payload, content_type, self.compression, self.compress_min_bytes)
+        self.byte_stats.record(target.cache_key, len(payload), len(value))
+        pipe.setex(target.cache_key, target.ttl, value)
+    
+    async def _fetch_target(self, target: WarmingTarget, semaphore: asyncio.Semaphore):
+        """Fetch (content type, payload bytes) for a target, or None on failure"""
+        async with semaphore:
+            try:
+                async with self.session.get(target.url) as response:
+                    if response.status != 200:
                         print(f"❌ Failed to warm {target.name}: HTTP {response.status}")
-                        return False
-                        
-        except Exception as e:
-            print(f"❌ Error warming {target.name}: {e}")
-            return False
+                        return None
+                    content_type = response.headers.get('content-type', '')
+                    payload = await response.read()
+                    if 'application/json' in content_type:
+                        return ContentType.JSON, payload
+                    if 'protobuf' in content_type or 'vector-tile' in content_type or target.url.endswith('.mvt'):
+                        return ContentType.MVT, payload
+                    return ContentType.BYTES, payload
+            except Exception as e:
+                print(f"❌ Error warming {target.name}: {e}")
+                return None
     
     def _get_tile_coords(self, bounds: List[Tuple[float, float]], zoom: int) -> List[Tuple[int, int]]:
         """Calculate tile coordinates for bounding box at zoom level"""
-        # Simplified tile calculation - in production use proper tile math
-        coords = []
-        lat_min, lon_min = bounds[0]
-        lat_max, lon_max = bounds[1]
-        
-        # Very simplified - just generate a few sample coordinates
-        base_x = int((lon_min + 180) / 360 * (2 ** zoom))
-        base_y = int((1 - (lat_max + 90) / 180) * (2 ** zoom))
-        
-        # Generate small grid around the area
-        for dx in range(3):
-            for dy in range(3):
-                coords.append((base_x + dx, base_y + dy))
-        
-        return coords
+        return list(iter_tiles([bounds], zoom))
 
 async def main():
     """Main cache warming routine"""
+    parser = argparse.ArgumentParser(description='Warm the Redis cache from traffic and parcel value signals')
+    parser.add_argument('--counties', default=','.join(COUNTY_BOUNDS),
+                        help='Comma-separated county FIPS codes for the tile pyramid (default: all with known bounds)')
+    parser.add_argument('--zooms', default='10,11,12,13', help='Comma-separated tile zoom levels (default: 10-13)')
+    parser.add_argument('--access-log', help='Access log to take the most requested keys from')
+    parser.add_argument('--hot-keys', type=int, default=2000, help='Most requested keys warmed (default: 2000)')
+    parser.add_argument('--sample-redis', action='store_true',
+                        help='Also sample hot keys by Redis LFU frequency')
+    parser.add_argument('--top-parcels', type=int, default=500,
+                        help='Highest-value parcels warmed, overall and per event area (default: 500)')
+    parser.add_argument('--event-geojson', help='GeoJSON of active event areas (e.g. a forecast cone)')
+    parser.add_argument('--time-budget', type=float, default=300, help='Seconds to spend warming (default: 300)')
+    parser.add_argument('--compression', choices=[c.name.lower() for c in Compression],
+                        default=default_compression().name.lower(),
+                        help='Compression for cached values (default: zstd if installed, else gzip)')
+    parser.add_argument('--compress-min-bytes', type=int, default=DEFAULT_COMPRESS_MIN_BYTES,
+                        help=f'Store smaller values uncompressed (default: {DEFAULT_COMPRESS_MIN_BYTES})')
+    parser.add_argument('--follow-changes', action='store_true',
+                        help=f'Consume the {CHANGE_STREAM} stream, invalidating and re-warming changed parcels, instead of warming')
+    parser.add_argument('--consumer', default=socket.gethostname(),
+                        help='Consumer name in the change stream group; keep it stable across restarts '
+                             'so pending entries are replayed (default: hostname)')
+    parser.add_argument('--changes-file',
+                        help='Invalidate and re-warm the changes in a JSON lines file instead of warming')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'),
+                        help='Postgres URL for florida_parcels (default: $DATABASE_URL)')
+    args = parser.parse_args()
+    
     redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
     api_base_url = os.getenv('API_BASE_URL', 'http://localhost:3000')
+    counties = [fips.strip() for fips in args.counties.split(',') if fips.strip()]
+    zooms = [int(zoom) for zoom in args.zooms.split(',')]
     
-    warmer = CacheWarmer(redis_url, api_base_url)
+    warmer = CacheWarmer(redis_url, api_base_url, database_url=args.database_url,
+                         compression=Compression[args.compression.upper()],
+                         compress_min_bytes=args.compress_min_bytes)
     
     try:
         print("🔥 Starting cache warming...")
         start_time = time.time()
+        deadline = time.monotonic() + args.time_budget
         
         await warmer.connect()
         
-        # Warm critical counties and zoom levels
-        pilot_counties = ['12015', '12115', '12086']  # Charlotte, Sarasota, Miami-Dade
-        critical_zooms = [10, 11, 12, 13]
+        if args.follow_changes:
+            print(f"👂 Following {CHANGE_STREAM}...")
+            await warmer.follow_changes(zooms, consumer=args.consumer)
+            return 0
+        if args.changes_file:
+            with open(args.changes_file) as f:
+                changes = [json.loads(line) for line in f if line.strip()]
+            await warmer.apply_changes(changes, zooms)
+            warmer.byte_stats.report()
+            return 0
         
-        tiles_warmed = await warmer.warm_tiles(pilot_counties, critical_zooms)
-        parcels_warmed = await warmer.warm_high_value_parcels(500)
+        coverage_before = await warmer.log_coverage(args.access_log) if args.access_log else None
         
-        # Sample parcel IDs for risk warming
-        sample_parcels = [f"12015-{i:06d}" for i in range(1, 101)]
-        risk_warmed = await warmer.warm_risk_scores(sample_parcels)
+        # Event areas, hot keys and high-value parcels first, then the
+        # county tile pyramid with whatever time is left
+        prioritized_warmed = await warmer.warm_prioritized(
+            zooms, args.access_log, args.hot_keys, args.sample_redis,
+            args.top_parcels, args.event_geojson, deadline=deadline
+        )
+        tiles_warmed = await warmer.warm_tiles(counties, zooms, deadline=deadline)
         
         elapsed = time.time() - start_time
-        total_warmed = tiles_warmed + parcels_warmed + risk_warmed
+        total_warmed = prioritized_warmed + tiles_warmed
         
         print(f"\n🎉 Cache warming complete!")
         print(f"📊 Total items warmed: {total_warmed}")
         print(f"⏱️  Time elapsed: {elapsed:.2f}s")
         print(f"🚀 Rate: {total_warmed/elapsed:.1f} items/second")
+        warmer.byte_stats.report()
+        if coverage_before is not None:
+            coverage_after = await warmer.log_coverage(args.access_log)
+            print(f"📈 Access-log hit rate: {coverage_before:.1%} -> {coverage_after:.1%}")
         
     except Exception as e:
         print(f"💥 Cache warming failed: {e}")
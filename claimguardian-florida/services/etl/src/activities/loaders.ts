@@ -1,4 +1,5 @@
 import { Pool } from 'pg';
+import { Redis } from 'ioredis';
 import { logger } from '../lib/logger.js';
 
 const pool = new Pool({
@@ -8,6 +9,37 @@ const pool = new Pool({
   connectionTimeoutMillis: 2000,
 });
 
+// Changed parcels are published here after commit; the cache warmer
+// (scripts/warm-cache.py --follow-changes) invalidates and re-warms the
+// affected parcel, risk and tile keys
+const CACHE_CHANGE_STREAM = 'cache:parcel-changes';
+const CACHE_CHANGE_STREAM_MAXLEN = 100000;
+
+const redis = process.env.REDIS_URL
+  ? new Redis(process.env.REDIS_URL, { maxRetriesPerRequest: 1 })
+  : null;
+
+interface ParcelChange {
+  parcel_id: string;
+  scope: 'parcel' | 'risk';
+  lon?: number;
+  lat?: number;
+}
+
+async function publishParcelChanges(changes: ParcelChange[]): Promise<void> {
+  if (!redis || changes.length === 0) return;
+
+  try {
+    await redis.xadd(
+      CACHE_CHANGE_STREAM, 'MAXLEN', '~', CACHE_CHANGE_STREAM_MAXLEN, '*',
+      'changes', JSON.stringify(changes)
+    );
+  } catch (error) {
+    // Stale cache entries expire by TTL; never fail a load over this
+    logger.warn('Failed to publish parcel changes', { count: changes.length, error });
+  }
+}
+
 interface ParcelRecord {
   parcel_id: string;
   county_fips: string;
@@ -29,6 +61,7 @@ export async function loadParcels(
   const client = await pool.connect();
   let loaded = 0;
   let errors = 0;
+  const changes: ParcelChange[] = [];
 
   try {
     await client.query('BEGIN');
@@ -60,6 +93,12 @@ export async function loadParcels(
           parcel.geometry ? `POINT(${parcel.geometry.coordinates[0]} ${parcel.geometry.coordinates[1]})` : null
         ]);
         loaded++;
+        changes.push({
+          parcel_id: parcel.parcel_id,
+          scope: 'parcel',
+          lon: parcel.geometry?.coordinates[0],
+          lat: parcel.geometry?.coordinates[1],
+        });
       } catch (error) {
         logger.error('Failed to load parcel', { parcel_id: parcel.parcel_id, error });
         errors++;
@@ -68,6 +107,7 @@ export async function loadParcels(
 
     await client.query('COMMIT');
     logger.info('Parcel batch loaded', { county_fips: countyFips, loaded, errors });
+    await publishParcelChanges(changes);
     
   } catch (error) {
     await client.query('ROLLBACK');
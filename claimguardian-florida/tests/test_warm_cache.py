@@ -0,0 +1,137 @@
+# tests/test_warm_cache.py
+# Crash recovery of the change stream consumer in scripts/warm-cache.py,
+# against fakeredis.
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..", "scripts")
+sys.path.insert(0, SCRIPTS)  # for cache_codec
+
+_spec = importlib.util.spec_from_file_location(
+    "warm_cache", os.path.join(SCRIPTS, "warm-cache.py")
+)
+warm_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(warm_cache)
+
+STREAM = "test:parcel-changes"
+GROUP = "test-warmer"
+
+
+class Crash(Exception):
+    pass
+
+
+def new_warmer(server, crash=False):
+    """A warmer on the shared server; with crash=True it dies mid-batch."""
+    warmer = warm_cache.CacheWarmer("redis://unused", "http://unused")
+    warmer.redis_client = fakeredis.FakeAsyncRedis(server=server)
+    warmer.applied = []
+
+    async def apply_changes(changes, zoom_levels):
+        if crash:
+            raise Crash()
+        warmer.applied.extend(change["parcel_id"] for change in changes)
+
+    warmer.apply_changes = apply_changes
+    return warmer
+
+
+async def publish(server, *parcel_ids):
+    client = fakeredis.FakeAsyncRedis(server=server)
+    for parcel_id in parcel_ids:
+        change = {"parcel_id": parcel_id, "scope": "parcel"}
+        await client.xadd(STREAM, {"changes": json.dumps([change])})
+
+
+async def pending(server):
+    client = fakeredis.FakeAsyncRedis(server=server)
+    return (await client.xpending(STREAM, GROUP))["pending"]
+
+
+async def crash_consumer(server, consumer):
+    """Read the published entries as `consumer` and die before acking them."""
+    with pytest.raises(Crash):
+        await new_warmer(server, crash=True).follow_changes(
+            [10], stream=STREAM, group=GROUP, consumer=consumer, stop_when_idle=True
+        )
+
+
+def test_restarted_consumer_replays_its_pending_entries():
+    async def run():
+        server = fakeredis.FakeServer()
+        await publish(server, "p1", "p2", "p3")
+        await crash_consumer(server, "warmer-host")
+        assert await pending(server) == 3
+
+        # Same (default: hostname) name after restart, nothing idle long enough to claim
+        restarted = new_warmer(server)
+        processed = await restarted.follow_changes(
+            [10],
+            stream=STREAM,
+            group=GROUP,
+            consumer="warmer-host",
+            claim_idle_ms=3600 * 1000,
+            stop_when_idle=True,
+        )
+        assert processed == 3
+        assert sorted(restarted.applied) == ["p1", "p2", "p3"]
+        assert await pending(server) == 0
+
+    asyncio.run(run())
+
+
+def test_live_consumer_claims_entries_of_a_dead_one():
+    async def run():
+        server = fakeredis.FakeServer()
+        await publish(server, "p1", "p2")
+        await crash_consumer(server, "gone-host")
+        await publish(server, "p3")
+        assert await pending(server) == 2
+
+        survivor = new_warmer(server)
+        processed = await survivor.follow_changes(
+            [10],
+            stream=STREAM,
+            group=GROUP,
+            consumer="other-host",
+            claim_idle_ms=0,
+            stop_when_idle=True,
+        )
+        assert processed == 3
+        assert sorted(survivor.applied) == ["p1", "p2", "p3"]
+        assert await pending(server) == 0
+
+    asyncio.run(run())
+
+
+def test_default_consumer_name_is_stable_across_restarts(monkeypatch):
+    async def run():
+        server = fakeredis.FakeServer()
+        await publish(server, "p1")
+        monkeypatch.setattr(warm_cache.socket, "gethostname", lambda: "warmer-host")
+        with pytest.raises(Crash):
+            await new_warmer(server, crash=True).follow_changes(
+                [10], stream=STREAM, group=GROUP, stop_when_idle=True
+            )
+        restarted = new_warmer(server)
+        await restarted.follow_changes(
+            [10],
+            stream=STREAM,
+            group=GROUP,
+            claim_idle_ms=3600 * 1000,
+            stop_when_idle=True,
+        )
+        assert restarted.applied == ["p1"]
+        assert await pending(server) == 0
+        client = fakeredis.FakeAsyncRedis(server=server)
+        consumers = await client.xinfo_consumers(STREAM, GROUP)
+        assert [consumer["name"] for consumer in consumers] == [b"warmer-host"]
+
+    asyncio.run(run())
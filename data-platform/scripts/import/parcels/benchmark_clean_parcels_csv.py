@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Florida parcels CSV cleaner.
+
+Generates a DOR-shaped parcels CSV and reports rows/s for the original
+per-cell DictReader/clean_row path, the compiled column plan and, when
+pyarrow is installed, the vectorized arrow engine.
+"""
+
+import argparse
+import csv
+import filecmp
+import importlib.util
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from clean_all_parcels_csv import CSVCleaner
+from parcel_schema import NUMERIC_COLUMNS, TEXT_COLUMNS
+
+STREETS = ["MAIN ST", "GULF BLVD", "HARBOR DR", "TAMIAMI TRL", "PALM AVE"]
+CITIES = ["PUNTA GORDA", "PORT CHARLOTTE", "ENGLEWOOD", "SARASOTA"]
+OWNERS = ["SMITH JOHN", "GARCIA MARIA & JOSE", "PALM TRUST LLC", "DOE JANE"]
+
+
+def fake_numeric(rng, kind):
+    """Return a numeric cell with the blank/padding mix seen in DOR exports."""
+    roll = rng.random()
+    if roll < 0.25:
+        return ""
+    if roll < 0.30:
+        return " "
+    if kind == "integer":
+        return str(rng.randint(1950, 2024))
+    if roll < 0.33:
+        return f"{rng.randint(1000, 999999):,}"
+    return str(rng.randint(0, 2000000))
+
+
+def fake_text(rng, column):
+    """Return a text cell, occasionally with stray padding."""
+    if column.startswith("OWN_NAME"):
+        value = rng.choice(OWNERS)
+    elif "ADDR" in column:
+        value = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}"
+    elif "CITY" in column:
+        value = rng.choice(CITIES)
+    elif rng.random() < 0.5:
+        value = ""
+    else:
+        value = str(rng.randint(0, 99999))
+
+    if value and rng.random() < 0.1:
+        value = f" {value}  "
+    return value
+
+
+def generate_file(path, rows, seed=42):
+    """Write a parcels CSV with every known DOR column."""
+    rng = random.Random(seed)
+    columns = list(NUMERIC_COLUMNS) + sorted(TEXT_COLUMNS)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for index in range(rows):
+            record = []
+            for column in columns:
+                if column == "PARCEL_ID":
+                    record.append(f"{index:012d}")
+                elif column in NUMERIC_COLUMNS:
+                    record.append(fake_numeric(rng, NUMERIC_COLUMNS[column]))
+                else:
+                    record.append(fake_text(rng, column))
+            writer.writerow(record)
+
+
+# Original per-cell cleaning rules, kept as the benchmark's reference path.
+# The cleaner itself uses the compiled plan in parcel_schema.
+
+
+def clean_numeric_value(value):
+    """Clean numeric values - convert empty strings and spaces to NULL."""
+    if not value:
+        return ""
+
+    # Strip whitespace
+    value = str(value).strip()
+
+    # Check for empty, spaces, or NULL representations
+    if value in ("", " ", "  ", "   ", ".", "..", "..."):
+        return ""
+    if value.upper() in ("NULL", "NONE", "N/A", "NA", "NAN", "#N/A"):
+        return ""
+
+    # Remove any thousands separators and clean up formatting
+    value = value.replace(",", "")
+
+    # Handle parentheses for negative numbers
+    if value.startswith("(") and value.endswith(")"):
+        value = "-" + value[1:-1]
+
+    # Check if it's a valid number
+    try:
+        float(value)
+        return value
+    except ValueError:
+        # If it's not a valid number, return empty
+        return ""
+
+
+def clean_text_value(value):
+    """Clean text values - trim whitespace and handle encoding."""
+    if not value:
+        return ""
+
+    # Convert to string and strip whitespace
+    value = str(value).strip()
+
+    # Replace multiple spaces with single space
+    value = re.sub(r"\s+", " ", value)
+
+    # Handle common encoding issues
+    value = value.replace("\x00", "")  # Remove null bytes
+
+    return value
+
+
+def clean_row(row):
+    """Clean a single row of data."""
+    cleaned_row = {}
+    cells_cleaned = 0
+
+    for column, value in row.items():
+        original_value = value
+
+        # Check if this is a numeric column
+        if column in NUMERIC_COLUMNS:
+            cleaned_value = clean_numeric_value(value)
+        elif column in TEXT_COLUMNS:
+            cleaned_value = clean_text_value(value)
+        else:
+            # For unknown columns, just trim whitespace
+            cleaned_value = str(value).strip() if value else ""
+
+        cleaned_row[column] = cleaned_value
+
+        if original_value != cleaned_value:
+            cells_cleaned += 1
+
+    return cleaned_row, cells_cleaned
+
+
+def run_legacy(cleaner, input_file, output_file):
+    """Clean with DictReader, per-cell clean_row and DictWriter."""
+    rows = 0
+    with open(input_file, "r", newline="", encoding="utf-8") as infile:
+        reader = csv.DictReader(infile)
+        with open(output_file, "w", newline="", encoding="utf-8") as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            for row in reader:
+                cleaned_row, _ = clean_row(row)
+                writer.writerow(cleaned_row)
+                rows += 1
+    return rows
+
+
+def run_compiled(cleaner, input_file, output_file):
+    """Clean with the compiled column plan."""
+    rows, _ = cleaner.clean_stream(input_file, output_file, "utf-8")
+    return rows
+
+
+def run_arrow(cleaner, input_file, output_file):
+    """Clean with the vectorized arrow engine."""
+    cleaner = CSVCleaner(verbose=False, engine="arrow")
+    rows, _ = cleaner.clean_stream(input_file, output_file, "utf-8")
+    return rows
+
+
+def main():
+    """Run the cleaner microbenchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the parcels CSV cleaner")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1_000_000,
+        help="Rows in the generated file (default: 1,000,000)",
+    )
+    parser.add_argument(
+        "--input",
+        help="Benchmark an existing CSV instead of generating one",
+    )
+    args = parser.parse_args()
+
+    cleaner = CSVCleaner(verbose=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        if args.input:
+            input_file = Path(args.input)
+        else:
+            input_file = tmp_path / "parcels.csv"
+            print(f"🏗️  Generating {args.rows:,} rows...")
+            generate_file(input_file, args.rows)
+
+        runners = [("legacy", run_legacy), ("compiled", run_compiled)]
+        if importlib.util.find_spec("pyarrow"):
+            runners.append(("arrow", run_arrow))
+
+        results = {}
+        for name, runner in runners:
+            output_file = tmp_path / f"{name}.csv"
+            start = time.perf_counter()
+            rows = runner(cleaner, input_file, output_file)
+            elapsed = time.perf_counter() - start
+            results[name] = rows / elapsed
+            print(
+                f"⏱️  {name:>8}: {rows:,} rows in {elapsed:.1f}s "
+                f"({results[name]:,.0f} rows/s)"
+            )
+
+        same = all(
+            filecmp.cmp(
+                tmp_path / "legacy.csv", tmp_path / f"{name}.csv", shallow=False
+            )
+            for name in results
+        )
+
+    for name in results:
+        if name != "legacy":
+            speedup = results[name] / results["legacy"]
+            print(f"🚀 {name} speedup: {speedup:.2f}x")
+    print(f"{'✅' if same else '❌'} Outputs identical: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
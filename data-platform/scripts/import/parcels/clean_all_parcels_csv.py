@@ -5,146 +5,208 @@ Clean all Florida parcels CSV files in a directory for Supabase import.
 Processes all CSV files, handling data type conversions and cleaning.
 """
 
+import codecs
 import csv
+import io
+import os
 import sys
+import shutil
 import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import ne
 from pathlib import Path
 from datetime import datetime
-import re
-
-# Numeric columns that need cleaning (uppercase as they appear in CSV)
-NUMERIC_COLUMNS = {
-    "OBJECTID": "bigint",
-    "CO_NO": "integer",
-    "ASMNT_YR": "integer",
-    "JV": "numeric",
-    "AV_SD": "numeric",
-    "AV_NSD": "numeric",
-    "TV_SD": "numeric",
-    "TV_NSD": "numeric",
-    "LAND_VAL": "numeric",
-    "BLDG_VAL": "numeric",
-    "TOT_VAL": "numeric",
-    "ACT_YR_BLT": "integer",
-    "EFF_YR_BLT": "integer",
-    "TOT_LVG_AR": "numeric",
-    "LAND_SQFOOT": "numeric",
-    "NO_BULDNG": "integer",
-    "NO_RES_UNT": "integer",
-    "SALE_PRC1": "numeric",
-    "SALE_YR1": "integer",
-    "SALE_PRC2": "numeric",
-    "SALE_YR2": "integer",
-    "LND_VAL": "numeric",
-    "LND_SQFOOT": "numeric",
-    "NO_LND_UNT": "numeric",
-    "SPEC_FEAT_": "numeric",
-    "NCONST_VAL": "numeric",
-    "DEL_VAL": "numeric",
-    "DISTR_YR": "integer",
-    "JV_HMSTD": "numeric",
-    "AV_HMSTD": "numeric",
-    "JV_NON_HMS": "numeric",
-    "AV_NON_HMS": "numeric",
-    "JV_RESD_NO": "numeric",
-    "AV_RESD_NO": "numeric",
-    "JV_CLASS_U": "numeric",
-    "AV_CLASS_U": "numeric",
-    "JV_H2O_REC": "numeric",
-    "AV_H2O_REC": "numeric",
-    "JV_CONSRV_": "numeric",
-    "AV_CONSRV_": "numeric",
-    "JV_HIST_CO": "numeric",
-    "AV_HIST_CO": "numeric",
-    "JV_HIST_SI": "numeric",
-    "AV_HIST_SI": "numeric",
-    "JV_WRKNG_W": "numeric",
-    "AV_WRKNG_W": "numeric",
-}
-
-# Text columns that should be trimmed and have empty strings handled
-TEXT_COLUMNS = {
-    "PARCEL_ID",
-    "FILE_T",
-    "DOR_UC",
-    "PA_UC",
-    "SPASS_CD",
-    "JV_CHNG_CD",
-    "OWN_NAME",
-    "OWN_ADDR1",
-    "OWN_ADDR2",
-    "OWN_CITY",
-    "OWN_STATE",
-    "OWN_ZIPCD",
-    "PHY_ADDR1",
-    "PHY_ADDR2",
-    "PHY_CITY",
-    "PHY_ZIPCD",
-    "S_LEGAL",
-    "TWN",
-    "RNG",
-    "SEC",
-    "SALE_MO1",
-    "SALE_MO2",
-    "OR_BOOK1",
-    "OR_PAGE1",
-    "OR_BOOK2",
-    "OR_PAGE2",
-    "CLERK_NO1",
-    "CLERK_NO2",
-    "S_CHNG_CD1",
-    "S_CHNG_CD2",
-    "NBRHD_CD",
-    "CENSUS_BK",
-    "MKT_AR",
-    "FIDU_NAME",
-    "FIDU_ADDR1",
-    "FIDU_ADDR2",
-    "FIDU_CITY",
-    "FIDU_STATE",
-    "FIDU_ZIPCD",
-    "FIDU_CD",
-    "APP_STAT",
-    "CO_APP_STA",
-    "PUBLIC_LND",
-    "TAX_AUTH_C",
-    "ALT_KEY",
-    "STATE_PAR_",
-    "SPC_CIR_CD",
-    "SPC_CIR_TX",
-    "DISTR_CD",
-    "LND_UNTS_C",
-    "IMP_QUAL",
-    "CONST_CLAS",
-    "OWN_STATE_",
-    "ASS_TRNSFR",
-    "PREV_HMSTD",
-    "ASS_DIF_TR",
-    "CONO_PRV_H",
-    "PARCEL_ID_",
-    "YR_VAL_TRN",
-    "RS_ID",
-    "MP_ID",
-}
+
+from parcel_schema import NUMERIC_COLUMNS, compile_cleaning_plan
 
 # Columns that are definitely uppercase in the CSV
 EXPECTED_COLUMNS = {"PARCEL_ID", "CO_NO", "JV", "OWN_NAME", "PHY_ADDR1", "SALE_PRC1"}
 
+# Cleaning engines selectable with --engine
+ENGINES = ("python", "arrow")
+
+# Encodings tried, in order, when decoding a county export
+ENCODINGS = ["utf-8", "latin-1", "cp1252"]
+
+# Files larger than this are split into byte-range chunks in --jobs mode
+DEFAULT_CHUNK_MB = 128
+
+# Bytes read from the start of a file to pick its encoding
+ENCODING_SAMPLE_BYTES = 1024 * 1024
+
+# Block size used when scanning files for record boundaries
+SCAN_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """Raw reader exposing only the bytes in [start, end) of a file."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: min(len(buffer), self._remaining)]
+        count = self._file.readinto(view)
+        self._remaining -= count
+        return count
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def find_record_boundaries(path, chunk_bytes):
+    """Split a CSV file into byte ranges that start and end on record boundaries.
+
+    A boundary is a newline that is not inside a quoted field, so records
+    with embedded newlines are never cut in half. The header line is
+    excluded from the returned ranges.
+
+    Returns:
+        Tuple of (header_end, ranges) where ranges is a list of
+        (start, end) byte offsets covering all data rows.
+    """
+    file_size = os.path.getsize(path)
+    boundaries = []
+    target = 0
+    in_quotes = False
+    offset = 0
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+
+            # Quote state is tracked exactly up to `pos` within the block
+            pos = 0
+            while True:
+                search_from = max(target - offset, pos)
+                newline = block.find(b"\n", search_from)
+                if newline == -1:
+                    break
+
+                if block.count(b'"', pos, newline) % 2:
+                    in_quotes = not in_quotes
+                pos = newline
+
+                if in_quotes:
+                    # Embedded newline inside a quoted field - keep looking
+                    target = offset + newline + 1
+                    continue
+
+                boundary = offset + newline + 1
+                boundaries.append(boundary)
+                target = boundary + chunk_bytes
+
+            if block.count(b'"', pos) % 2:
+                in_quotes = not in_quotes
+            offset += len(block)
+
+    if not boundaries:
+        return file_size, []
+
+    header_end = boundaries[0]
+    edges = [b for b in boundaries if b < file_size] + [file_size]
+    ranges = [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+    return header_end, ranges
+
+
+def load_arrow_engine():
+    """Import the optional pyarrow-based engine module."""
+    try:
+        import clean_parcels_vectorized
+    except ImportError as e:
+        raise Exception(
+            f"The arrow engine requires pyarrow (pip install pyarrow): {e}"
+        ) from e
+    return clean_parcels_vectorized
+
+
+def load_copy_loader():
+    """Import the optional psycopg2-based COPY loader module."""
+    try:
+        import parcel_loader
+    except ImportError as e:
+        raise Exception(
+            f"--load requires psycopg2 (pip install psycopg2-binary): {e}"
+        ) from e
+    return parcel_loader
+
+
+def _load_range_worker(dsn, input_file, start, end, encoding, fieldnames):
+    """Load one byte range of a file into florida_parcels."""
+    loader = load_copy_loader()
+    return loader.load_range(dsn, input_file, start, end, encoding, fieldnames)
+
+
+def _clean_file_worker(input_file, output_file, engine):
+    """Clean a whole file in a worker process and return its stats."""
+    cleaner = CSVCleaner(verbose=False, engine=engine)
+    success = cleaner.clean_csv_file(input_file, output_file)
+    return success, cleaner.stats
+
+
+def _clean_chunk_worker(
+    input_file, start, end, encoding, fieldnames, part_file, engine
+):
+    """Clean one byte range of a file in a worker process.
+
+    The part file is written without a header so parts can be concatenated
+    directly after the header of the final output.
+    """
+    cleaner = CSVCleaner(verbose=False, engine=engine)
+
+    if engine == "arrow":
+        vectorized = load_arrow_engine()
+        source = io.BufferedReader(_ByteRangeReader(input_file, start, end))
+        try:
+            with open(part_file, "wb") as outfile:
+                return vectorized.clean_records_arrow(
+                    source, outfile, fieldnames, encoding, skip_header=False
+                )
+        except vectorized.UnsupportedInput:
+            pass
+        finally:
+            source.close()
+
+    plan = compile_cleaning_plan(fieldnames)
+    raw = _ByteRangeReader(input_file, start, end)
+    with io.TextIOWrapper(
+        io.BufferedReader(raw), encoding=encoding, newline=""
+    ) as infile:
+        with open(part_file, "w", newline="", encoding="utf-8") as outfile:
+            return cleaner.clean_records(csv.reader(infile), csv.writer(outfile), plan)
+
 
 class CSVCleaner:
     """Clean CSV files for Supabase import."""
 
-    def __init__(self, verbose=True):
+    def __init__(self, verbose=True, engine="python"):
         """Initialize CSV cleaner.
 
         Args:
             verbose: Whether to print progress messages.
+            engine: "python" for the compiled per-cell plan, or "arrow" for
+                the vectorized pyarrow engine in clean_parcels_vectorized.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
         self.verbose = verbose
+        self.engine = engine
         self.stats = {
             "files_processed": 0,
             "total_rows": 0,
             "cells_cleaned": 0,
+            "rows_skipped": 0,
             "errors": 0,
             "files_with_errors": [],
         }
@@ -154,74 +216,44 @@ class CSVCleaner:
         if self.verbose:
             print(message)
 
-    def clean_numeric_value(self, value):
-        """Clean numeric values - convert empty strings and spaces to NULL."""
-        if not value:
-            return ""
-
-        # Strip whitespace
-        value = str(value).strip()
-
-        # Check for empty, spaces, or NULL representations
-        if value in ("", " ", "  ", "   ", ".", "..", "..."):
-            return ""
-        if value.upper() in ("NULL", "NONE", "N/A", "NA", "NAN", "#N/A"):
-            return ""
-
-        # Remove any thousands separators and clean up formatting
-        value = value.replace(",", "")
+    def clean_records(self, reader, writer, plan, log_progress=False):
+        """Clean every record from a csv.reader into a csv.writer.
 
-        # Handle parentheses for negative numbers
-        if value.startswith("(") and value.endswith(")"):
-            value = "-" + value[1:-1]
+        Short records are padded with empty values, matching how DictReader
+        fills missing fields. Records with more fields than the header are
+        rejected, as DictWriter would.
 
-        # Check if it's a valid number
-        try:
-            float(value)
-            return value
-        except ValueError:
-            # If it's not a valid number, return empty
-            return ""
-
-    def clean_text_value(self, value):
-        """Clean text values - trim whitespace and handle encoding."""
-        if not value:
-            return ""
-
-        # Convert to string and strip whitespace
-        value = str(value).strip()
-
-        # Replace multiple spaces with single space
-        value = re.sub(r"\s+", " ", value)
-
-        # Handle common encoding issues
-        value = value.replace("\x00", "")  # Remove null bytes
-
-        return value
-
-    def clean_row(self, row):
-        """Clean a single row of data."""
-        cleaned_row = {}
+        Returns:
+            Tuple of (rows_processed, cells_cleaned).
+        """
+        width = len(plan)
+        rows_processed = 0
         cells_cleaned = 0
 
-        for column, value in row.items():
-            original_value = value
+        for record in reader:
+            if not record:
+                # DictReader skips blank lines
+                continue
 
-            # Check if this is a numeric column
-            if column in NUMERIC_COLUMNS:
-                cleaned_value = self.clean_numeric_value(value)
-            elif column in TEXT_COLUMNS:
-                cleaned_value = self.clean_text_value(value)
-            else:
-                # For unknown columns, just trim whitespace
-                cleaned_value = str(value).strip() if value else ""
+            rows_processed += 1
+            padded_cells = 0
+            if len(record) != width:
+                if len(record) > width:
+                    raise Exception(
+                        f"Row {rows_processed:,} has {len(record)} fields, "
+                        f"expected {width}"
+                    )
+                padded_cells = width - len(record)
+                record = record + [""] * padded_cells
 
-            cleaned_row[column] = cleaned_value
+            cleaned = [clean(value) for clean, value in zip(plan, record)]
+            cells_cleaned += sum(map(ne, record, cleaned)) + padded_cells
+            writer.writerow(cleaned)
 
-            if original_value != cleaned_value:
-                cells_cleaned += 1
+            if log_progress and rows_processed % 10000 == 0:
+                self.log(f"   Processed {rows_processed:,} rows...")
 
-        return cleaned_row, cells_cleaned
+        return rows_processed, cells_cleaned
 
     def validate_headers(self, headers):
         """Validate that we have expected column headers."""
@@ -236,39 +268,61 @@ class CSVCleaner:
         return True
 
     def clean_csv_file(self, input_file, output_file):
-        """Clean a single CSV file."""
+        """Clean a single CSV file.
+
+        Rows are streamed from disk to the output, so memory use does not
+        grow with file size. The encoding is detected from a bounded sample;
+        if a later part of the file fails to decode, the file is re-opened
+        with the next candidate encoding and the output is rewritten.
+        """
         self.log(f"\n📄 Processing: {input_file.name}")
 
         try:
-            rows_processed = 0
-            file_cells_cleaned = 0
+            encoding = self.detect_encoding(input_file)
+            result = None
 
-            # Try different encodings
-            encodings = ["utf-8", "latin-1", "cp1252"]
-            file_content = None
-            used_encoding = None
-
-            for encoding in encodings:
+            for encoding in ENCODINGS[ENCODINGS.index(encoding) :]:
+                self.log(f"   Using encoding: {encoding}")
                 try:
-                    with open(input_file, "r", encoding=encoding) as f:
-                        file_content = f.read()
-                        used_encoding = encoding
-                        break
+                    result = self.clean_stream(input_file, output_file, encoding)
+                    break
                 except UnicodeDecodeError:
-                    continue
-
-            if not file_content:
+                    self.log(f"   ⚠️  {encoding} failed past the sample, re-opening")
+            else:
                 raise Exception("Could not decode file with any known encoding")
 
-            self.log(f"   Using encoding: {used_encoding}")
+            if result is None:
+                return False
 
-            # Process the CSV
-            from io import StringIO
+            rows_processed, file_cells_cleaned = result
+            self.stats["total_rows"] += rows_processed
+            self.stats["cells_cleaned"] += file_cells_cleaned
+
+            self.log(
+                f"   ✅ Cleaned {rows_processed:,} rows, "
+                f"{file_cells_cleaned:,} cells modified"
+            )
+            return True
+
+        except Exception as e:
+            self.log(f"   ❌ Error: {str(e)}")
+            self.stats["errors"] += 1
+            self.stats["files_with_errors"].append(input_file.name)
+            return False
+
+    def clean_stream(self, input_file, output_file, encoding):
+        """Stream rows from input_file through a compiled plan into output_file.
 
-            input_buffer = StringIO(file_content)
+        Returns:
+            Tuple of (rows_processed, cells_cleaned), or None if the file
+            does not look like parcels data.
 
-            reader = csv.DictReader(input_buffer)
-            fieldnames = reader.fieldnames
+        Raises:
+            UnicodeDecodeError: If the file does not decode with encoding.
+        """
+        with open(input_file, "r", newline="", encoding=encoding) as infile:
+            reader = csv.reader(infile)
+            fieldnames = next(reader, None)
 
             if not fieldnames:
                 raise Exception("No headers found in CSV file")
@@ -276,7 +330,7 @@ class CSVCleaner:
             # Validate headers
             if not self.validate_headers(fieldnames):
                 self.log("   ⚠️  Skipping file - doesn't appear to be parcels data")
-                return False
+                return None
 
             self.log(f"   Found {len(fieldnames)} columns")
 
@@ -284,43 +338,59 @@ class CSVCleaner:
             numeric_cols_found = [col for col in fieldnames if col in NUMERIC_COLUMNS]
             self.log(f"   Cleaning {len(numeric_cols_found)} numeric columns")
 
+            if self.engine == "arrow":
+                result = self.clean_file_arrow(
+                    input_file, output_file, fieldnames, encoding
+                )
+                if result is not None:
+                    return result
+
+            plan = compile_cleaning_plan(fieldnames)
+
             # Write cleaned data
             with open(output_file, "w", newline="", encoding="utf-8") as outfile:
-                writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for row in reader:
-                    rows_processed += 1
-                    cleaned_row, cells_cleaned = self.clean_row(row)
-                    file_cells_cleaned += cells_cleaned
-                    writer.writerow(cleaned_row)
+                writer = csv.writer(outfile)
+                writer.writerow(fieldnames)
+                return self.clean_records(reader, writer, plan, log_progress=True)
 
-                    if rows_processed % 10000 == 0:
-                        self.log(f"   Processed {rows_processed:,} rows...")
+    def clean_file_arrow(self, input_file, output_file, fieldnames, encoding):
+        """Clean a file with the vectorized engine.
 
-            self.stats["total_rows"] += rows_processed
-            self.stats["cells_cleaned"] += file_cells_cleaned
-
-            self.log(
-                f"   ✅ Cleaned {rows_processed:,} rows, "
-                f"{file_cells_cleaned:,} cells modified"
-            )
-            return True
-
-        except Exception as e:
-            self.log(f"   ❌ Error: {str(e)}")
-            self.stats["errors"] += 1
-            self.stats["files_with_errors"].append(input_file.name)
-            return False
+        Returns:
+            Tuple of (rows_processed, cells_cleaned), or None if Arrow could
+            not parse the file and the Python engine should be used instead.
+        """
+        vectorized = load_arrow_engine()
+        self.log("   Using arrow engine")
+        try:
+            with open(output_file, "w", newline="", encoding="utf-8") as outfile:
+                csv.writer(outfile).writerow(fieldnames)
+            with open(output_file, "ab") as outfile:
+                return vectorized.clean_records_arrow(
+                    input_file, outfile, fieldnames, encoding
+                )
+        except vectorized.UnsupportedInput as e:
+            self.log(f"   ⚠️  Arrow engine could not parse file ({e})")
+            self.log("   Falling back to python engine")
+            return None
+
+    def process_directory(
+        self, input_dir, output_dir, jobs=1, chunk_mb=DEFAULT_CHUNK_MB, dsn=None
+    ):
+        """Process all CSV files in a directory.
 
-    def process_directory(self, input_dir, output_dir):
-        """Process all CSV files in a directory."""
+        Args:
+            input_dir: Directory containing county CSV files.
+            output_dir: Directory for the cleaned files.
+            jobs: Number of worker processes. 1 cleans files sequentially.
+            chunk_mb: In parallel mode, files larger than this are split
+                into byte-range chunks cleaned by separate workers.
+            dsn: If set, load rows into florida_parcels at this database
+                URL instead of writing cleaned files.
+        """
         input_path = Path(input_dir)
         output_path = Path(output_dir)
 
-        # Create output directory if it doesn't exist
-        output_path.mkdir(parents=True, exist_ok=True)
-
         # Find all CSV files
         csv_files = list(input_path.glob("*.csv"))
 
@@ -330,6 +400,19 @@ class CSVCleaner:
 
         self.log(f"🔍 Found {len(csv_files)} CSV files to process")
 
+        if dsn:
+            self.load_files(csv_files, dsn, jobs, chunk_mb * 1024 * 1024)
+            return True
+
+        # Create output directory if it doesn't exist
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        if jobs > 1:
+            self.process_files_parallel(
+                csv_files, output_path, jobs, chunk_mb * 1024 * 1024
+            )
+            return True
+
         # Process each file
         for csv_file in csv_files:
             output_file = output_path / f"{csv_file.stem}_cleaned.csv"
@@ -339,6 +422,306 @@ class CSVCleaner:
 
         return True
 
+    def detect_encoding(self, input_file):
+        """Return the first encoding in ENCODINGS that decodes a sample.
+
+        Only the first ENCODING_SAMPLE_BYTES are read. Callers must still be
+        prepared for a UnicodeDecodeError later in the file.
+        """
+        with open(input_file, "rb") as f:
+            sample = f.read(ENCODING_SAMPLE_BYTES)
+            at_eof = not f.read(1)
+
+        for encoding in ENCODINGS:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                # final=False tolerates a multi-byte character cut by the sample
+                decoder.decode(sample, final=at_eof)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+
+        raise Exception("Could not decode file with any known encoding")
+
+    def read_header(self, input_file, encoding):
+        """Read the CSV header row of a file."""
+        with open(input_file, "r", newline="", encoding=encoding) as f:
+            return next(csv.reader(f), None)
+
+    def merge_stats(self, stats):
+        """Merge stats reported by a worker into this cleaner's stats."""
+        for key in ("total_rows", "cells_cleaned", "errors"):
+            self.stats[key] += stats.get(key, 0)
+        self.stats["files_with_errors"].extend(stats.get("files_with_errors", []))
+
+    def record_error(self, input_file, error):
+        """Record a failed file in the stats."""
+        self.log(f"   ❌ {input_file.name}: {error}")
+        self.stats["errors"] += 1
+        self.stats["files_with_errors"].append(input_file.name)
+
+    def process_files_parallel(self, csv_files, output_path, jobs, chunk_bytes):
+        """Clean files in a process pool, largest first.
+
+        Files above chunk_bytes are split on record boundaries so a single
+        large county can be spread over several workers. Chunk outputs are
+        concatenated in order behind the header once every chunk is done.
+        If a chunk fails to decode with the sampled encoding, all chunks of
+        that file are resubmitted with the next candidate encoding.
+        """
+        csv_files = sorted(csv_files, key=lambda f: f.stat().st_size, reverse=True)
+        self.log(f"⚙️  Cleaning with {jobs} worker processes (largest files first)")
+
+        parts_dir = output_path / ".parts"
+        chunked_files = {}
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+
+            def submit_chunks(csv_file):
+                chunk_state = chunked_files[csv_file]
+                encoding = chunk_state["encoding"]
+                chunk_state["part_files"] = [
+                    parts_dir / f"{csv_file.stem}.{encoding}.part{index:04d}.csv"
+                    for index in range(len(chunk_state["ranges"]))
+                ]
+                chunk_state["remaining"] = len(chunk_state["ranges"])
+                chunk_state["rows"] = 0
+                chunk_state["cells"] = 0
+
+                for (start, end), part_file in zip(
+                    chunk_state["ranges"], chunk_state["part_files"]
+                ):
+                    future = pool.submit(
+                        _clean_chunk_worker,
+                        csv_file,
+                        start,
+                        end,
+                        encoding,
+                        chunk_state["fieldnames"],
+                        part_file,
+                        self.engine,
+                    )
+                    futures[future] = (csv_file, encoding)
+
+            for csv_file in csv_files:
+                output_file = output_path / f"{csv_file.stem}_cleaned.csv"
+
+                if csv_file.stat().st_size <= chunk_bytes:
+                    future = pool.submit(
+                        _clean_file_worker, csv_file, output_file, self.engine
+                    )
+                    futures[future] = (csv_file, None)
+                    continue
+
+                try:
+                    encoding = self.detect_encoding(csv_file)
+                    fieldnames = self.read_header(csv_file, encoding)
+                    if not fieldnames:
+                        raise Exception("No headers found in CSV file")
+                    if not self.validate_headers(fieldnames):
+                        self.log(f"   ⚠️  Skipping {csv_file.name}")
+                        continue
+                    _, ranges = find_record_boundaries(csv_file, chunk_bytes)
+                except Exception as e:
+                    self.record_error(csv_file, e)
+                    continue
+
+                parts_dir.mkdir(exist_ok=True)
+                chunked_files[csv_file] = {
+                    "output_file": output_file,
+                    "fieldnames": fieldnames,
+                    "ranges": ranges,
+                    "encoding": encoding,
+                    "failed": False,
+                }
+                self.log(f"   ✂️  {csv_file.name}: {len(ranges)} chunks ({encoding})")
+                submit_chunks(csv_file)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    csv_file, encoding = futures.pop(future)
+
+                    if encoding is None:
+                        try:
+                            success, stats = future.result()
+                        except Exception as e:
+                            self.record_error(csv_file, e)
+                            continue
+                        self.merge_stats(stats)
+                        if success:
+                            self.stats["files_processed"] += 1
+                            self.log(f"   ✅ {csv_file.name}")
+                        continue
+
+                    chunk_state = chunked_files[csv_file]
+                    if chunk_state["failed"] or encoding != chunk_state["encoding"]:
+                        # Result from an abandoned file or encoding attempt
+                        continue
+
+                    try:
+                        rows, cells = future.result()
+                    except UnicodeDecodeError:
+                        next_index = ENCODINGS.index(encoding) + 1
+                        if next_index < len(ENCODINGS):
+                            chunk_state["encoding"] = ENCODINGS[next_index]
+                            self.log(
+                                f"   ⚠️  {csv_file.name}: {encoding} failed past "
+                                f"the sample, retrying as {chunk_state['encoding']}"
+                            )
+                            submit_chunks(csv_file)
+                            continue
+                        chunk_state["failed"] = True
+                        self.record_error(
+                            csv_file, "Could not decode file with any known encoding"
+                        )
+                        continue
+                    except Exception as e:
+                        chunk_state["failed"] = True
+                        self.record_error(csv_file, e)
+                        continue
+
+                    chunk_state["rows"] += rows
+                    chunk_state["cells"] += cells
+                    chunk_state["remaining"] -= 1
+
+                    if chunk_state["remaining"] == 0:
+                        self.assemble_chunks(chunk_state)
+                        self.stats["total_rows"] += chunk_state["rows"]
+                        self.stats["cells_cleaned"] += chunk_state["cells"]
+                        self.stats["files_processed"] += 1
+                        self.log(f"   ✅ {csv_file.name}")
+
+        if parts_dir.exists():
+            shutil.rmtree(parts_dir)
+
+    def load_files(self, csv_files, dsn, jobs, chunk_bytes):
+        """Load files into florida_parcels, one COPY stream per worker.
+
+        Each file is split on record boundaries into ranges of about
+        chunk_bytes. Every range is copied into a staging table and upserted
+        in its own transaction, so a range that fails to decode with the
+        sampled encoding is rolled back and retried with the next candidate
+        encoding. With jobs == 1 ranges are loaded in this process.
+        """
+        csv_files = sorted(csv_files, key=lambda f: f.stat().st_size, reverse=True)
+        file_states = {}
+        tasks = []
+
+        for csv_file in csv_files:
+            try:
+                encoding = self.detect_encoding(csv_file)
+                fieldnames = self.read_header(csv_file, encoding)
+                if not fieldnames:
+                    raise Exception("No headers found in CSV file")
+                if not self.validate_headers(fieldnames):
+                    self.log(f"   ⚠️  Skipping {csv_file.name}")
+                    continue
+                _, ranges = find_record_boundaries(csv_file, chunk_bytes)
+            except Exception as e:
+                self.record_error(csv_file, e)
+                continue
+
+            file_states[csv_file] = {
+                "fieldnames": fieldnames,
+                "remaining": len(ranges),
+                "rows": 0,
+                "skipped": 0,
+                "failed": False,
+            }
+            if not ranges:
+                self.stats["files_processed"] += 1
+            tasks.extend((csv_file, start, end, encoding) for start, end in ranges)
+
+        self.log(f"🐘 Loading {len(tasks)} ranges with {jobs} COPY streams")
+
+        def finish(task, stats, error):
+            """Record a range result; return a retry task if one is needed."""
+            csv_file, start, end, encoding = task
+            state = file_states[csv_file]
+            if state["failed"]:
+                return None
+
+            if isinstance(error, UnicodeDecodeError):
+                next_index = ENCODINGS.index(encoding) + 1
+                if next_index < len(ENCODINGS):
+                    self.log(
+                        f"   ⚠️  {csv_file.name}: {encoding} failed at byte "
+                        f"{start:,}, retrying range as {ENCODINGS[next_index]}"
+                    )
+                    return (csv_file, start, end, ENCODINGS[next_index])
+                error = Exception("Could not decode file with any known encoding")
+
+            if error is not None:
+                # Ranges already committed stay loaded; re-running upserts
+                state["failed"] = True
+                self.record_error(csv_file, error)
+                return None
+
+            state["rows"] += stats["rows"]
+            state["skipped"] += stats["skipped"]
+            state["remaining"] -= 1
+            if state["remaining"] == 0:
+                self.stats["total_rows"] += state["rows"]
+                self.stats["rows_skipped"] += state["skipped"]
+                self.stats["files_processed"] += 1
+                self.log(
+                    f"   ✅ {csv_file.name}: {state['rows']:,} rows loaded, "
+                    f"{state['skipped']:,} skipped"
+                )
+            return None
+
+        def arguments(task):
+            csv_file, start, end, encoding = task
+            fieldnames = file_states[csv_file]["fieldnames"]
+            return dsn, csv_file, start, end, encoding, fieldnames
+
+        if jobs == 1:
+            pending = deque(tasks)
+            while pending:
+                task = pending.popleft()
+                try:
+                    stats, error = _load_range_worker(*arguments(task)), None
+                except Exception as e:
+                    stats, error = None, e
+                retry = finish(task, stats, error)
+                if retry:
+                    pending.append(retry)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(_load_range_worker, *arguments(task)): task
+                for task in tasks
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = futures.pop(future)
+                    try:
+                        stats, error = future.result(), None
+                    except Exception as e:
+                        stats, error = None, e
+                    retry = finish(task, stats, error)
+                    if retry:
+                        futures[pool.submit(_load_range_worker, *arguments(retry))] = (
+                            retry
+                        )
+
+    def assemble_chunks(self, chunk_state):
+        """Write the header and concatenate cleaned chunk files in order."""
+        with open(
+            chunk_state["output_file"], "w", newline="", encoding="utf-8"
+        ) as outfile:
+            csv.writer(outfile).writerow(chunk_state["fieldnames"])
+
+        with open(chunk_state["output_file"], "ab") as outfile:
+            for part_file in chunk_state["part_files"]:
+                with open(part_file, "rb") as part:
+                    shutil.copyfileobj(part, outfile)
+                part_file.unlink()
+
     def print_summary(self):
         """Print processing summary."""
         print("\n" + "=" * 60)
@@ -347,6 +730,8 @@ class CSVCleaner:
         print(f"✅ Files successfully processed: {self.stats['files_processed']}")
         print(f"📄 Total rows processed: {self.stats['total_rows']:,}")
         print(f"🧹 Total cells cleaned: {self.stats['cells_cleaned']:,}")
+        if self.stats["rows_skipped"] > 0:
+            print(f"⏭️  Rows skipped: {self.stats['rows_skipped']:,}")
 
         if self.stats["errors"] > 0:
             print(f"❌ Files with errors: {self.stats['errors']}")
@@ -375,6 +760,40 @@ def main():
         action="store_true",
         help="Quiet mode - only show summary",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 = all CPU cores)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="python",
+        help="Cleaning engine (default: python; arrow requires pyarrow)",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=DEFAULT_CHUNK_MB,
+        help=(
+            "With --jobs, split files larger than this many MB into chunks "
+            f"(default: {DEFAULT_CHUNK_MB})"
+        ),
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help=(
+            "COPY cleaned rows straight into florida_parcels (upsert via a "
+            "staging table) instead of writing cleaned files"
+        ),
+    )
+    parser.add_argument(
+        "--dsn",
+        help="Database URL for --load (default: $DATABASE_URL or $SUPABASE_DB_URL)",
+    )
 
     args = parser.parse_args()
 
@@ -393,18 +812,38 @@ def main():
     else:
         output_path = input_path / "cleaned"
 
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    dsn = None
+    if args.load:
+        dsn = args.dsn or os.getenv("DATABASE_URL") or os.getenv("SUPABASE_DB_URL")
+        if not dsn:
+            print("❌ Error: --load needs --dsn, DATABASE_URL or SUPABASE_DB_URL")
+            sys.exit(1)
+        try:
+            load_copy_loader()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
     print("🏘️  Florida Parcels CSV Batch Cleaner")
     print("=" * 60)
     print(f"📁 Input directory: {input_path}")
-    print(f"📁 Output directory: {output_path}")
+    if dsn:
+        print("🐘 Loading into: florida_parcels (COPY + staging upsert)")
+    else:
+        print(f"📁 Output directory: {output_path}")
+    print(f"⚙️  Worker processes: {jobs} ({args.engine} engine)")
     print("=" * 60)
 
     # Create cleaner instance
-    cleaner = CSVCleaner(verbose=not args.quiet)
+    cleaner = CSVCleaner(verbose=not args.quiet, engine=args.engine)
 
     # Process all files
     start_time = datetime.now()
-    success = cleaner.process_directory(input_path, output_path)
+    success = cleaner.process_directory(
+        input_path, output_path, jobs=jobs, chunk_mb=args.chunk_mb, dsn=dsn
+    )
     end_time = datetime.now()
 
     # Print summary
@@ -413,6 +852,8 @@ def main():
     if success and cleaner.stats["files_processed"] > 0:
         duration = (end_time - start_time).total_seconds()
         print(f"\n⏱️  Processing time: {duration:.1f} seconds")
+        if dsn:
+            return
         print("\n📤 Next steps:")
         print("1. Go to Supabase Table Editor")
         print("2. Select the 'florida_parcels' table")
@@ -10,30 +10,7 @@ import sys
 import argparse
 from pathlib import Path
 
-# Numeric columns that need cleaning
-NUMERIC_COLUMNS = {
-    "OBJECTID": "bigint",
-    "CO_NO": "integer",
-    "ASMNT_YR": "integer",
-    "JV": "numeric",
-    "AV_SD": "numeric",
-    "AV_NSD": "numeric",
-    "TV_SD": "numeric",
-    "TV_NSD": "numeric",
-    "LAND_VAL": "numeric",
-    "BLDG_VAL": "numeric",
-    "TOT_VAL": "numeric",
-    "ACT_YR_BLT": "integer",
-    "EFF_YR_BLT": "integer",
-    "TOT_LVG_AR": "numeric",
-    "LAND_SQFOOT": "numeric",
-    "NO_BULDNG": "integer",
-    "NO_RES_UNT": "integer",
-    "SALE_PRC1": "numeric",
-    "SALE_YR1": "integer",
-    "SALE_PRC2": "numeric",
-    "SALE_YR2": "integer",
-}
+from parcel_schema import NUMERIC_COLUMNS
 
 
 def clean_value(value, column_name):
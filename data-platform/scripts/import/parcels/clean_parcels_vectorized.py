@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Vectorized cleaning engine for Florida parcels CSV files.
+
+Applies the clean_all_parcels_csv rules (NULL tokens, thousands separators,
+parenthesised negatives, whitespace collapse) to whole Arrow columns with
+pyarrow compute kernels. Cells the kernels cannot reproduce exactly -
+exotic whitespace, NUL bytes, or numbers outside the plain digit form - are
+sent through the scalar cleaners, so output is byte-identical to the Python
+engine.
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import argparse
+import filecmp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from clean_all_parcels_csv import CSVCleaner
+from parcel_schema import (
+    NULL_PUNCTUATION,
+    NULL_TOKENS,
+    NUMERIC_COLUMNS,
+    TEXT_COLUMNS,
+    clean_numeric,
+    clean_other,
+    clean_text,
+)
+
+# Bytes per Arrow record batch
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# ASCII whitespace as seen by str.isspace() and str.split()
+ASCII_WHITESPACE = " \t\n\x0b\x0c\r"
+WHITESPACE_RUN = r"[ \t\n\x0b\x0c\r]+"
+
+# Characters where RE2/Arrow and Python string semantics could diverge:
+# NUL bytes (removed from text) and whitespace that is not plain ASCII
+TEXT_FALLBACK = (
+    r"[\x00\x1c-\x1f\x85\xa0\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]"
+)
+# Numeric cells outside printable ASCII always take the scalar path
+NUMERIC_FALLBACK = r"[^\x20-\x7e\t\n\x0b\x0c\r]"
+
+# Byte-level prefilters. Each column's data buffer is reduced to its
+# "rare" bytes - everything except ordinary printable ASCII - and kernels
+# whose trigger bytes are absent are skipped. 0xc2/0xe1/0xe2/0xe3 lead every
+# UTF-8 encoding of the non-ASCII whitespace.
+ORDINARY_BYTES = bytes(set(range(0x20, 0x7F)) - set(b',"()-'))
+TEXT_FALLBACK_BYTES = b"\x00\x1c\x1d\x1e\x1f\xc2\xe1\xe2\xe3"
+NUMERIC_SAFE_BYTES = b',"()-\t\n\x0b\x0c\r'
+CONTROL_WHITESPACE_BYTES = b"\t\n\x0b\x0c\r"
+QUOTE_BYTES = b',"\r\n'
+
+NULL_VALUES = pa.array(sorted(NULL_PUNCTUATION | NULL_TOKENS))
+
+
+class UnsupportedInput(Exception):
+    """Raised when Arrow cannot parse a file the Python engine accepts."""
+
+
+def _column_bytes(column):
+    """Return a copy of a string column's raw UTF-8 data buffer."""
+    data = column.buffers()[2]
+    return data.to_pybytes() if data is not None else b""
+
+
+def _rare_bytes(column):
+    """Return the bytes of a column that are not ordinary printable ASCII."""
+    return _column_bytes(column).translate(None, ORDINARY_BYTES)
+
+
+def _contains_any(data, candidates):
+    """Check whether data contains any byte from candidates."""
+    return any(byte in data for byte in candidates)
+
+
+def _fallback_mask(column, needed, pattern):
+    """Mask of cells needing scalar cleaning, or None if there are none."""
+    if not needed:
+        return None
+    return pc.match_substring_regex(column, pattern)
+
+
+def _merge_fallback(original, fast, fallback, scalar_cleaner):
+    """Combine kernel output with scalar cleaning of fallback cells.
+
+    Returns:
+        Tuple of (cleaned column, number of cells changed).
+    """
+    changed = pc.not_equal(original, fast)
+
+    if fallback is None or not pc.any(fallback).as_py():
+        return fast, pc.sum(changed).as_py() or 0
+
+    changed = pc.sum(pc.and_not(changed, fallback)).as_py() or 0
+    cleaned = []
+    for value in pc.filter(original, fallback).to_pylist():
+        cleaned_value = scalar_cleaner(value)
+        cleaned.append(cleaned_value)
+        changed += cleaned_value != value
+
+    merged = pc.replace_with_mask(fast, fallback, pa.array(cleaned, pa.string()))
+    return merged, changed
+
+
+def _replace_where(column, mask, transform):
+    """Apply transform only to the cells selected by mask."""
+    if not pc.any(mask).as_py():
+        return column
+    return pc.replace_with_mask(column, mask, transform(pc.filter(column, mask)))
+
+
+def clean_numeric_column(column):
+    """Vectorized equivalent of clean_numeric."""
+    rare = _rare_bytes(column)
+    fallback = _fallback_mask(
+        column, rare.translate(None, NUMERIC_SAFE_BYTES), NUMERIC_FALLBACK
+    )
+    trimmed = pc.ascii_trim(column, ASCII_WHITESPACE)
+    is_null = pc.is_in(pc.ascii_upper(trimmed), value_set=NULL_VALUES)
+
+    candidate = trimmed
+    if b"," in rare:
+        candidate = pc.replace_substring(candidate, ",", "")
+    if b"(" in rare:
+        parenthesised = pc.and_(
+            pc.starts_with(candidate, "("), pc.ends_with(candidate, ")")
+        )
+        candidate = _replace_where(
+            candidate,
+            parenthesised,
+            lambda cells: pc.binary_join_element_wise(
+                "-", pc.utf8_slice_codeunits(cells, 1, -1), ""
+            ),
+        )
+
+    # Plain numbers are -?digits with at most one dot; float() accepts all of
+    # them unchanged. Anything else that is not NULL needs float() semantics.
+    unsigned = candidate
+    if b"-" in rare:
+        unsigned = _replace_where(
+            candidate,
+            pc.starts_with(candidate, "-"),
+            lambda cells: pc.utf8_slice_codeunits(cells, 1),
+        )
+    digits = pc.replace_substring(unsigned, ".", "", max_replacements=1)
+    needs_scalar = pc.invert(pc.or_(is_null, pc.ascii_is_decimal(digits)))
+    fallback = needs_scalar if fallback is None else pc.or_(fallback, needs_scalar)
+
+    fast = pc.if_else(is_null, "", candidate)
+    return _merge_fallback(column, fast, fallback, clean_numeric)
+
+
+def clean_text_column(column):
+    """Vectorized equivalent of clean_text."""
+    data = _column_bytes(column)
+    rare = data.translate(None, ORDINARY_BYTES)
+    fallback = _fallback_mask(
+        column, _contains_any(rare, TEXT_FALLBACK_BYTES), TEXT_FALLBACK
+    )
+
+    collapsed = column
+    if _contains_any(rare, CONTROL_WHITESPACE_BYTES):
+        collapsed = pc.replace_substring_regex(column, WHITESPACE_RUN, " ")
+    elif b"  " in data:
+        # Only cells with a run of spaces pay for the regex kernel
+        collapsed = _replace_where(
+            column,
+            pc.match_substring(column, "  "),
+            lambda cells: pc.replace_substring_regex(cells, " {2,}", " "),
+        )
+
+    fast = pc.ascii_trim(collapsed, " ")
+    return _merge_fallback(column, fast, fallback, clean_text)
+
+
+def clean_other_column(column):
+    """Vectorized equivalent of clean_other."""
+    needed = _contains_any(_rare_bytes(column), TEXT_FALLBACK_BYTES)
+    fallback = _fallback_mask(column, needed, TEXT_FALLBACK)
+    fast = pc.ascii_trim(column, ASCII_WHITESPACE)
+    return _merge_fallback(column, fast, fallback, clean_other)
+
+
+def compile_column_kernels(fieldnames):
+    """Build the vectorized plan: column index -> column cleaner."""
+    kernels = []
+    for column in fieldnames:
+        if column in NUMERIC_COLUMNS:
+            kernels.append(clean_numeric_column)
+        elif column in TEXT_COLUMNS:
+            kernels.append(clean_text_column)
+        else:
+            kernels.append(clean_other_column)
+    return kernels
+
+
+def quote_csv_column(column):
+    """Quote cells exactly as csv.writer does with QUOTE_MINIMAL.
+
+    A cell is quoted when it contains the delimiter, the quote character
+    or a line break; embedded quotes are doubled.
+    """
+    if not _contains_any(_rare_bytes(column), QUOTE_BYTES):
+        return column
+    return _replace_where(
+        column,
+        pc.match_substring_regex(column, r'[,"\r\n]'),
+        lambda cells: pc.binary_join_element_wise(
+            '"', pc.replace_substring(cells, '"', '""'), '"', ""
+        ),
+    )
+
+
+def encode_csv_rows(columns):
+    """Encode cleaned columns as CSV rows, byte-identical to csv.writer.
+
+    Returns:
+        Buffer holding the UTF-8 encoded rows, CRLF terminated.
+    """
+    quoted = [quote_csv_column(column) for column in columns]
+    rows = pc.binary_join_element_wise(*quoted, ",")
+    lines = pc.binary_join_element_wise(rows, "", "\r\n")
+
+    _, offsets, data = lines.buffers()
+    if data is None:
+        return b""
+    offsets = memoryview(offsets).cast("i")
+    start = offsets[lines.offset]
+    end = offsets[lines.offset + len(lines)]
+    return data.slice(start, end - start)
+
+
+def clean_records_arrow(source, outfile, fieldnames, encoding, skip_header=True):
+    """Clean CSV records from source with Arrow kernels into outfile.
+
+    Args:
+        source: Path or binary file object positioned at the data.
+        outfile: Binary file object receiving UTF-8 CSV rows.
+        fieldnames: Header of the file, used for the column plan.
+        encoding: Encoding of the source data.
+        skip_header: Whether the first record of source is the header.
+
+    Returns:
+        Tuple of (rows_processed, cells_cleaned).
+
+    Raises:
+        UnsupportedInput: If Arrow cannot parse or decode the input, e.g.
+            rows whose width differs from the header.
+    """
+    if len(fieldnames) < 2:
+        # csv.writer quotes a lone empty field; not worth mirroring here
+        raise UnsupportedInput("Single-column files are not supported")
+
+    names = [f"f{index}" for index in range(len(fieldnames))]
+    read_options = pacsv.ReadOptions(
+        column_names=names,
+        skip_rows=1 if skip_header else 0,
+        encoding=encoding,
+        block_size=BLOCK_SIZE,
+    )
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in names},
+        strings_can_be_null=False,
+        quoted_strings_can_be_null=False,
+    )
+    kernels = compile_column_kernels(fieldnames)
+
+    rows_processed = 0
+    cells_cleaned = 0
+
+    try:
+        reader = pacsv.open_csv(source, read_options, parse_options, convert_options)
+        for batch in reader:
+            columns = []
+            for kernel, column in zip(kernels, batch.columns):
+                cleaned, changed = kernel(column)
+                columns.append(cleaned)
+                cells_cleaned += changed
+
+            outfile.write(encode_csv_rows(columns))
+            rows_processed += batch.num_rows
+    except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+        raise UnsupportedInput(str(e)) from e
+
+    return rows_processed, cells_cleaned
+
+
+def check_conformance(input_file):
+    """Clean input_file with both engines and compare the outputs byte for byte.
+
+    Returns:
+        True if the outputs and cleaned-cell counts are identical.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for engine in ("python", "arrow"):
+            output_file = Path(tmp) / f"{engine}.csv"
+            cleaner = CSVCleaner(verbose=False, engine=engine)
+            start = time.perf_counter()
+            if not cleaner.clean_csv_file(input_file, output_file):
+                print(f"❌ {engine} engine failed on {input_file.name}")
+                return False
+            elapsed = time.perf_counter() - start
+            results[engine] = (output_file, cleaner.stats)
+            print(
+                f"⏱️  {engine:>6}: {cleaner.stats['total_rows']:,} rows in "
+                f"{elapsed:.1f}s, {cleaner.stats['cells_cleaned']:,} cells cleaned"
+            )
+
+        (python_file, python_stats), (arrow_file, arrow_stats) = results.values()
+        same_bytes = filecmp.cmp(python_file, arrow_file, shallow=False)
+        same_counts = python_stats["cells_cleaned"] == arrow_stats["cells_cleaned"]
+
+    print(f"{'✅' if same_bytes else '❌'} Byte-identical output: {same_bytes}")
+    print(f"{'✅' if same_counts else '❌'} Identical cell counts: {same_counts}")
+    return same_bytes and same_counts
+
+
+def main():
+    """Check that the Arrow engine matches the Python engine."""
+    parser = argparse.ArgumentParser(
+        description="Check Arrow vs Python cleaning engine conformance"
+    )
+    parser.add_argument("input_files", nargs="+", help="Parcels CSV files to check")
+    args = parser.parse_args()
+
+    all_conform = True
+    for input_file in args.input_files:
+        print(f"\n📄 {input_file}")
+        all_conform &= check_conformance(Path(input_file))
+
+    if not all_conform:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
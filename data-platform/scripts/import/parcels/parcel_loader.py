@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Stream DOR parcel CSVs straight into florida_parcels.
+
+Each byte range of a county file is projected to typed load columns by
+parcel_schema, streamed with COPY ... FROM STDIN into a temporary staging
+table and upserted into florida_parcels, all in one transaction. No cleaned
+CSV is written to disk and a failed range leaves nothing behind.
+
+Used by clean_all_parcels_csv.py --load; requires psycopg2.
+"""
+
+import csv
+import io
+
+import psycopg2
+
+from clean_all_parcels_csv import _ByteRangeReader
+from parcel_schema import KEY_COLUMNS, LOAD_COLUMNS, RowProjection, iter_load_rows
+
+# Bytes of CSV handed to libpq per COPY write
+COPY_BUFFER_BYTES = 1024 * 1024
+
+STAGING_TABLE = "florida_parcels_staging"
+
+_COLUMN_LIST = ", ".join(LOAD_COLUMNS)
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS
+SELECT {_COLUMN_LIST} FROM florida_parcels WITH NO DATA
+"""
+
+COPY_SQL = f"COPY {STAGING_TABLE} ({_COLUMN_LIST}) FROM STDIN WITH (FORMAT csv)"
+
+UPSERT_SQL = f"""
+INSERT INTO florida_parcels ({_COLUMN_LIST})
+SELECT {_COLUMN_LIST} FROM {STAGING_TABLE}
+ON CONFLICT ({", ".join(KEY_COLUMNS)}) DO UPDATE SET
+{", ".join(f"{c} = EXCLUDED.{c}" for c in LOAD_COLUMNS if c not in KEY_COLUMNS)}
+"""
+
+# One connection per process, reused for every range the process loads
+_connection = None
+
+
+def get_connection(dsn):
+    """Return this process's database connection, opening it if needed."""
+    global _connection
+    if _connection is None or _connection.closed:
+        _connection = psycopg2.connect(dsn)
+        _connection.set_client_encoding("UTF8")
+    return _connection
+
+
+class CopySource:
+    """File-like COPY source that encodes typed rows as CSV on demand.
+
+    psycopg2 reads it in COPY_BUFFER_BYTES pieces, so only one buffer of
+    rows is held in memory. Errors raised while reading (e.g. a
+    UnicodeDecodeError from the input) are kept in self.error because
+    psycopg2 reports them as a generic COPY failure.
+    """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.error = None
+
+    def read(self, size=COPY_BUFFER_BYTES):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        try:
+            for values in self._rows:
+                writer.writerow(values)
+                if buffer.tell() >= size:
+                    break
+        except Exception as e:
+            self.error = e
+            raise
+        return buffer.getvalue()
+
+
+def load_range(dsn, input_file, start, end, encoding, fieldnames):
+    """Load the records in bytes [start, end) of input_file.
+
+    Args:
+        dsn: Database URL.
+        input_file: DOR parcels CSV.
+        start: Offset of the first record in the range.
+        end: Offset just past the last record in the range.
+        encoding: Encoding of input_file.
+        fieldnames: Header row of input_file.
+
+    Returns:
+        Dict with "rows" loaded and "skipped" records.
+
+    Raises:
+        UnicodeDecodeError: If the range does not decode with encoding.
+            The transaction is rolled back, so the caller can retry.
+    """
+    projection = RowProjection(fieldnames)
+    stats = {}
+    raw = _ByteRangeReader(input_file, start, end)
+
+    with io.TextIOWrapper(
+        io.BufferedReader(raw), encoding=encoding, newline=""
+    ) as infile:
+        source = CopySource(iter_load_rows(csv.reader(infile), projection, True, stats))
+        connection = get_connection(dsn)
+        try:
+            with connection, connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL)
+                cursor.copy_expert(COPY_SQL, source, size=COPY_BUFFER_BYTES)
+                cursor.execute(UPSERT_SQL)
+        except psycopg2.Error:
+            if source.error is not None:
+                raise source.error
+            raise
+
+    return stats
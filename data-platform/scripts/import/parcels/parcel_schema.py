@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Typed schema registry for Florida DOR parcel columns.
+
+Single source of truth for every column in the DOR NAL / Cadastral export:
+its source name in the CSV, the florida_parcels column it loads into, its
+SQL type and nullability. Cleaners and loaders resolve columns by header
+name through this module instead of carrying their own type tables or
+positional index maps.
+
+Two kinds of converters are provided per type:
+- cleaners (str -> str) used when rewriting CSV files, and
+- parsers (str -> int | Decimal | str | None) used when loading rows.
+
+Usage:
+    python parcel_schema.py columns             # florida_parcels load columns
+    python parcel_schema.py project INPUT.csv   # typed load CSV on stdout
+"""
+
+import argparse
+import csv
+import re
+import sys
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Values treated as NULL in numeric columns (compared after strip/upper)
+NULL_PUNCTUATION = {"", ".", "..", "..."}
+NULL_TOKENS = {"NULL", "NONE", "N/A", "NA", "NAN", "#N/A"}
+
+# Numbers that are already clean and can skip the full numeric cleaning
+_PLAIN_NUMBER = re.compile(r"-?[0-9]+(?:\.[0-9]+)?").fullmatch
+
+INTEGER_TYPES = {"integer", "bigint"}
+NUMERIC_TYPES = INTEGER_TYPES | {"numeric"}
+
+
+def _clean_numeric_slow(value):
+    """Full numeric cleaning for values that miss the fast paths."""
+    value = value.strip()
+    if value in NULL_PUNCTUATION or value.upper() in NULL_TOKENS:
+        return ""
+
+    # Remove thousands separators and turn (123) into -123
+    value = value.replace(",", "")
+    if value.startswith("(") and value.endswith(")"):
+        value = "-" + value[1:-1]
+
+    try:
+        float(value)
+        return value
+    except ValueError:
+        return ""
+
+
+def clean_numeric(value):
+    """Clean a numeric cell; NULL-like or invalid values become ""."""
+    if not value:
+        return ""
+    if (value.isdigit() and value.isascii()) or _PLAIN_NUMBER(value):
+        return value
+    return _clean_numeric_slow(value)
+
+
+def clean_text(value):
+    """Trim, collapse whitespace runs to one space and drop NUL bytes."""
+    if not value:
+        return ""
+    # str.split() matches strip() + re.sub(r"\s+", " ") without the regex
+    return " ".join(value.split()).replace("\x00", "")
+
+
+def clean_other(value):
+    """Trim whitespace in columns without a known type."""
+    return value.strip()
+
+
+def parse_numeric(value):
+    """Parse a numeric cell to a finite Decimal, or None."""
+    cleaned = clean_numeric(value)
+    if not cleaned:
+        return None
+    try:
+        number = Decimal(cleaned)
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def _integer_parser(bits):
+    """Build an integer parser bounded to a signed SQL integer type."""
+    low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+
+    def parse(value):
+        """Parse to int; None if empty, fractional or out of range."""
+        cleaned = clean_numeric(value)
+        if not cleaned:
+            return None
+        if cleaned.isdigit() or (cleaned[0] == "-" and cleaned[1:].isdigit()):
+            number = int(cleaned)
+        else:
+            decimal = parse_numeric(cleaned)
+            if decimal is None or decimal != decimal.to_integral_value():
+                return None
+            number = int(decimal)
+        return number if low <= number <= high else None
+
+    return parse
+
+
+parse_integer = _integer_parser(32)
+parse_bigint = _integer_parser(64)
+
+
+def parse_text(value):
+    """Parse a text cell to a cleaned string, or None if empty."""
+    return clean_text(value) or None
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Description of one DOR parcel column.
+
+    Attributes:
+        source: Column name as it appears in the DOR CSV header.
+        target: florida_parcels column it loads into, or None if the column
+            is only cleaned and never loaded.
+        sql_type: "integer", "bigint", "numeric" or "text".
+        nullable: Whether a row may be loaded with this column NULL.
+    """
+
+    source: str
+    target: Optional[str]
+    sql_type: str
+    nullable: bool = True
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.sql_type in NUMERIC_TYPES
+
+    @property
+    def cleaner(self) -> Callable[[str], str]:
+        return clean_numeric if self.is_numeric else clean_text
+
+    @property
+    def parser(self) -> Callable[[str], object]:
+        if self.sql_type == "integer":
+            return parse_integer
+        if self.sql_type == "bigint":
+            return parse_bigint
+        if self.sql_type == "numeric":
+            return parse_numeric
+        return parse_text
+
+
+def _column(source, sql_type="text", nullable=True):
+    return ColumnSpec(source, source.lower(), sql_type, nullable)
+
+
+# DOR NAL columns in file order; types follow the florida_parcels table
+DOR_COLUMNS: Tuple[ColumnSpec, ...] = (
+    _column("CO_NO", "integer", nullable=False),
+    _column("PARCEL_ID", nullable=False),
+    _column("FILE_T"),
+    _column("ASMNT_YR", "integer"),
+    _column("BAS_STRT"),
+    _column("ATV_STRT"),
+    _column("GRP_NO"),
+    _column("DOR_UC"),
+    _column("PA_UC"),
+    _column("SPASS_CD"),
+    _column("JV", "numeric"),
+    _column("JV_CHNG", "numeric"),
+    _column("JV_CHNG_CD", "integer"),
+    _column("AV_SD", "numeric"),
+    _column("AV_NSD", "numeric"),
+    _column("TV_SD", "numeric"),
+    _column("TV_NSD", "numeric"),
+    _column("JV_HMSTD", "numeric"),
+    _column("AV_HMSTD", "numeric"),
+    _column("JV_NON_HMS", "numeric"),
+    _column("AV_NON_HMS", "numeric"),
+    _column("JV_RESD_NO", "numeric"),
+    _column("AV_RESD_NO", "numeric"),
+    _column("JV_CLASS_U", "numeric"),
+    _column("AV_CLASS_U", "numeric"),
+    _column("JV_H2O_REC", "numeric"),
+    _column("AV_H2O_REC", "numeric"),
+    _column("JV_CONSRV_", "numeric"),
+    _column("AV_CONSRV_", "numeric"),
+    _column("JV_HIST_CO", "numeric"),
+    _column("AV_HIST_CO", "numeric"),
+    _column("JV_HIST_SI", "numeric"),
+    _column("AV_HIST_SI", "numeric"),
+    _column("JV_WRKNG_W", "numeric"),
+    _column("AV_WRKNG_W", "numeric"),
+    _column("NCONST_VAL", "numeric"),
+    _column("DEL_VAL", "numeric"),
+    _column("PAR_SPLT", "integer"),
+    _column("DISTR_CD"),
+    _column("DISTR_YR", "integer"),
+    _column("LND_VAL", "numeric"),
+    _column("LND_UNTS_C", "integer"),
+    _column("NO_LND_UNT", "numeric"),
+    _column("LND_SQFOOT", "numeric"),
+    _column("DT_LAST_IN", "integer"),
+    _column("IMP_QUAL"),
+    _column("CONST_CLAS"),
+    _column("EFF_YR_BLT", "integer"),
+    _column("ACT_YR_BLT", "integer"),
+    _column("TOT_LVG_AR", "numeric"),
+    _column("NO_BULDNG", "integer"),
+    _column("NO_RES_UNT", "integer"),
+    _column("SPEC_FEAT_", "numeric"),
+    _column("M_PAR_SAL1"),
+    _column("QUAL_CD1"),
+    _column("VI_CD1"),
+    _column("SALE_PRC1", "numeric"),
+    _column("SALE_YR1", "integer"),
+    _column("SALE_MO1"),
+    _column("OR_BOOK1"),
+    _column("OR_PAGE1"),
+    _column("CLERK_NO1"),
+    _column("S_CHNG_CD1"),
+    _column("M_PAR_SAL2"),
+    _column("QUAL_CD2"),
+    _column("VI_CD2"),
+    _column("SALE_PRC2", "numeric"),
+    _column("SALE_YR2", "integer"),
+    _column("SALE_MO2"),
+    _column("OR_BOOK2"),
+    _column("OR_PAGE2"),
+    _column("CLERK_NO2"),
+    _column("S_CHNG_CD2"),
+    _column("OWN_NAME"),
+    _column("OWN_ADDR1"),
+    _column("OWN_ADDR2"),
+    _column("OWN_CITY"),
+    _column("OWN_STATE"),
+    _column("OWN_ZIPCD"),
+    _column("OWN_STATE_"),
+    _column("FIDU_NAME"),
+    _column("FIDU_ADDR1"),
+    _column("FIDU_ADDR2"),
+    _column("FIDU_CITY"),
+    _column("FIDU_STATE"),
+    _column("FIDU_ZIPCD"),
+    _column("FIDU_CD"),
+    _column("S_LEGAL"),
+    _column("APP_STAT"),
+    _column("CO_APP_STA"),
+    _column("MKT_AR"),
+    _column("NBRHD_CD"),
+    _column("PUBLIC_LND"),
+    _column("TAX_AUTH_C"),
+    _column("TWN"),
+    _column("RNG"),
+    _column("SEC"),
+    _column("CENSUS_BK"),
+    _column("PHY_ADDR1"),
+    _column("PHY_ADDR2"),
+    _column("PHY_CITY"),
+    _column("PHY_ZIPCD"),
+    _column("ALT_KEY"),
+    _column("ASS_TRNSFR"),
+    _column("PREV_HMSTD", "integer"),
+    _column("ASS_DIF_TR", "numeric"),
+    _column("CONO_PRV_H", "integer"),
+    _column("PARCEL_ID_"),
+    _column("YR_VAL_TRN", "integer"),
+    _column("SEQ_NO", "integer"),
+    _column("RS_ID"),
+    _column("MP_ID"),
+    _column("STATE_PAR_"),
+    _column("SPC_CIR_CD"),
+    _column("SPC_CIR_YR", "integer"),
+    _column("SPC_CIR_TX"),
+)
+
+# Columns seen in some county and GIS exports but not in the NAL layout
+EXTRA_COLUMNS: Tuple[ColumnSpec, ...] = (
+    ColumnSpec("OBJECTID", None, "bigint"),
+    # NAL files have no improvement-value column, so imp_val is loaded only
+    # from exports that carry IMP_VAL and is NULL for NAL loads. The old
+    # index maps read it from NAL field 42, which is LND_UNTS_C (a land unit
+    # code), so the values they wrote were never improvement values. Where
+    # needed, derive it downstream (e.g. jv - lnd_val).
+    ColumnSpec("IMP_VAL", "imp_val", "numeric"),
+    ColumnSpec("LAND_VAL", None, "numeric"),
+    ColumnSpec("BLDG_VAL", None, "numeric"),
+    ColumnSpec("TOT_VAL", None, "numeric"),
+    ColumnSpec("LAND_SQFOOT", None, "numeric"),
+)
+
+COLUMNS_BY_SOURCE: Dict[str, ColumnSpec] = {
+    spec.source: spec for spec in DOR_COLUMNS + EXTRA_COLUMNS
+}
+COLUMNS_BY_TARGET: Dict[str, ColumnSpec] = {
+    spec.target: spec for spec in DOR_COLUMNS + EXTRA_COLUMNS if spec.target
+}
+
+# Source-name views used by the CSV cleaners
+NUMERIC_COLUMNS: Dict[str, str] = {
+    spec.source: spec.sql_type for spec in COLUMNS_BY_SOURCE.values() if spec.is_numeric
+}
+TEXT_COLUMNS = {
+    spec.source for spec in COLUMNS_BY_SOURCE.values() if not spec.is_numeric
+}
+
+# Columns the county import scripts load into florida_parcels
+LOAD_COLUMNS: Tuple[str, ...] = (
+    "co_no",
+    "parcel_id",
+    "file_t",
+    "asmnt_yr",
+    "bas_strt",
+    "atv_strt",
+    "grp_no",
+    "dor_uc",
+    "pa_uc",
+    "spass_cd",
+    "jv",
+    "jv_chng",
+    "jv_chng_cd",
+    "av_sd",
+    "av_nsd",
+    "tv_sd",
+    "tv_nsd",
+    "jv_hmstd",
+    "av_hmstd",
+    "jv_non_hms",
+    "lnd_val",
+    "imp_val",  # NULL for NAL files, see EXTRA_COLUMNS
+    "own_name",
+    "own_addr1",
+    "own_addr2",
+    "own_city",
+    "own_state",
+    "own_zipcd",
+    "phy_addr1",
+    "phy_addr2",
+    "phy_city",
+    "phy_zipcd",
+    "lnd_sqfoot",
+    "tot_lvg_ar",
+    "no_buldng",
+    "sale_prc1",
+    "sale_yr1",
+    "sale_mo1",
+    "or_book1",
+    "or_page1",
+    "clerk_no1",
+    "qual_cd1",
+    "sale_prc2",
+    "sale_yr2",
+    "sale_mo2",
+    "or_book2",
+    "or_page2",
+    "clerk_no2",
+    "qual_cd2",
+    "s_legal",
+    "twn",
+    "rng",
+    "sec",
+)
+
+
+def cleaner_for(source):
+    """Return the str -> str cleaner for a CSV header name."""
+    spec = COLUMNS_BY_SOURCE.get(source)
+    return spec.cleaner if spec else clean_other
+
+
+def compile_cleaning_plan(fieldnames):
+    """Build a per-file cleaning plan: column index -> cleaner function.
+
+    Column typing is resolved once per file instead of once per cell, so
+    the row loop is a plain zip over values and precompiled cleaners.
+    """
+    return [cleaner_for(column) for column in fieldnames]
+
+
+class RowProjection:
+    """Typed projection of DOR CSV records onto florida_parcels columns.
+
+    Header names are resolved to positions and parsers once per file, so
+    each record is converted exactly once into typed Python values.
+    """
+
+    def __init__(self, header: Sequence[str], targets: Sequence[str] = LOAD_COLUMNS):
+        positions = {name.strip().upper(): index for index, name in enumerate(header)}
+        self.targets = tuple(targets)
+        self._steps: List[Tuple[Optional[int], Callable[[str], object]]] = []
+        self._required: List[int] = []
+        self.missing_sources: List[str] = []
+
+        for slot, target in enumerate(self.targets):
+            spec = COLUMNS_BY_TARGET[target]
+            index = positions.get(spec.source)
+            if index is None:
+                self.missing_sources.append(spec.source)
+            self._steps.append((index, spec.parser))
+            if not spec.nullable:
+                self._required.append(slot)
+
+    def convert(self, record: Sequence[str]) -> Optional[tuple]:
+        """Convert one CSV record, or return None if a required value is missing."""
+        width = len(record)
+        values = tuple(
+            parse(record[index]) if index is not None and index < width else None
+            for index, parse in self._steps
+        )
+        for slot in self._required:
+            if values[slot] is None:
+                return None
+        return values
+
+
+def format_copy_value(value):
+    """Format a typed value for COPY ... (FORMAT csv); None becomes NULL."""
+    return "" if value is None else str(value)
+
+
+def sql_literal(value):
+    """Format a typed value as a SQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+# Upsert key of florida_parcels
+KEY_COLUMNS = ("co_no", "parcel_id")
+
+
+def iter_load_rows(reader, projection, dedupe=True, stats=None):
+    """Yield typed load rows for the csv records in reader.
+
+    Rows missing a required value are dropped, and with dedupe only the
+    first row per (co_no, parcel_id) is kept.
+
+    Args:
+        reader: csv.reader positioned after the header.
+        projection: RowProjection built from that header.
+        dedupe: Drop repeated (co_no, parcel_id) keys.
+        stats: Optional dict; "rows" and "skipped" counters are updated.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("rows", 0)
+    stats.setdefault("skipped", 0)
+
+    key_slots = [
+        projection.targets.index(name)
+        for name in KEY_COLUMNS
+        if name in projection.targets
+    ]
+    seen = set()
+
+    for record in reader:
+        if not record:
+            continue
+        values = projection.convert(record)
+        if values is None:
+            stats["skipped"] += 1
+            continue
+        if dedupe and key_slots:
+            key = tuple(values[slot] for slot in key_slots)
+            if key in seen:
+                stats["skipped"] += 1
+                continue
+            seen.add(key)
+        stats["rows"] += 1
+        yield values
+
+
+def project_csv(infile, outfile, targets=LOAD_COLUMNS, dedupe=True):
+    """Write a typed load CSV for targets from a DOR CSV.
+
+    Returns:
+        Tuple of (rows_written, rows_skipped).
+    """
+    reader = csv.reader(infile)
+    projection = RowProjection(next(reader), targets)
+    writer = csv.writer(outfile)
+    writer.writerow(projection.targets)
+
+    stats = {}
+    for values in iter_load_rows(reader, projection, dedupe, stats):
+        writer.writerow([format_copy_value(value) for value in values])
+
+    return stats["rows"], stats["skipped"]
+
+
+def main():
+    """Print load columns or project a DOR CSV to typed load columns."""
+    parser = argparse.ArgumentParser(description="Florida DOR parcel column schema")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("columns", help="Print the florida_parcels load columns")
+    project = subparsers.add_parser(
+        "project", help="Write a typed, deduplicated load CSV to stdout"
+    )
+    project.add_argument("input_file", help="DOR parcels CSV")
+    project.add_argument(
+        "--encoding", default="utf-8", help="Input encoding (default: utf-8)"
+    )
+    args = parser.parse_args()
+
+    if args.command == "columns":
+        print(",".join(LOAD_COLUMNS))
+        return
+
+    with open(args.input_file, "r", newline="", encoding=args.encoding) as infile:
+        written, skipped = project_csv(infile, sys.stdout)
+    print(f"✅ {written:,} rows written, {skipped:,} skipped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Conformance tests for the vectorized (arrow) cleaning engine.
+
+Random parcels CSVs, seeded for reproducibility, are cleaned with both
+engines and the outputs must be byte-identical, with identical cleaned-cell
+counts.
+
+Run with: python -m pytest data-platform/scripts/import/parcels
+"""
+
+import csv
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import clean_parcels_vectorized as vectorized  # noqa: E402
+from clean_all_parcels_csv import CSVCleaner  # noqa: E402
+
+# Numeric, text and pass-through columns, including every expected header
+FIELDNAMES = [
+    "CO_NO",
+    "PARCEL_ID",
+    "JV",
+    "LND_SQFOOT",
+    "OWN_NAME",
+    "PHY_ADDR1",
+    "SALE_PRC1",
+    "DOR_UC",
+    "REMARKS",
+]
+
+NULL_CELLS = [
+    "",
+    ".",
+    "..",
+    "...",
+    "NULL",
+    "null",
+    "None",
+    "N/A",
+    "n/a",
+    "NA",
+    "NaN",
+    "#N/A",
+    "  NULL  ",
+    "\tN/A",
+    "NULL\n",
+]
+
+NUMBER_CELLS = [
+    "0",
+    "42",
+    "-17",
+    "3.50",
+    "-0.25",
+    "1,234",
+    "1,234,567.89",
+    "(1,234)",
+    "(12.5)",
+    "( 99 )",
+    "-(5)",
+    "  7  ",
+    "\t1,000\n",
+    "1,2,3",
+    "12-34",
+    "1e5",
+    "+8",
+    "$100",
+    "\u0661\u0662\u0663",  # Arabic-Indic digits
+    "1\x00",
+    " 12",
+    "12 ",
+]
+
+TEXT_CELLS = [
+    "SMITH JOHN",
+    "  padded  ",
+    "double  space",
+    "tab\tseparated",
+    "line\nbreak",
+    "crlf\r\nbreak",
+    'say "hello"',
+    '"quoted"',
+    "comma, inside",
+    "vertical\x0btab",
+    "form\x0cfeed",
+    "nbsp\xa0here",
+    "em\u2003space",
+    "ideographic\u3000space",
+    "nul\x00byte",
+    "caf\xe9",
+    "(parens)",
+    "-dash-",
+    "O'BRIEN",
+    '"',
+    ",",
+]
+
+
+def random_cell(rng):
+    pool = rng.choice([NULL_CELLS, NUMBER_CELLS, TEXT_CELLS])
+    cell = rng.choice(pool)
+    if rng.random() < 0.2:
+        # Odd whitespace around any value
+        cell = rng.choice([" ", "\t", "  ", "\r\n", "\x0b"]) + cell
+    if rng.random() < 0.2:
+        cell = cell + rng.choice([" ", "\t", "\n", "   "])
+    return cell
+
+
+def write_csv(path, rows, fieldnames=FIELDNAMES):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+
+
+def clean(path, engine, tmp_path, monkeypatch):
+    """Clean path with one engine; returns (bytes, stats, used_arrow)."""
+    used_arrow = []
+    original = CSVCleaner.clean_file_arrow
+
+    def spy(self, *args):
+        result = original(self, *args)
+        used_arrow.append(result is not None)
+        return result
+
+    monkeypatch.setattr(CSVCleaner, "clean_file_arrow", spy)
+    output_file = tmp_path / f"{path.stem}.{engine}.csv"
+    cleaner = CSVCleaner(verbose=False, engine=engine)
+    assert cleaner.clean_csv_file(path, output_file)
+    return output_file.read_bytes(), cleaner.stats, any(used_arrow)
+
+
+def assert_conforms(path, tmp_path, monkeypatch, expect_arrow=True):
+    python_bytes, python_stats, _ = clean(path, "python", tmp_path, monkeypatch)
+    arrow_bytes, arrow_stats, used_arrow = clean(path, "arrow", tmp_path, monkeypatch)
+    assert used_arrow == expect_arrow
+    assert arrow_bytes == python_bytes
+    assert arrow_stats["total_rows"] == python_stats["total_rows"]
+    assert arrow_stats["cells_cleaned"] == python_stats["cells_cleaned"]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fuzzed_files_match_python_engine(seed, tmp_path, monkeypatch):
+    rng = random.Random(seed)
+    rows = [[random_cell(rng) for _ in FIELDNAMES] for _ in range(rng.randint(1, 400))]
+    path = tmp_path / f"fuzz-{seed}.csv"
+    write_csv(path, rows)
+    assert_conforms(path, tmp_path, monkeypatch)
+
+
+@pytest.mark.parametrize(
+    "pool", [NULL_CELLS, NUMBER_CELLS, TEXT_CELLS], ids=["null", "number", "text"]
+)
+def test_every_cell_kind_in_every_column(pool, tmp_path, monkeypatch):
+    # Each edge case once in every column, so each kernel sees all of them
+    rows = [[cell] * len(FIELDNAMES) for cell in pool]
+    path = tmp_path / "cells.csv"
+    write_csv(path, rows)
+    assert_conforms(path, tmp_path, monkeypatch)
+
+
+def test_short_rows_fall_back_to_python_engine(tmp_path, monkeypatch):
+    rng = random.Random(1)
+    rows = [[random_cell(rng) for _ in FIELDNAMES] for _ in range(50)]
+    rows[10] = rows[10][:3]
+    rows[20] = ["(1,000)"]
+    path = tmp_path / "ragged.csv"
+    write_csv(path, rows)
+
+    with open(tmp_path / "out.csv", "wb") as outfile:
+        with pytest.raises(vectorized.UnsupportedInput):
+            vectorized.clean_records_arrow(path, outfile, FIELDNAMES, "utf-8")
+    # Both engines pad short rows with empty values
+    assert_conforms(path, tmp_path, monkeypatch, expect_arrow=False)
+
+
+@pytest.mark.parametrize("engine", ["python", "arrow"])
+def test_long_rows_are_rejected_by_both_engines(engine, tmp_path):
+    rng = random.Random(2)
+    rows = [[random_cell(rng) for _ in FIELDNAMES] for _ in range(20)]
+    rows[5] = rows[5] + ["extra"]
+    path = tmp_path / "long.csv"
+    write_csv(path, rows)
+    cleaner = CSVCleaner(verbose=False, engine=engine)
+    assert not cleaner.clean_csv_file(path, tmp_path / f"long.{engine}.csv")
+    assert cleaner.stats["errors"] == 1
+
+
+def test_check_conformance_reports_match(tmp_path):
+    rng = random.Random(7)
+    path = tmp_path / "check.csv"
+    write_csv(path, [[random_cell(rng) for _ in FIELDNAMES] for _ in range(100)])
+    assert vectorized.check_conformance(path)
@@ -26,6 +26,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Redis stream the cache warmer (claimguardian-florida/scripts/warm-cache.py
+# --follow-changes) reads to invalidate cached risk scores
+CACHE_CHANGE_STREAM = "cache:parcel-changes"
+CACHE_CHANGE_STREAM_MAXLEN = 100000
+
 
 class GeospatialETLPipeline:
     """Manages ETL operations for geospatial data"""
@@ -46,11 +51,38 @@ class GeospatialETLPipeline:
             "user": parsed.username,
             "password": parsed.password,
         }
+        self.redis_url = os.getenv("REDIS_URL")
+        self._redis = None
 
     def get_db_connection(self):
         """Get a new database connection"""
         return psycopg2.connect(**self.db_config)
 
+    def publish_cache_changes(self, parcel_ids: List[str], scope: str = "risk"):
+        """Publish changed parcel IDs for cache invalidation (needs REDIS_URL)"""
+        if not self.redis_url or not parcel_ids:
+            return
+
+        try:
+            if self._redis is None:
+                import redis
+
+                self._redis = redis.Redis.from_url(self.redis_url)
+            changes = [
+                {"parcel_id": parcel_id, "scope": scope} for parcel_id in parcel_ids
+            ]
+            self._redis.xadd(
+                CACHE_CHANGE_STREAM,
+                {"changes": json.dumps(changes)},
+                maxlen=CACHE_CHANGE_STREAM_MAXLEN,
+                approximate=True,
+            )
+        except Exception as e:
+            # Stale cache entries expire by TTL; never fail the pipeline over this
+            logger.warning(
+                f"Failed to publish {len(parcel_ids)} cache changes: {str(e)}"
+            )
+
     def calculate_parcel_risk_assessments(self, batch_size: int = 1000):
         """Calculate risk assessments for all parcels"""
         logger.info("Starting parcel risk assessment calculation...")
@@ -79,6 +111,7 @@ class GeospatialETLPipeline:
                     )
 
                     parcels = cur.fetchall()
+                    changed = []
 
                     # Calculate risk for each parcel
                     for parcel in parcels:
@@ -126,6 +159,7 @@ class GeospatialETLPipeline:
                             )
 
                             processed += 1
+                            changed.append(parcel["parcel_id"])
 
                         except Exception as e:
                             logger.error(
@@ -133,6 +167,7 @@ class GeospatialETLPipeline:
                             )
 
                     conn.commit()
+                    self.publish_cache_changes(changed)
                     offset += batch_size
 
                     logger.info(
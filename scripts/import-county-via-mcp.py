@@ -8,32 +8,13 @@ import csv
 import sys
 import subprocess
 import json
+from pathlib import Path
 
-
-def clean_value(value, is_numeric=False):
-    """Clean a value for SQL insertion"""
-    # Remove leading/trailing spaces
-    value = value.strip()
-
-    # Handle empty values
-    if not value or value == " " or value == "  ":
-        return "NULL"
-
-    # For numeric fields, ensure it's a valid number
-    if is_numeric:
-        try:
-            # Try to parse as number
-            if "." in value:
-                float(value)
-            else:
-                int(value)
-            return value
-        except:
-            return "0"  # Default numeric value
-
-    # For string fields, escape quotes and wrap in quotes
-    value = value.replace("'", "''")
-    return f"'{value}'"
+PARCELS_DIR = (
+    Path(__file__).resolve().parent.parent / "data-platform/scripts/import/parcels"
+)
+sys.path.insert(0, str(PARCELS_DIR))
+from parcel_schema import LOAD_COLUMNS, RowProjection, sql_literal  # noqa: E402
 
 
 def process_county(county_code, county_name):
@@ -64,94 +45,35 @@ def process_county(county_code, county_name):
     # Step 2: Process CSV and generate SQL
     print("Processing CSV data...")
 
-    # Define column mappings (column index -> field name, is_numeric)
-    columns = [
-        (1, "co_no", True),
-        (2, "parcel_id", False),
-        (3, "file_t", False),
-        (4, "asmnt_yr", True),
-        (5, "bas_strt", False),
-        (6, "atv_strt", False),
-        (7, "grp_no", False),
-        (8, "dor_uc", False),
-        (9, "pa_uc", False),
-        (10, "spass_cd", False),
-        (11, "jv", True),
-        (12, "jv_chng", True),
-        (13, "jv_chng_cd", True),
-        (14, "av_sd", True),
-        (15, "av_nsd", True),
-        (16, "tv_sd", True),
-        (17, "tv_nsd", True),
-        (18, "jv_hmstd", True),
-        (19, "av_hmstd", True),
-        (20, "jv_non_hms", True),
-        (41, "lnd_val", True),
-        (42, "imp_val", True),
-        (74, "own_name", False),
-        (75, "own_addr1", False),
-        (76, "own_addr2", False),
-        (77, "own_city", False),
-        (78, "own_state", False),
-        (79, "own_zipcd", False),
-        (99, "phy_addr1", False),
-        (100, "phy_addr2", False),
-        (101, "phy_city", False),
-        (102, "phy_zipcd", False),
-        (52, "lnd_sqfoot", True),
-        (49, "tot_lvg_ar", True),
-        (53, "no_buldng", True),
-        (57, "sale_prc1", True),
-        (58, "sale_yr1", True),
-        (59, "sale_mo1", True),
-        (60, "or_book1", False),
-        (61, "or_page1", False),
-        (62, "clerk_no1", False),
-        (55, "qual_cd1", False),
-        (67, "sale_prc2", True),
-        (68, "sale_yr2", True),
-        (69, "sale_mo2", True),
-        (70, "or_book2", False),
-        (71, "or_page2", False),
-        (72, "clerk_no2", False),
-        (65, "qual_cd2", False),
-        (87, "s_legal", False),
-        (88, "twn", False),
-        (89, "rng", False),
-        (90, "sec", False),
-    ]
-
     # Read CSV and process in batches
     batch_size = 500
     batch = []
     total_processed = 0
     duplicates = set()
+    column_list = ", ".join(LOAD_COLUMNS)
 
     with open(csv_file, "r", encoding="utf-8", errors="ignore") as f:
         reader = csv.reader(f)
-        next(reader)  # Skip header
+        # Columns are resolved by header name, not by position
+        projection = RowProjection(next(reader))
+        if projection.missing_sources:
+            print(f"Missing columns: {', '.join(projection.missing_sources)}")
 
         for row in reader:
+            values = projection.convert(row)
+            if values is None:
+                continue
+
             # Skip if duplicate parcel_id
-            parcel_id = row[1] if len(row) > 1 else ""
+            parcel_id = values[1]
             if parcel_id in duplicates:
                 continue
             duplicates.add(parcel_id)
 
-            # Build values for this row
-            values = []
-            for idx, field_name, is_numeric in columns:
-                if idx <= len(row):
-                    value = row[idx - 1] if idx <= len(row) else ""
-                    values.append(clean_value(value, is_numeric))
-                else:
-                    values.append("NULL")
-
             # Create INSERT statement
-            column_names = [col[1] for col in columns]
             sql = f"""
-            INSERT INTO florida_parcels ({', '.join(column_names)})
-            VALUES ({', '.join(values)})
+            INSERT INTO florida_parcels ({column_list})
+            VALUES ({', '.join(sql_literal(value) for value in values)})
             ON CONFLICT (co_no, parcel_id) DO NOTHING;
             """
 
@@ -12,6 +12,13 @@ import psycopg2
 from datetime import datetime
 import signal
 import sys
+from pathlib import Path
+
+PARCELS_DIR = (
+    Path(__file__).resolve().parent.parent / "data-platform/scripts/import/parcels"
+)
+sys.path.insert(0, str(PARCELS_DIR))
+from parcel_schema import LOAD_COLUMNS, project_csv  # noqa: E402
 
 # Configuration
 DB_CONFIG = {
@@ -148,25 +155,10 @@ def import_county(county_code, county_name):
         # Create clean CSV with proper columns (similar to Charlotte process)
         clean_csv = f"{WORK_DIR}/county_{county_code}_clean.csv"
 
-        # Use awk to extract columns
-        awk_cmd = f"""awk -F',' '
-        NR==1 {{
-            print "co_no,parcel_id,file_t,asmnt_yr,bas_strt,atv_strt,grp_no,dor_uc,pa_uc,spass_cd,jv,jv_chng,jv_chng_cd,av_sd,av_nsd,tv_sd,tv_nsd,jv_hmstd,av_hmstd,jv_non_hms,lnd_val,imp_val,own_name,own_addr1,own_addr2,own_city,own_state,own_zipcd,phy_addr1,phy_addr2,phy_city,phy_zipcd,lnd_sqfoot,tot_lvg_ar,no_buldng,sale_prc1,sale_yr1,sale_mo1,or_book1,or_page1,clerk_no1,qual_cd1,sale_prc2,sale_yr2,sale_mo2,or_book2,or_page2,clerk_no2,qual_cd2,s_legal,twn,rng,sec"
-        }}
-        NR>1 {{
-            printf "%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s\\n",
-                $1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15,$16,$17,$18,$19,$20,
-                $41,$42,$74,$75,$76,$77,$78,$79,$99,$100,$101,$102,$52,$49,$53,
-                $57,$58,$59,$60,$61,$62,$55,$67,$68,$69,$70,$71,$72,$65,$87,$88,$89,$90
-        }}' {csv_file} > {clean_csv}"""
-
-        subprocess.run(awk_cmd, shell=True)
-
-        # Remove duplicates
-        unique_csv = f"{WORK_DIR}/county_{county_code}_unique.csv"
-        subprocess.run(
-            f"awk -F',' 'NR==1 || !seen[$2]++' {clean_csv} > {unique_csv}", shell=True
-        )
+        # Project to typed load columns by header name, dropping duplicates
+        with open(csv_file, "r", newline="", encoding="utf-8", errors="ignore") as src:
+            with open(clean_csv, "w", newline="", encoding="utf-8") as dst:
+                project_csv(src, dst)
 
         # Import via psql
         progress[county_code] = {"status": "importing"}
@@ -182,13 +174,14 @@ def import_county(county_code, county_name):
             "-d",
             DB_CONFIG["database"],
             "-c",
-            f"\\COPY florida_parcels(co_no,parcel_id,file_t,asmnt_yr,bas_strt,atv_strt,grp_no,dor_uc,pa_uc,spass_cd,jv,jv_chng,jv_chng_cd,av_sd,av_nsd,tv_sd,tv_nsd,jv_hmstd,av_hmstd,jv_non_hms,lnd_val,imp_val,own_name,own_addr1,own_addr2,own_city,own_state,own_zipcd,phy_addr1,phy_addr2,phy_city,phy_zipcd,lnd_sqfoot,tot_lvg_ar,no_buldng,sale_prc1,sale_yr1,sale_mo1,or_book1,or_page1,clerk_no1,qual_cd1,sale_prc2,sale_yr2,sale_mo2,or_book2,or_page2,clerk_no2,qual_cd2,s_legal,twn,rng,sec) FROM '{unique_csv}' WITH (FORMAT csv, HEADER true);",
+            f"\\COPY florida_parcels({','.join(LOAD_COLUMNS)}) "
+            f"FROM '{clean_csv}' WITH (FORMAT csv, HEADER true);",
         ]
 
         result = subprocess.run(copy_cmd, capture_output=True, text=True)
 
         # Clean up
-        for f in [csv_file, clean_csv, unique_csv]:
+        for f in [csv_file, clean_csv]:
             if os.path.exists(f):
                 os.remove(f)
 
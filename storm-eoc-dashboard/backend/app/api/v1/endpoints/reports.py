@@ -1,13 +1,18 @@
 # backend/app/api/v1/endpoints/reports.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, cast, and_, insert, tuple_, literal_column, JSON, Text
 from geoalchemy2 import WKTElement
 from datetime import datetime, timedelta
+from typing import List, Optional
+from collections import defaultdict
+import base64
 import json
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, SessionLocalAsync
 from app.models.reports import CommunityReport
 from app.schemas.reports import CommunityReportCreate, CommunityReportGeoJSON, CommunityReportProperties
 from app.ws.manager import manager
@@ -50,32 +55,179 @@ async def create_community_report(
 
     return report_geojson
 
-@router.get("/", response_model=list[CommunityReportGeoJSON])
+@router.post("/batch", response_model=List[CommunityReportGeoJSON])
+async def create_community_reports_batch(
+    reports_in: List[CommunityReportCreate], db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many community reports at once (field apps uploading an offline queue).
+
+    All reports are written by one multi-row INSERT ... RETURNING in a single
+    transaction, and announced to WebSocket clients as one FeatureCollection.
+    """
+    if len(reports_in) > settings.REPORT_BATCH_MAX:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.REPORT_BATCH_MAX} reports per batch"
+        )
+    if not reports_in:
+        return []
+
+    received = datetime.utcnow()
+    rows = [
+        {
+            "report_type": report_in.report_type,
+            "description": report_in.description,
+            "location": WKTElement(
+                f"POINT({report_in.location.longitude} {report_in.location.latitude})", srid=4326
+            ),
+            "image_url": report_in.image_url,
+            "report_timestamp": received,
+            "verified": False,
+            "status": "Submitted",
+        }
+        for report_in in reports_in
+    ]
+    result = await db.execute(
+        insert(CommunityReport).values(rows).returning(
+            CommunityReport.id, CommunityReport.report_type, CommunityReport.description,
+            CommunityReport.image_url, CommunityReport.report_timestamp,
+            CommunityReport.verified, CommunityReport.status,
+            func.ST_X(CommunityReport.location).label("longitude"),
+            func.ST_Y(CommunityReport.location).label("latitude"),
+        )
+    )
+    # RETURNING order is not guaranteed: match rows back to inputs by content
+    # (identical reports are interchangeable)
+    returned = defaultdict(list)
+    for row in result.all():
+        returned[(row.report_type, row.description, row.image_url, row.longitude, row.latitude)].append(row)
+    inserted = [
+        returned[(
+            report_in.report_type, report_in.description, report_in.image_url,
+            report_in.location.longitude, report_in.location.latitude,
+        )].pop()
+        for report_in in reports_in
+    ]
+    await db.commit()
+
+    features = [
+        CommunityReportGeoJSON(
+            geometry={"type": "Point", "coordinates": [row.longitude, row.latitude]},
+            properties=CommunityReportProperties.from_orm(row),
+        )
+        for row in inserted
+    ]
+
+    # One broadcast for the whole batch instead of one per report
+    collection = {"type": "FeatureCollection", "features": [feature.dict() for feature in features]}
+    await manager.broadcast(json.dumps(collection, default=str))
+
+    return features
+
+# Largest page a client may request; each page is one indexed range scan
+MAX_PAGE_SIZE = 10000
+
+# Features written per chunk of the streamed response
+STREAM_CHUNK_FEATURES = 500
+
+def encode_cursor(report_timestamp: datetime, report_id: int) -> str:
+    """Opaque keyset cursor for the report after which the next page starts."""
+    raw = json.dumps([report_timestamp.isoformat(), report_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        report_timestamp, report_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(report_timestamp), int(report_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def json_object(**fields):
+    """json_build_object with literal keys (bound keys have no type for the driver)."""
+    args = []
+    for key, value in fields.items():
+        args += [literal_column(f"'{key}'"), value]
+    return func.json_build_object(*args)
+
+def parse_bbox(bbox: str):
+    try:
+        west, south, east, north = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    if not (west <= east and south <= north):
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    return west, south, east, north
+
+@router.get("/", response_class=StreamingResponse)
 async def read_community_reports(
-    db: AsyncSession = Depends(get_db), 
-    hours: int = 24 # Default to last 24 hours
+    hours: int = 24, # Default to last 24 hours
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bbox: Optional[str] = Query(None, description="west,south,east,north in degrees"),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ):
     """
-    Retrieve community reports as GeoJSON Features within a time window.
+    Retrieve community reports as a GeoJSON FeatureCollection, newest first.
+
+    Filters by time window (start/end, or the last `hours`) and bbox, and pages
+    with a keyset cursor on (report_timestamp, id): pass the returned
+    `next_cursor` to get the next page (null on the last page). Each Feature is
+    built in SQL and streamed as it is read, with no per-row Python models.
     """
-    time_filter = datetime.utcnow() - timedelta(hours=hours)
+    if start is None:
+        start = datetime.utcnow() - timedelta(hours=hours)
+    conditions = [CommunityReport.report_timestamp >= start]
+    if end is not None:
+        conditions.append(CommunityReport.report_timestamp < end)
+    if bbox:
+        # && on the GiST index of location
+        conditions.append(CommunityReport.location.op("&&")(func.ST_MakeEnvelope(*parse_bbox(bbox), 4326)))
+    if cursor:
+        # Row comparison matches the (report_timestamp, id) index order
+        conditions.append(tuple_(CommunityReport.report_timestamp, CommunityReport.id) < tuple_(*decode_cursor(cursor)))
 
-    # Use ST_AsGeoJSON to get the geometry directly from the database
+    feature = json_object(
+        type=literal_column("'Feature'"),
+        geometry=cast(func.ST_AsGeoJSON(CommunityReport.location), JSON),
+        properties=json_object(
+            id=CommunityReport.id,
+            report_type=CommunityReport.report_type,
+            description=CommunityReport.description,
+            report_timestamp=CommunityReport.report_timestamp,
+            verified=CommunityReport.verified,
+            status=CommunityReport.status,
+            image_url=CommunityReport.image_url,
+        ),
+    )
     query = select(
-        CommunityReport,
-        func.ST_AsGeoJSON(CommunityReport.location).label("geojson_geometry")
-    ).where(CommunityReport.report_timestamp >= time_filter
-    ).order_by(desc(CommunityReport.report_timestamp))
-    
-    result = await db.execute(query)
-    rows = result.all()
-
-    # Construct GeoJSON features
-    features = []
-    for report, geojson_geom_str in rows:
-        properties = CommunityReportProperties.from_orm(report)
-        geometry = json.loads(geojson_geom_str)
-        feature = CommunityReportGeoJSON(geometry=geometry, properties=properties)
-        features.append(feature)
-        
-    return features
+        cast(feature, Text), CommunityReport.report_timestamp, CommunityReport.id
+    ).where(and_(*conditions)).order_by(
+        desc(CommunityReport.report_timestamp), desc(CommunityReport.id)
+    ).limit(limit + 1) # One extra row tells us whether another page exists
+
+    return StreamingResponse(stream_feature_collection(query, limit), media_type="application/geo+json")
+
+async def stream_feature_collection(query, limit: int):
+    """Stream a FeatureCollection from rows of (feature JSON, timestamp, id)."""
+    # Own session: the response outlives the request's dependencies
+    async with SessionLocalAsync() as db:
+        result = await db.stream(query)
+        yield '{"type":"FeatureCollection","features":['
+        chunk, count, last, more = [], 0, None, False
+        async for feature_json, report_timestamp, report_id in result:
+            if count == limit:
+                more = True
+                break
+            chunk.append(feature_json)
+            count += 1
+            last = (report_timestamp, report_id)
+            if len(chunk) == STREAM_CHUNK_FEATURES:
+                yield ("," if count > len(chunk) else "") + ",".join(chunk)
+                chunk = []
+        if chunk:
+            yield ("," if count > len(chunk) else "") + ",".join(chunk)
+        await result.close()
+
+    next_cursor = encode_cursor(*last) if more else None
+    yield '],"next_cursor":' + json.dumps(next_cursor) + "}"
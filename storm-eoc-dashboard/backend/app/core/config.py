@@ -24,6 +24,25 @@ class Settings(BaseSettings):
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
     CELERY_BROKER_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
     CELERY_RESULT_BACKEND: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
+    REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
+
+    # WebSocket fan-out: per-client send queue length, seconds a single send
+    # may take, and what to do with clients whose queue is full
+    # ("drop" oldest message or "disconnect")
+    WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", 100))
+    WS_SEND_TIMEOUT: float = float(os.getenv("WS_SEND_TIMEOUT", 10))
+    WS_SLOW_CLIENT_POLICY: str = os.getenv("WS_SLOW_CLIENT_POLICY", "drop")
+    # "redis" relays broadcasts between uvicorn workers and from Celery tasks
+    # over pub/sub; "local" only reaches clients of the publishing process
+    WS_BROADCAST_BACKEND: str = os.getenv("WS_BROADCAST_BACKEND", "redis")
+    WS_BROADCAST_CHANNEL: str = os.getenv("WS_BROADCAST_CHANNEL", "eoc:broadcast")
+    # Grid cell size (degrees) for routing by subscription bbox; bboxes spanning
+    # more cells than WS_GRID_MAX_CELLS are checked against every located message
+    WS_GRID_CELL_DEG: float = float(os.getenv("WS_GRID_CELL_DEG", 0.5))
+    WS_GRID_MAX_CELLS: int = int(os.getenv("WS_GRID_MAX_CELLS", 1024))
+
+    # Most community reports accepted by one POST /reports/batch request
+    REPORT_BATCH_MAX: int = int(os.getenv("REPORT_BATCH_MAX", 1000))
 
     # External API Keys
     X_BEARER_TOKEN: str = os.getenv("X_BEARER_TOKEN")
@@ -11,6 +11,7 @@ from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from app.core.config import settings
 from app.models.social_media import XPost
 from app.db.session import SessionLocalSync
+from app.ws.broadcast import publish_sync
 from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
@@ -216,6 +217,13 @@ def extract_geolocation(tweet, includes):
 
     return geo_location, geo_source
 
+def point_geometry(geo_location):
+    """GeoJSON geometry for a "POINT(lon lat)" WKT string, or None."""
+    if not geo_location:
+        return None
+    lon, lat = (float(value) for value in geo_location[geo_location.index("(") + 1:-1].split())
+    return {"type": "Point", "coordinates": [lon, lat]}
+
 def save_x_post(tweet, author_username, geo_location, geo_source, relevancy_score, sentiment, sentiment_score, keywords, hashtags):
     """Save the processed X post to the database using synchronous session."""
     
@@ -239,6 +247,20 @@ def save_x_post(tweet, author_username, geo_location, geo_source, relevancy_scor
         )
         db.add(db_post)
         db.commit()
+        # Push the post to connected EOC screens on every API worker
+        publish_sync(json.dumps({
+            "type": "Feature",
+            "geometry": point_geometry(geo_location),
+            "properties": {
+                "feed_type": "x_post",
+                "post_id": db_post.post_id,
+                "author_username": author_username,
+                "content": db_post.content,
+                "post_timestamp": db_post.post_timestamp.isoformat(),
+                "relevancy_score": relevancy_score,
+                "sentiment": sentiment,
+            },
+        }))
     except IntegrityError:
         # Handle duplicate post_id (if stream reconnects and sends duplicate data)
         db.rollback()
@@ -25,20 +25,33 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def start_broadcasts():
+    await manager.start()
+
+@app.on_event("shutdown")
+async def stop_broadcasts():
+    await manager.stop()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
     await manager.connect(websocket)
     try:
         while True:
-            # Keep the connection alive, handle incoming messages if needed (e.g., client-side filters)
-            await websocket.receive_text() 
+            # Clients may send subscription filters (see app/schemas/subscriptions.py)
+            manager.handle_message(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         manager.disconnect(websocket)
 
+@app.get("/ws/metrics")
+async def websocket_metrics():
+    """WebSocket fan-out counters for the worker serving this request."""
+    return manager.metrics()
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
@@ -1,16 +1,22 @@
 # backend/app/models/reports.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from geoalchemy2 import Geometry
 from app.models.base import Base
 
 class CommunityReport(Base):
     __tablename__ = "community_reports"
+    # Created on existing databases by
+    # database/migrations/001_community_reports_indexes.sql
+    __table_args__ = (
+        # Keyset pagination (newest first) and time-window scans
+        Index("ix_community_reports_timestamp_id", "report_timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     report_type = Column(String(100), nullable=False)
     description = Column(Text)
     report_timestamp = Column(DateTime(timezone=True), nullable=False)
-    location = Column(Geometry("POINT", srid=4326), nullable=False)
+    location = Column(Geometry("POINT", srid=4326), nullable=False)  # GiST-indexed (spatial_index) for bbox queries
     image_url = Column(String(255))
     verified = Column(Boolean, default=False)
     status = Column(String(50), default="Submitted")
@@ -0,0 +1,27 @@
+# backend/app/schemas/subscriptions.py
+from pydantic import BaseModel, validator
+from typing import Optional, List
+
+
+# WebSocket subscription filter sent by clients:
+# {"action": "subscribe", "bbox": [west, south, east, north],
+#  "report_types": [...], "min_relevancy": 0.5}
+# {"action": "unsubscribe"} clears the filter (receive everything).
+# With report_types or min_relevancy set, only the message kinds those name
+# (community reports, social posts) are received.
+class SubscriptionFilter(BaseModel):
+    bbox: Optional[List[float]] = None
+    report_types: Optional[List[str]] = None  # community report types to receive
+    # Lowest relevancy_score of social posts to receive
+    min_relevancy: Optional[float] = None
+
+    @validator("bbox")
+    def check_bbox(cls, bbox):
+        if bbox is None:
+            return bbox
+        if len(bbox) != 4:
+            raise ValueError("bbox must be [west, south, east, north]")
+        west, south, east, north = bbox
+        if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+            raise ValueError("bbox must be [west, south, east, north] in degrees")
+        return bbox
@@ -0,0 +1,142 @@
+# backend/app/ws/broadcast.py
+# Broadcast backends: how a message reaches every API worker's local WebSocket clients.
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str], Awaitable[None]]
+
+# Seconds to wait before resubscribing after a lost Redis connection
+RESUBSCRIBE_DELAY = 1.0
+
+
+class BroadcastBackend:
+    """Delivers published messages to `deliver` (local fan-out) in every worker."""
+
+    async def start(self, deliver: Deliver):
+        self.deliver = deliver
+
+    async def stop(self):
+        pass
+
+    async def publish(self, message: str):
+        raise NotImplementedError
+
+
+class LocalBroadcastBackend(BroadcastBackend):
+    """Single-process delivery: publish goes straight to this worker's clients."""
+
+    async def publish(self, message: str):
+        await self.deliver(message)
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """Redis pub/sub delivery across uvicorn workers and Celery tasks.
+
+    Every worker subscribes to one channel and relays what it receives to its
+    local sockets; publishing (from any worker or process) is a single PUBLISH,
+    including for the publishing worker's own clients.
+    """
+
+    def __init__(self, redis_url: str, channel: str):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.redis = None
+        self.listener: Optional[asyncio.Task] = None
+        self.received = 0
+
+    async def start(self, deliver: Deliver):
+        import redis.asyncio as redis
+
+        await super().start(deliver)
+        self.redis = redis.from_url(self.redis_url)
+        # Subscribe before returning so nothing published after startup is missed
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self.listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self):
+        if self.listener is not None:
+            self.listener.cancel()
+            try:
+                await self.listener
+            except asyncio.CancelledError:
+                pass
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    async def publish(self, message: str):
+        await self.redis.publish(self.channel, message)
+
+    async def _listen(self, pubsub):
+        while True:
+            try:
+                async for item in pubsub.listen():
+                    if item["type"] != "message":
+                        continue
+                    self.received += 1
+                    data = item["data"]
+                    try:
+                        if isinstance(data, bytes):
+                            data = data.decode()
+                        await self.deliver(data)
+                    except Exception as e:
+                        logger.error(f"Error delivering broadcast locally: {e}")
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Broadcast subscription to {self.channel} lost: {e}. "
+                    "Resubscribing."
+                )
+
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass  # Connection already gone
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+            except Exception as e:
+                logger.error(f"Resubscribe to {self.channel} failed: {e}")
+
+
+def create_backend() -> BroadcastBackend:
+    """Backend selected by WS_BROADCAST_BACKEND ("redis" or "local")."""
+    if settings.WS_BROADCAST_BACKEND == "redis":
+        return RedisBroadcastBackend(settings.REDIS_URL, settings.WS_BROADCAST_CHANNEL)
+    return LocalBroadcastBackend()
+
+
+_sync_client = None
+
+
+def publish_sync(message: str):
+    """Publish a message to every API worker's WebSocket clients from sync code.
+
+    Used by Celery tasks, which run outside the API process.
+
+    Only meaningful with the Redis backend; with the local backend a separate
+    process has no clients to reach, so the message is dropped.
+    """
+    global _sync_client
+    if settings.WS_BROADCAST_BACKEND != "redis":
+        logger.debug(
+            "Local broadcast backend: not publishing from outside the API process."
+        )
+        return
+    try:
+        if _sync_client is None:
+            import redis
+
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+        _sync_client.publish(settings.WS_BROADCAST_CHANNEL, message)
+    except Exception as e:
+        # A missed live update must never fail ingestion
+        logger.error(f"Error publishing broadcast: {e}")
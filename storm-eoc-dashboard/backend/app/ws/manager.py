@@ -1,10 +1,53 @@
 # backend/app/ws/manager.py
 from fastapi import WebSocket
-from typing import List
+from collections import Counter
+from pydantic import ValidationError
+import asyncio
+import json
 import logging
+import os
+
+from app.core.config import settings
+from app.schemas.subscriptions import SubscriptionFilter
+from app.ws.broadcast import create_backend
+from app.ws.routing import SubscriptionIndex, filter_message, message_route
 
 logger = logging.getLogger(__name__)
 
+# Slow consumer policies: what happens when a client's send queue is full
+DROP_OLDEST = "drop"  # discard the oldest queued message, keep the newest
+DISCONNECT = "disconnect"  # close the client so it can reconnect and resync
+
+# Close code for clients disconnected for falling behind ("try again later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    """One WebSocket client with its own bounded send queue and sender task.
+
+    Broadcasts only enqueue; the sender task drains the queue to the socket,
+    so a slow client never delays anyone else.
+    """
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.sender: asyncio.Task = None
+        self.subscription: SubscriptionFilter = None  # None: receive everything
+        self.subscription_key: str = None  # clients with equal filters share filtered batches
+
+    def enqueue(self, message: str, policy: str) -> bool:
+        """Queue a message without waiting. Returns False if the client must be disconnected."""
+        if self.queue.full():
+            if policy == DISCONNECT:
+                return False
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+        return True
+
+
 class ConnectionManager:
     # Singleton pattern for global access to the manager
     _instance = None
@@ -12,31 +55,160 @@ class ConnectionManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ConnectionManager, cls).__new__(cls)
-            cls._instance.active_connections = []
+            # Keyed by WebSocket: O(1) add/remove, safe to snapshot while broadcasting
+            cls._instance.active_connections = {}
+            # Delivers broadcasts to this worker's clients (and, with Redis, every other worker's)
+            cls._instance.backend = create_backend()
+            cls._instance.counters = Counter()
+            # Area filters of subscribed clients, for routing located messages
+            cls._instance.index = SubscriptionIndex(settings.WS_GRID_CELL_DEG, settings.WS_GRID_MAX_CELLS)
+            cls._instance.subscribed = 0
         return cls._instance
 
     def __init__(self):
         # active_connections initialized in __new__
-        pass
+        self.queue_size = settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = settings.WS_SEND_TIMEOUT
+        self.slow_client_policy = settings.WS_SLOW_CLIENT_POLICY
+
+    async def start(self):
+        """Start receiving broadcasts from the backend (call on app startup)."""
+        await self.backend.start(self._fan_out)
+
+    async def stop(self):
+        await self.backend.stop()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self.queue_size)
+        client.sender = asyncio.create_task(self._send_loop(client))
+        self.active_connections[websocket] = client
+        self.index.add(client, None)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+    def disconnect(self, websocket: WebSocket, close_code: int = None):
+        client = self.active_connections.pop(websocket, None)
+        if client is None:
+            return
+        self.index.remove(client)
+        if client.subscription is not None:
+            self.subscribed -= 1
+        if client.sender is not None and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+        if close_code is not None:
+            asyncio.create_task(self._close(websocket, close_code))
+        if client.dropped:
+            logger.warning(f"WebSocket client dropped {client.dropped} messages while connected.")
+        logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+
+    def handle_message(self, websocket: WebSocket, text: str):
+        """Apply a subscribe/unsubscribe request sent by a client."""
+        client = self.active_connections.get(websocket)
+        if client is None:
+            return
+        try:
+            request = json.loads(text)
+            action = request.pop("action", None)
+            if action == "subscribe":
+                subscription = SubscriptionFilter(**request)
+            elif action == "unsubscribe":
+                subscription = None
+            else:
+                raise ValueError('action must be "subscribe" or "unsubscribe"')
+        except (ValueError, TypeError, AttributeError, ValidationError) as e:
+            client.enqueue(json.dumps({"type": "error", "detail": str(e)}), self.slow_client_policy)
+            return
+
+        self.subscribed += (subscription is not None) - (client.subscription is not None)
+        client.subscription = subscription
+        client.subscription_key = subscription.json() if subscription else None
+        self.index.add(client, tuple(subscription.bbox) if subscription and subscription.bbox else None)
+        reply = {"type": "subscription", "filter": subscription.dict() if subscription else None}
+        client.enqueue(json.dumps(reply), self.slow_client_policy)
 
     async def broadcast(self, message: str):
-        """Broadcasts a message (JSON string) to all connected clients."""
-        logger.info(f"Broadcasting message to {len(self.active_connections)} clients.")
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}. Disconnecting client.")
-                self.disconnect(connection)
+        """Broadcasts a message (JSON string) to all connected clients of every worker."""
+        self.counters["published"] += 1
+        try:
+            await self.backend.publish(message)
+        except Exception as e:
+            # Callers broadcast after committing: a missed live update must never fail the write
+            logger.error(f"Error publishing broadcast: {e}. Delivering to this worker's clients only.")
+            self.counters["publish_errors"] += 1
+            await self._fan_out(message)
+
+    async def _fan_out(self, message: str):
+        """Deliver a message to this worker's clients.
+
+        The message is serialised once by the publisher and only queued here, so
+        fan-out cost is independent of client network speed. Once any client has
+        subscribed, the message is parsed once and sent only to matching clients,
+        with area filters looked up through the grid index. A batch
+        (FeatureCollection) is cut down to each subscriber's matching features,
+        serialised once per distinct filter.
+        """
+        self.counters["messages"] += 1
+        if self.subscribed == 0:
+            deliveries = [(client, message) for client in self.active_connections.values()]
+        else:
+            route = message_route(message)
+            candidates = self.index.candidates(route.bbox) if route.bbox else self.active_connections.values()
+            filtered = {}
+            deliveries = []
+            for client in candidates:
+                if client.subscription_key not in filtered:
+                    filtered[client.subscription_key] = filter_message(client.subscription, message, route)
+                payload = filtered[client.subscription_key]
+                if payload is not None:
+                    deliveries.append((client, payload))
+            self.counters["filtered"] += len(self.active_connections) - len(deliveries)
+        logger.info(f"Broadcasting message to {len(deliveries)} clients.")
+        for client, payload in deliveries:
+            dropped = client.dropped
+            if not client.enqueue(payload, self.slow_client_policy):
+                logger.warning("WebSocket client send queue full. Disconnecting slow client.")
+                self.counters["slow_disconnects"] += 1
+                self.disconnect(client.websocket, SLOW_CLIENT_CLOSE_CODE)
+                continue
+            self.counters["deliveries"] += 1
+            self.counters["dropped"] += client.dropped - dropped
+
+    def metrics(self) -> dict:
+        """Fan-out counters for this worker process."""
+        return {
+            "worker_pid": os.getpid(),
+            "backend": type(self.backend).__name__,
+            "connections": len(self.active_connections),
+            "subscribed": self.subscribed,
+            "queued": sum(client.queue.qsize() for client in self.active_connections.values()),
+            **{name: self.counters[name] for name in (
+                "published", "publish_errors", "messages", "deliveries", "filtered", "dropped", "slow_disconnects",
+                "send_errors",
+            )},
+        }
+
+    async def _send_loop(self, client: ClientConnection):
+        """Drain one client's queue to its socket until it fails or is cancelled."""
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(message), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket send timed out. Disconnecting slow client.")
+            self.counters["slow_disconnects"] += 1
+            self.disconnect(client.websocket, SLOW_CLIENT_CLOSE_CODE)
+        except Exception as e:
+            logger.error(f"Error sending to WebSocket client: {e}. Disconnecting client.")
+            self.counters["send_errors"] += 1
+            self.disconnect(client.websocket)
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass  # Already gone
+
 
 manager = ConnectionManager()
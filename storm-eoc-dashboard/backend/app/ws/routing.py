@@ -0,0 +1,224 @@
+# backend/app/ws/routing.py
+# Subscription routing: which clients a broadcast message is sent to.
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import json
+import math
+
+from app.schemas.subscriptions import SubscriptionFilter
+
+BBox = Tuple[float, float, float, float]  # west, south, east, north
+
+
+@dataclass
+class Route:
+    """What a message's subscribers are matched on."""
+
+    bbox: Optional[BBox] = None  # None: not located, goes to every area
+    report_types: Optional[FrozenSet[str]] = None  # community reports
+    relevancy: Optional[float] = None  # social posts
+    social_post: bool = False
+    # FeatureCollection (batch) messages: each feature with its own route;
+    # the fields above are then the union, used only to find candidate clients
+    parts: Optional[List[Tuple[dict, "Route"]]] = None
+
+
+def geometry_bbox(geometry) -> Optional[BBox]:
+    """Bounding box of a GeoJSON geometry, or None if it has no coordinates."""
+    if not isinstance(geometry, dict):
+        return None
+    xs, ys = [], []
+    stack = [geometry.get("coordinates")]
+    stack += [g.get("coordinates") for g in geometry.get("geometries", [])]
+    while stack:
+        item = stack.pop()
+        if not item:
+            continue
+        if isinstance(item[0], (int, float)):
+            xs.append(item[0])
+            ys.append(item[1])
+        else:
+            stack.extend(item)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def feature_route(feature) -> Route:
+    """Routing fields of one GeoJSON Feature."""
+    if not isinstance(feature, dict):
+        return Route()
+    properties = feature.get("properties") or {}
+    report_type = properties.get("report_type")
+    social_post = properties.get("feed_type") == "x_post"
+    return Route(
+        bbox=geometry_bbox(feature.get("geometry")),
+        report_types=frozenset([report_type]) if report_type else None,
+        relevancy=properties.get("relevancy_score") if social_post else None,
+        social_post=social_post,
+    )
+
+
+def message_route(message: str) -> Route:
+    """Routing fields of a broadcast message (GeoJSON Feature or FeatureCollection).
+
+    A FeatureCollection (a coalesced batch) keeps a route per feature in
+    `parts`; its own fields are the union of them, for candidate lookup.
+    """
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return Route()
+    if not isinstance(data, dict):
+        return Route()
+    if data.get("type") != "FeatureCollection":
+        return feature_route(data)
+    features = [
+        feature for feature in data.get("features") or [] if isinstance(feature, dict)
+    ]
+    routes = [feature_route(feature) for feature in features]
+    if not routes or any(route.bbox is None for route in routes):
+        bbox = None
+    else:
+        bbox = (
+            min(route.bbox[0] for route in routes),
+            min(route.bbox[1] for route in routes),
+            max(route.bbox[2] for route in routes),
+            max(route.bbox[3] for route in routes),
+        )
+    report_types = frozenset().union(
+        *(route.report_types for route in routes if route.report_types)
+    )
+    relevancies = [route.relevancy for route in routes if route.relevancy is not None]
+    return Route(
+        bbox=bbox,
+        report_types=report_types or None,
+        relevancy=max(relevancies) if relevancies else None,
+        social_post=any(route.social_post for route in routes),
+        parts=list(zip(features, routes)),
+    )
+
+
+def subscription_matches(subscription: SubscriptionFilter, route: Route) -> bool:
+    """Whether a single message (or batch feature) passes a subscription filter.
+
+    report_types and min_relevancy select what to receive: with either set,
+    community reports must match report_types and social posts must meet
+    min_relevancy, and a kind with no filter of its own is not received (a
+    report_types-only subscription gets no social posts). The bbox only
+    constrains located messages; unlocated ones go to every area.
+    """
+    if subscription.bbox and route.bbox:
+        west, south, east, north = subscription.bbox
+        if (
+            route.bbox[2] < west
+            or route.bbox[0] > east
+            or route.bbox[3] < south
+            or route.bbox[1] > north
+        ):
+            return False
+    wants_reports = bool(subscription.report_types)
+    wants_posts = subscription.min_relevancy is not None
+    if not (wants_reports or wants_posts):
+        return True
+    if route.report_types is not None:
+        return wants_reports and not route.report_types.isdisjoint(
+            subscription.report_types
+        )
+    if route.social_post:
+        return wants_posts and (
+            route.relevancy is None or route.relevancy >= subscription.min_relevancy
+        )
+    return True
+
+
+def filter_message(
+    subscription: Optional[SubscriptionFilter], message: str, route: Route
+) -> Optional[str]:
+    """The message as a subscriber should receive it, or None if nothing in it matches.
+
+    Batches are cut down to the features matching the subscription, so a
+    client never receives a feature its filter excludes.
+    """
+    if subscription is None:
+        return message
+    if route.parts is None:
+        return message if subscription_matches(subscription, route) else None
+    features = [
+        feature
+        for feature, part in route.parts
+        if subscription_matches(subscription, part)
+    ]
+    if not features:
+        return None
+    if len(features) == len(route.parts):
+        return message
+    return json.dumps({"type": "FeatureCollection", "features": features})
+
+
+class SubscriptionIndex:
+    """Uniform lon/lat grid of client area filters.
+
+    A client with a bbox is registered in every cell it overlaps, so a located
+    message only looks at clients in its own cells plus those without an area
+    filter (or with one too large to index), instead of scanning everyone.
+    """
+
+    def __init__(self, cell_deg: float, max_cells: int):
+        self.cell_deg = cell_deg
+        self.max_cells = max_cells
+        self.cells: Dict[Tuple[int, int], Set] = defaultdict(set)
+        self.anywhere: Set = set()
+        self.client_cells: Dict[object, list] = {}
+
+    def _cell_range(self, bbox: BBox):
+        x0, y0 = math.floor(bbox[0] / self.cell_deg), math.floor(
+            bbox[1] / self.cell_deg
+        )
+        x1, y1 = math.floor(bbox[2] / self.cell_deg), math.floor(
+            bbox[3] / self.cell_deg
+        )
+        return x0, y0, x1, y1
+
+    def _cells(self, bbox: BBox) -> Iterable[Tuple[int, int]]:
+        x0, y0, x1, y1 = self._cell_range(bbox)
+        return ((x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+
+    def add(self, client, bbox: Optional[BBox]):
+        self.remove(client)
+        if bbox is None:
+            self.anywhere.add(client)
+            return
+        x0, y0, x1, y1 = self._cell_range(bbox)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.max_cells:
+            self.anywhere.add(client)
+            return
+        cells = list(self._cells(bbox))
+        for cell in cells:
+            self.cells[cell].add(client)
+        self.client_cells[client] = cells
+
+    def remove(self, client):
+        self.anywhere.discard(client)
+        for cell in self.client_cells.pop(client, ()):
+            members = self.cells[cell]
+            members.discard(client)
+            if not members:
+                del self.cells[cell]
+
+    def candidates(self, bbox: BBox) -> Set:
+        """Clients whose area may overlap bbox (exact check left to the caller)."""
+        found = set(self.anywhere)
+        x0, y0, x1, y1 = self._cell_range(bbox)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # Message larger than the populated grid: walk the occupied cells instead
+            for (x, y), members in self.cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found |= members
+            return found
+        for cell in self._cells(bbox):
+            members = self.cells.get(cell)
+            if members:
+                found |= members
+        return found
@@ -0,0 +1,102 @@
+# backend/tests/test_broadcast.py
+# Cross-worker WebSocket delivery over the Redis broadcast backend, with two
+# ConnectionManagers (one per simulated uvicorn worker) on one fakeredis server.
+import asyncio
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+import redis.asyncio
+
+from app.core.config import settings
+from app.ws import broadcast
+from app.ws.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=None):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(settings, "WS_BROADCAST_BACKEND", "redis")
+    monkeypatch.setattr(
+        redis.asyncio,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs),
+    )
+    monkeypatch.setattr(broadcast, "_sync_client", fakeredis.FakeRedis(server=server))
+    # Restores the module's singleton after the test
+    monkeypatch.setattr(ConnectionManager, "_instance", None)
+    return server
+
+
+def new_worker() -> ConnectionManager:
+    """A fresh manager, as a separate worker process would have."""
+    ConnectionManager._instance = None
+    return ConnectionManager()
+
+
+async def wait_for(condition, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out waiting for delivery"
+        await asyncio.sleep(0.01)
+
+
+def test_broadcast_reaches_clients_of_every_worker(server):
+    async def run():
+        worker_a, worker_b = new_worker(), new_worker()
+        assert worker_a is not worker_b
+        await worker_a.start()
+        await worker_b.start()
+        sockets_a = [FakeWebSocket()]
+        sockets_b = [FakeWebSocket(), FakeWebSocket()]
+        for socket in sockets_a:
+            await worker_a.connect(socket)
+        for socket in sockets_b:
+            await worker_b.connect(socket)
+        sockets = sockets_a + sockets_b
+
+        from_api = json.dumps({"type": "Feature", "properties": {"id": 1}})
+        from_celery = json.dumps({"type": "Feature", "properties": {"id": 2}})
+        await worker_a.broadcast(from_api)
+        broadcast.publish_sync(from_celery)
+
+        await wait_for(lambda: all(len(socket.sent) == 2 for socket in sockets))
+        await asyncio.sleep(0.1)  # Room for any duplicate delivery to show up
+        for socket in sockets:
+            assert sorted(socket.sent) == sorted([from_api, from_celery])
+
+        metrics_a, metrics_b = worker_a.metrics(), worker_b.metrics()
+        await worker_a.stop()
+        await worker_b.stop()
+        return metrics_a, metrics_b
+
+    metrics_a, metrics_b = asyncio.run(run())
+    assert metrics_a["backend"] == metrics_b["backend"] == "RedisBroadcastBackend"
+    assert (metrics_a["connections"], metrics_b["connections"]) == (1, 2)
+    # Only worker A published; publish_sync bypasses the managers
+    assert (metrics_a["published"], metrics_b["published"]) == (1, 0)
+    assert metrics_a["messages"] == metrics_b["messages"] == 2
+    assert (metrics_a["deliveries"], metrics_b["deliveries"]) == (2, 4)
+    for metrics in (metrics_a, metrics_b):
+        assert (
+            metrics["publish_errors"]
+            == metrics["dropped"]
+            == metrics["send_errors"]
+            == 0
+        )
@@ -0,0 +1,63 @@
+# backend/tests/test_routing.py
+# Which subscribers a broadcast message (or batch feature) is delivered to.
+import json
+
+from app.schemas.subscriptions import SubscriptionFilter
+from app.ws.routing import filter_message, message_route
+
+MIAMI = [-80.5, 25.5, -80.0, 26.0]
+
+
+def report(report_type, lon=-80.2, lat=25.8):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {"report_type": report_type},
+    }
+
+
+def post(relevancy, lon=-80.2, lat=25.8):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {"feed_type": "x_post", "relevancy_score": relevancy},
+    }
+
+
+def delivered(subscription, *features):
+    """Features of the message a subscriber receives (None if nothing)."""
+    if len(features) == 1:
+        message = json.dumps(features[0])
+    else:
+        message = json.dumps({"type": "FeatureCollection", "features": features})
+    payload = filter_message(subscription, message, message_route(message))
+    if payload is None:
+        return None
+    data = json.loads(payload)
+    return data.get("features", [data])
+
+
+def test_report_types_only_subscription_gets_no_social_posts():
+    subscription = SubscriptionFilter(bbox=MIAMI, report_types=["flood"])
+    assert delivered(subscription, post(0.9)) is None
+    assert delivered(subscription, report("flood")) == [report("flood")]
+    assert delivered(subscription, report("wind")) is None
+
+
+def test_min_relevancy_only_subscription_gets_no_reports():
+    subscription = SubscriptionFilter(min_relevancy=0.5)
+    assert delivered(subscription, report("flood")) is None
+    assert delivered(subscription, post(0.9)) == [post(0.9)]
+    assert delivered(subscription, post(0.1)) is None
+
+
+def test_both_filters_select_both_kinds():
+    subscription = SubscriptionFilter(report_types=["flood"], min_relevancy=0.5)
+    features = [report("flood"), report("wind"), post(0.9), post(0.1)]
+    assert delivered(subscription, *features) == [report("flood"), post(0.9)]
+
+
+def test_area_only_subscription_gets_every_kind_in_its_area():
+    subscription = SubscriptionFilter(bbox=MIAMI)
+    features = [report("flood"), post(0.1), report("flood", -82.5, 27.9)]
+    assert delivered(subscription, *features) == features[:2]
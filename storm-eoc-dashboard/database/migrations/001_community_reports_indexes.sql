@@ -0,0 +1,22 @@
+-- Indexes for GET /api/v1/reports (keyset pages, time window, bbox)
+-- Matches the indexes declared on app.models.reports.CommunityReport.
+--
+-- Apply to an existing database with:
+--   psql "$DATABASE_URL" -f database/migrations/001_community_reports_indexes.sql
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction, so do not
+-- pass --single-transaction. Every statement is idempotent.
+
+-- Keyset pagination, newest first on (report_timestamp, id). Also serves
+-- the start/end time window, as a range scan on its leading column.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_community_reports_timestamp_id
+    ON community_reports (report_timestamp, id);
+
+-- Bbox filter (location && envelope). Same name geoalchemy2 gives it.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_community_reports_location
+    ON community_reports USING gist (location);
+
+-- Superseded by the btree above
+DROP INDEX CONCURRENTLY IF EXISTS ix_community_reports_timestamp_brin;
+
+ANALYZE community_reports;
@@ -79,7 +79,9 @@ const MapView: React.FC<MapViewProps> = ({ onFeatureSelect }) => {
         try {
             const data = JSON.parse(lastMessage.data);
             // Assuming incoming messages are GeoJSON features for community reports
-            if (data.type === 'Feature' && data.properties && data.properties.report_type) {
+            const isReport = (feature: any) => feature && feature.type === 'Feature' && feature.properties && feature.properties.report_type;
+            // Batch uploads arrive as one FeatureCollection: refresh once for the whole batch
+            if (isReport(data) || (data.type === 'FeatureCollection' && data.features.some(isReport))) {
                 // Update the community-reports source data
                 // This requires fetching the full dataset again or incrementally updating the source
                 // For simplicity here, we trigger a refresh of the data source.
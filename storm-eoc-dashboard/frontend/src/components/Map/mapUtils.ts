@@ -110,7 +110,14 @@ export const updateMapDataSources = async (map: mapboxgl.Map, sourceIds?: string
                 if (Array.isArray(data)) {
                     geojsonData = { type: 'FeatureCollection', features: data };
                 } else if (data.type === 'FeatureCollection') {
-                    geojsonData = data;
+                    geojsonData = { type: 'FeatureCollection', features: data.features };
+                    // Paged sources (community reports) return next_cursor until the last page
+                    let nextCursor = data.next_cursor;
+                    while (nextCursor) {
+                        const page = await axios.get(sourceDef.apiUrl, { params: { cursor: nextCursor } });
+                        geojsonData.features = geojsonData.features.concat(page.data.features);
+                        nextCursor = page.data.next_cursor;
+                    }
                 } else {
                     console.error(`Invalid GeoJSON format received for source ${id}`);
                     continue;
@@ -24,10 +24,12 @@ const LiveFeed: React.FC = () => {
     if (lastMessage) {
       try {
         const data = JSON.parse(lastMessage.data);
-        const newItem = transformDataToFeedItem(data);
-        if (newItem) {
-            // Prepend new item to the feed and sort
-            setFeedItems(prevItems => [newItem, ...prevItems].sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime()));
+        // Batch uploads arrive as one FeatureCollection
+        const messages = data.type === 'FeatureCollection' ? data.features : [data];
+        const newItems = messages.map(transformDataToFeedItem).filter((item: FeedItem | null): item is FeedItem => item !== null);
+        if (newItems.length) {
+            // Prepend new items to the feed and sort
+            setFeedItems(prevItems => [...newItems, ...prevItems].sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime()));
         }
       } catch (error) {
         console.error('Error processing WebSocket message in LiveFeed:', error);